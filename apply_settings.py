@@ -30,9 +30,9 @@ def apply_settings(preset_name: str = "Default", device: str = "/dev/video0"):
 
     print(f"Applying preset '{preset_name}' to {device}...")
 
+    results = v4l2.set_many(preset)
     for control, value in preset.items():
-        success = v4l2.set(control, value)
-        status = "OK" if success else "FAILED"
+        status = "OK" if results.get(control) else "FAILED"
         print(f"  {control}: {value} [{status}]")
 
     print("Done.")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""UI loop rate with inline vs off-thread face detection.
+
+Runs the preview loop on a threaded synthetic 1280x720 30 fps camera with
+tracking on. Inline mode calls FaceTracker.track() in the loop like the
+old update loop; async mode hands frames to DetectionWorker. Detection is
+a full-resolution full-frame scan on every frame to make its cost obvious.
+
+Usage:
+    python benchmarks/bench_async_detection.py [seconds]
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.camera import Camera  # noqa: E402
+from core.detection_worker import DetectionWorker  # noqa: E402
+from core.tracker import FaceTracker  # noqa: E402
+
+
+def run(use_worker: bool, seconds: float):
+    cam = Camera("synthetic", threaded=True)
+    cam.width, cam.height = 1280, 720
+    cam.open()
+    tracker = FaceTracker(detect_width=0, detect_interval=1, roi_misses=0)
+    worker = DetectionWorker(tracker) if use_worker else None
+    if worker:
+        worker.start()
+
+    frames = 0
+    results = 0
+    ages = []
+    last_seq = 0
+    last_result = 0
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        captured = cam.read_frame()
+        if captured is None or captured.seq == last_seq:
+            time.sleep(0.001)
+            continue
+        last_seq = captured.seq
+        frames += 1
+        if worker:
+            worker.submit(captured.image, captured.seq, captured.timestamp)
+            result = worker.latest()
+            if result is not None and result.frame_id != last_result:
+                last_result = result.frame_id
+                results += 1
+                ages.append((time.monotonic() - result.timestamp) * 1000)
+        else:
+            tracker.track(captured.image)
+            results += 1
+            ages.append((time.monotonic() - captured.timestamp) * 1000)
+        tracker.draw_overlay(captured.image)
+
+    if worker:
+        worker.stop()
+    cam.close()
+    mode = "async" if use_worker else "inline"
+    print(
+        f"  {mode:7} preview={frames / seconds:5.1f} fps  "
+        f"detections={results / seconds:5.1f}/s  "
+        f"result age p50={statistics.median(ages):5.1f}ms"
+    )
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    print("Synthetic 1280x720 @ 30 fps, full-frame detection on every frame:")
+    run(False, seconds)
+    run(True, seconds)
+
+
+if __name__ == "__main__":
+    main()
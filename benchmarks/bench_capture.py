@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Compare synchronous and threaded capture on a synthetic 30 fps source.
+
+Simulates the UI loop: read a frame, then spend `work` ms on detection and
+rendering. Reports loop rate and frame age (capture to use).
+
+Usage:
+    python benchmarks/bench_capture.py [work_ms] [seconds]
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.camera import Camera  # noqa: E402
+
+
+def run(threaded: bool, work_ms: float, seconds: float):
+    cam = Camera("synthetic", threaded=threaded)
+    cam.open()
+    loops = 0
+    new_frames = 0
+    ages = []
+    last_seq = 0
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        captured = cam.read_frame()
+        if captured is not None and captured.seq != last_seq:
+            last_seq = captured.seq
+            new_frames += 1
+            ages.append((time.monotonic() - captured.timestamp) * 1000)
+        time.sleep(work_ms / 1000)
+        loops += 1
+    cam.close()
+
+    mode = "threaded" if threaded else "sync"
+    print(
+        f"  {mode:9} loop={loops / seconds:6.1f}/s new frames={new_frames / seconds:5.1f}/s "
+        f"frame age p50={statistics.median(ages):5.1f}ms max={max(ages):5.1f}ms"
+    )
+
+
+def main():
+    work_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    print(f"Synthetic 30 fps source, {work_ms:.0f} ms work per loop:")
+    run(False, work_ms, seconds)
+    run(True, work_ms, seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Face detection cost across detection widths on a synthetic 1280x720 clip.
+
+Reports ms/frame (grayscale, downscale and detectMultiScale) and how well
+the returned box overlaps the ground-truth face: full-frame detection on
+every frame, detection that searches around the last face first (ROI),
+and track() with template matching between detections.
+
+Usage:
+    python benchmarks/bench_detection.py [frames]
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.synthetic import SyntheticSource  # noqa: E402
+from core.tracker import FaceTracker  # noqa: E402
+
+
+def iou(a, b) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    w = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    h = max(0, min(ay + ah, by + bh) - max(ay, by))
+    return w * h / (aw * ah + bw * bh - w * h)
+
+
+def run(detect_width: int, clip: list, truth: list, interval=0, roi_misses=0):
+    tracker = FaceTracker(
+        detect_width=detect_width, detect_interval=interval, roi_misses=roi_misses
+    )
+    step = tracker.track if interval else tracker.detect
+    FaceTracker(detect_width=detect_width).detect(clip[0])  # Warm up cascade
+    times = []
+    overlaps = []
+    for frame, box in zip(clip, truth):
+        start = time.perf_counter()
+        face = step(frame)
+        times.append((time.perf_counter() - start) * 1000)
+        overlaps.append(iou(face, box) if face else 0.0)
+
+    label = detect_width or "full"
+    mode = f"track/{interval}" if interval else "detect"
+    if roi_misses:
+        mode += "+roi"
+    found = sum(1 for o in overlaps if o > 0)
+    print(
+        f"  {mode:12} width={label!s:>5}  {statistics.mean(times):6.2f} ms/frame"
+        f"  found={found}/{len(clip)}  mean IoU={statistics.mean(overlaps):.2f}"
+        f"  full scans={tracker.stats['full_scans']}"
+    )
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    source = SyntheticSource(1280, 720, realtime=False)
+    clip = [source.render(i) for i in range(frames)]
+    truth = [source.face_box(i) for i in range(frames)]
+    print(f"Haar detection on {frames} synthetic 1280x720 frames:")
+    for width in (0, 960, 640, 480, 320, 240):
+        run(width, clip, truth)
+    for width in (0, 640, 320):
+        run(width, clip, truth, roi_misses=3)
+    for interval in (5, 10):
+        for width in (0, 640, 320):
+            run(width, clip, truth, interval, roi_misses=3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Compare face detector backends on the same offline frame set.
+
+Reports median latency and hit rate per backend. With no argument the
+frames come from the synthetic source and a hit means IoU > 0.5 with the
+ground-truth face. Given a directory of images (e.g. frames saved from the
+real camera), a hit is any face found.
+
+Backends whose model file is missing are listed and skipped.
+
+Usage:
+    python benchmarks/bench_detectors.py [image_dir] [--width 640]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.detectors import DETECTORS, create_detector  # noqa: E402
+from core.synthetic import SyntheticSource  # noqa: E402
+from utils.constants import TRACK_MIN_FACE  # noqa: E402
+
+
+def iou(a, b) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    w = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    h = max(0, min(ay + ah, by + bh) - max(ay, by))
+    return w * h / (aw * ah + bw * bh - w * h)
+
+
+def load_frames(image_dir: str | None, width: int):
+    """Gray frames at detection width, plus ground truth boxes if known."""
+    if image_dir:
+        paths = sorted(
+            p for p in Path(image_dir).iterdir() if p.suffix in (".png", ".jpg")
+        )
+        frames = [cv2.imread(str(p)) for p in paths]
+        truth = None
+    else:
+        source = SyntheticSource(1280, 720, realtime=False)
+        frames = [source.render(i * 3) for i in range(60)]
+        truth = [source.face_box(i * 3) for i in range(60)]
+
+    scale = min(1.0, width / frames[0].shape[1])
+    grays = []
+    for frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if scale < 1.0:
+            gray = cv2.resize(
+                gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+            )
+        grays.append(gray)
+    if truth is not None:
+        truth = [tuple(round(v * scale) for v in box) for box in truth]
+    return grays, truth, scale
+
+
+def run(name: str, grays: list, truth: list | None, min_face: int):
+    try:
+        detector = create_detector(name)
+    except FileNotFoundError as e:
+        print(f"  {name:6} skipped: {e}")
+        return
+    detector.detect(grays[0], min_face)  # Warm up
+    times = []
+    hits = 0
+    for i, gray in enumerate(grays):
+        start = time.perf_counter()
+        boxes, _ = detector.detect(gray, min_face)
+        times.append((time.perf_counter() - start) * 1000)
+        if truth is None:
+            hits += len(boxes) > 0
+        else:
+            hits += any(iou(box, truth[i]) > 0.5 for box in boxes)
+    print(
+        f"  {name:6} {statistics.median(times):7.2f} ms/frame"
+        f"  hit rate={hits / len(grays):6.1%}  ({hits}/{len(grays)})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("image_dir", nargs="?", help="directory of .png/.jpg frames")
+    parser.add_argument("--width", type=int, default=640, help="detection width")
+    args = parser.parse_args()
+
+    grays, truth, scale = load_frames(args.image_dir, args.width)
+    min_face = max(24, round(TRACK_MIN_FACE * scale))
+    height, width = grays[0].shape
+    print(f"{len(grays)} frames at {width}x{height}, min face {min_face}px:")
+    for name in DETECTORS:
+        run(name, grays, truth, min_face)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Per-frame pixel work with BGR capture vs raw YUYV capture.
+
+BGR: the capture converts YUYV to BGR at full size, tracking converts it
+back to gray, the preview resizes and converts to RGBA. Raw: tracking
+copies out the Y plane, the preview resizes the YUYV pairs and converts
+colour at preview size. Face detection itself is the same in both and is
+left out.
+
+Usage:
+    python benchmarks/bench_luma.py [iterations]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.synthetic import SyntheticSource, bgr_to_yuyv  # noqa: E402
+from core.tracker import FaceTracker  # noqa: E402
+from ui.preview import Preview  # noqa: E402
+
+
+def timed(fn, iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def compare(width: int, height: int, iterations: int):
+    yuyv = bgr_to_yuyv(SyntheticSource(width, height, realtime=False).render(0))
+    bgr = np.empty((height, width, 3), dtype=np.uint8)
+    tracker = FaceTracker()
+    preview = Preview()
+
+    def bgr_path():
+        cv2.cvtColor(yuyv, cv2.COLOR_YUV2BGR_YUYV, dst=bgr)
+        tracker._downscale(tracker._to_gray(bgr))
+        preview.convert(bgr)
+
+    def raw_path():
+        tracker._downscale(tracker._to_gray(yuyv))
+        preview.convert(yuyv)
+
+    before = timed(bgr_path, iterations)
+    after = timed(raw_path, iterations)
+    print(
+        f"  {width}x{height}:  bgr {before:5.2f} ms   raw {after:5.2f} ms"
+        f"   ({before / after:.1f}x)"
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(
+        f"Pixel work per frame (capture + tracking input + preview), {iterations} runs:"
+    )
+    for width, height in ((640, 360), (1280, 720), (1920, 1080)):
+        compare(width, height, iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""CPU use of the UI loop with and without frame pacing.
+
+A threaded synthetic camera feeds the present queue, as in the app. Each
+loop iteration converts a new frame to a texture if there is one and then
+"renders": a stand-in that burns `render_ms` of CPU, roughly what an
+ImGui frame costs with vsync off. Reports process CPU% (all threads,
+100% = one core), renders/s and new frames shown per second.
+
+Modes:
+    unpaced     render as fast as possible (the old loop)
+    paced       FramePacer at the default target rate
+    inactive    no recent input (unfocused)
+    hidden      viewport minimized
+
+Usage:
+    python benchmarks/bench_pacing.py [seconds] [render_ms]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.camera import Camera  # noqa: E402
+from core.pipeline import (  # noqa: E402
+    BoundedQueue,
+    CameraSource,
+    Stage,
+    release_frame,
+)
+from ui.pacer import FramePacer  # noqa: E402
+from ui.preview import Preview  # noqa: E402
+
+
+def render(render_ms: float):
+    end = time.perf_counter() + render_ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def run(label: str, seconds: float, render_ms: float, pacer=None, hidden=False):
+    camera = Camera("synthetic", threaded=True)
+    camera.open()
+    present = BoundedQueue(1, on_drop=release_frame)
+    if pacer is not None:
+        present.on_put = pacer.notify
+    capture = Stage("capture", CameraSource(camera), outboxes=(present,))
+    preview = Preview()
+    capture.start()
+    time.sleep(0.5)  # Let the source settle
+
+    renders = shown = 0
+    cpu = time.process_time()
+    start = time.monotonic()
+    while time.monotonic() - start < seconds:
+        if pacer is not None:
+            pacer.wait(hidden=hidden)
+        captured = present.get_nowait()
+        if captured is not None:
+            preview.convert(captured.image)
+            release_frame(captured)
+            shown += 1
+        render(render_ms)
+        renders += 1
+    wall = time.monotonic() - start
+    cpu = time.process_time() - cpu
+
+    present.close()
+    capture.stop()
+    camera.close()
+    print(
+        f"  {label:10} {cpu / wall * 100:6.1f}% {renders / wall:9.1f} "
+        f"{shown / wall:7.1f}"
+    )
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    render_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    print(f"synthetic 640x360 source, {render_ms} ms per render, {seconds:.0f}s/mode")
+    print(f"  {'mode':10} {'cpu':>7} {'renders/s':>9} {'shown/s':>7}")
+    run("unpaced", seconds, render_ms)
+    run("paced", seconds, render_ms, FramePacer())
+    run("inactive", seconds, render_ms, FramePacer(idle_after=0.0))
+    run("hidden", seconds, render_ms, FramePacer(), hidden=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Compare preview texture conversion paths on a synthetic 1280x720 frame.
+
+"legacy" is the old astype/divide/flatten chain; "rgba" and "rgb" are the
+current Preview.convert() writing into its persistent texture buffer.
+
+Usage:
+    python benchmarks/bench_preview.py [iterations]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.synthetic import SyntheticSource  # noqa: E402
+from ui.preview import Preview  # noqa: E402
+from utils.constants import PREVIEW_HEIGHT, PREVIEW_WIDTH  # noqa: E402
+
+
+def legacy(frame: np.ndarray) -> np.ndarray:
+    frame = cv2.resize(frame, (PREVIEW_WIDTH, PREVIEW_HEIGHT))
+    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)
+    frame = frame.astype(np.float32) / 255.0
+    return frame.flatten()
+
+
+def run(name: str, convert, frame: np.ndarray, iterations: int):
+    for _ in range(5):
+        texture = convert(frame)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        texture = convert(frame)
+    elapsed = (time.perf_counter() - start) / iterations * 1000
+
+    tracemalloc.start()
+    convert(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"  {name:7} {elapsed:6.3f} ms/frame  upload={texture.nbytes / 1024:6.0f} KiB"
+        f"  peak alloc={peak / 1024:8.1f} KiB"
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    frame = SyntheticSource(1280, 720, realtime=False).read()[1]
+    print(f"1280x720 BGR -> {PREVIEW_WIDTH}x{PREVIEW_HEIGHT} float texture:")
+    run("legacy", legacy, frame, iterations)
+    run("rgba", Preview(texture_format="rgba").convert, frame, iterations)
+    run("rgb", Preview(texture_format="rgb").convert, frame, iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Adaptive detection quality under a per-frame budget.
+
+Tracks a synthetic 1280x720 clip at full detection resolution. For the
+first half of the run every frame also carries `load` ms of simulated
+other work (preview, UI, a busy machine); the second half is unloaded.
+Prints, per second of video, the scheduler's level and settings, the mean
+frame time and why it chose them.
+
+Usage:
+    python benchmarks/bench_scheduler.py [budget_ms] [load_ms] [seconds]
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.scheduler import DetectionScheduler  # noqa: E402
+from core.synthetic import SyntheticSource  # noqa: E402
+from core.tracker import FaceTracker  # noqa: E402
+
+FPS = 30
+
+
+def busy(ms: float):
+    """Spin for `ms` milliseconds, like CPU-bound work would."""
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    load = float(sys.argv[2]) if len(sys.argv) > 2 else 12.0
+    seconds = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+    source = SyntheticSource(1280, 720, realtime=False)
+    clip = [source.render(i) for i in range(FPS * 2)]
+    scheduler = DetectionScheduler(budget)
+    tracker = FaceTracker(detect_width=0, motion_threshold=0, scheduler=scheduler)
+
+    print(f"budget={budget:.0f} ms, simulated load={load:.0f} ms for {seconds // 2}s")
+    print(
+        f"  {'t':>3} {'load':>4} {'lvl':>3} {'interval':>8} {'width':>5} "
+        f"{'scale':>5} {'min':>4} {'frame ms':>8}  reason"
+    )
+    for second in range(seconds):
+        extra = load if second < seconds // 2 else 0.0
+        times = []
+        for i in range(FPS):
+            start = time.perf_counter()
+            tracker.track(clip[(second * FPS + i) % len(clip)])
+            busy(extra)
+            elapsed = (time.perf_counter() - start) * 1000
+            scheduler.frame_done(elapsed)
+            times.append(elapsed)
+        q = scheduler.quality
+        print(
+            f"  {second:3} {extra:4.0f} {q.level:3} {q.detect_interval:8} "
+            f"{q.detect_width or 'full':>5} {q.scale_factor:5.2f} {q.min_face:4} "
+            f"{statistics.mean(times):8.1f}  {scheduler.stats['reason']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Compare control latency for the ioctl and v4l2-ctl backends.
+
+Measures single set() calls, whole-preset application (per-control set()
+vs one set_many()) and startup read-back (per-control get() vs one
+get_many()).
+
+Runs against an in-memory fake device by default, so it works without a
+camera. When v4l2-ctl isn't installed, `true` stands in for it to measure
+the fork+exec cost alone.
+
+Usage:
+    python benchmarks/bench_v4l2.py                 # Fake device
+    python benchmarks/bench_v4l2.py /dev/video0     # Real camera
+"""
+
+from __future__ import annotations
+
+import shutil
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.v4l2 import SubprocessBackend  # noqa: E402
+from core.v4l2_ioctl import FakeV4L2Device, IoctlBackend  # noqa: E402
+from utils.constants import CONTROLS  # noqa: E402
+
+PRESET = {name: ctrl[2] for name, ctrl in CONTROLS.items()}
+
+
+def bench_set(backend, iterations: int) -> list[float]:
+    """Time backend.set() calls, alternating values. Returns microseconds."""
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        backend.set("brightness", 40 + i % 20)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def bench_preset(backend, iterations: int, batched: bool) -> list[float]:
+    """Time applying every control, one call or one per control."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        if batched:
+            backend.set_many(PRESET)
+        else:
+            for control, value in PRESET.items():
+                backend.set(control, value)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def bench_readback(backend, iterations: int, batched: bool) -> list[float]:
+    """Time reading every control, one call or one per control."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        if batched:
+            backend.get_many(list(PRESET))
+        else:
+            for control in PRESET:
+                backend.get(control)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def report(name: str, samples: list[float]):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95)]
+    print(
+        f"  {name:22} mean={statistics.mean(samples):9.1f}us "
+        f"p50={statistics.median(samples):9.1f}us p95={p95:9.1f}us"
+    )
+
+
+def main():
+    device = sys.argv[1] if len(sys.argv) > 1 else None
+
+    if device:
+        print(f"set() latency on {device}:")
+        ioctl = IoctlBackend(device)
+        executable = "v4l2-ctl"
+    else:
+        print("set() latency on fake device:")
+        ioctl = IoctlBackend("/dev/video0", io=FakeV4L2Device())
+        executable = "v4l2-ctl" if shutil.which("v4l2-ctl") else "true"
+
+    subprocess_backend = SubprocessBackend(device or "/dev/video0", executable)
+    report("ioctl", bench_set(ioctl, 10000))
+    report(f"subprocess ({executable})", bench_set(subprocess_backend, 200))
+
+    print(f"Preset apply ({len(PRESET)} controls):")
+    report("ioctl set()", bench_preset(ioctl, 2000, batched=False))
+    report("ioctl set_many()", bench_preset(ioctl, 2000, batched=True))
+    report("subprocess set()", bench_preset(subprocess_backend, 30, batched=False))
+    report("subprocess set_many()", bench_preset(subprocess_backend, 30, batched=True))
+
+    print(f"Startup read-back ({len(PRESET)} controls):")
+    report("ioctl get()", bench_readback(ioctl, 2000, batched=False))
+    report("ioctl get_many()", bench_readback(ioctl, 2000, batched=True))
+    report("subprocess get()", bench_readback(subprocess_backend, 30, batched=False))
+    report(
+        "subprocess get_many()", bench_readback(subprocess_backend, 30, batched=True)
+    )
+    ioctl.close()
+
+
+if __name__ == "__main__":
+    main()
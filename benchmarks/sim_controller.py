@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Simulate pan tracking with the legacy EMA loop and the Kalman/PID controller.
+
+A scripted face moves in front of a simulated PTZ camera. Detections are
+noisy and arrive `latency` seconds late; the camera slews towards its
+commanded position at a limited speed. Positions are normalized frame
+offsets. Both loops assume `pan_range` device units turn the view by one
+half frame; `--fov-ratio` sets the camera's real half-frame angle as a
+multiple of that (e.g. 3.5 for a 70 degree lens with pan_range = 10 deg).
+
+Reports per trajectory: settle time after the face stops moving (offset
+stays under 0.1, about the old deadzone), mean absolute offset, overshoot and pan/tilt commands
+per second.
+
+Usage:
+    python benchmarks/sim_controller.py [--latency 0.066] [--fov-ratio 1.0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.controller import PanTiltController  # noqa: E402
+from core.detectors import _empty  # noqa: E402
+from core.tracker import FaceTracker  # noqa: E402
+
+FPS = 30.0
+FRAME = (360, 640)
+PAN_RANGE = 36000
+SETTLED = 0.1
+
+
+def step(t):
+    return 0.0 if t < 0.5 else 0.6
+
+
+def still(t):
+    return 0.03
+
+
+def walk(t):
+    return min(0.2 * t, 0.8)
+
+
+def sway(t):
+    return 0.3 * math.sin(2 * math.pi * 0.25 * t)
+
+
+TRAJECTORIES = {
+    "step": (step, 0.5),  # (trajectory, time the face stops moving)
+    "still": (still, 0.0),
+    "walk": (walk, 4.0),
+    "sway": (sway, None),
+}
+
+
+class NoDetector:
+    name = "none"
+
+    def detect(self, image, min_size, max_size=None):
+        return _empty()
+
+
+class LegacyLoop:
+    """The original update loop: EMA + pixel deadzone, command every frame."""
+
+    def __init__(self):
+        self.tracker = FaceTracker(detector=NoDetector())
+        self.commands = 0
+        self._frame = np.zeros((*FRAME, 3), dtype=np.uint8)
+
+    def step(self, offset, timestamp, now):
+        if offset is None:
+            return None
+        cx = FRAME[1] / 2 + offset * FRAME[1] / 2
+        face = (int(cx - 40), FRAME[0] // 2 - 40, 80, 80)
+        pan, tilt = self.tracker.face_to_pan_tilt(self._frame, face, PAN_RANGE)
+        if abs(pan) > 100 or abs(tilt) > 100:
+            self.commands += 1
+            return pan
+        return None
+
+
+class PidLoop:
+    """Kalman/PID controller as wired into the app."""
+
+    def __init__(self):
+        self.controller = PanTiltController(pan_range=PAN_RANGE)
+
+    @property
+    def commands(self):
+        return self.controller.commands
+
+    def step(self, offset, timestamp, now):
+        if offset is not None:
+            self.controller.observe((offset, 0.0), timestamp)
+        move = self.controller.command(now)
+        return None if move is None else move[0]
+
+
+def simulate(loop, trajectory, args, seed=0):
+    seconds, latency, speed, noise = args.seconds, args.latency, args.speed, args.noise
+    rng = np.random.default_rng(seed)
+    dt = 1 / FPS
+    camera = 0.0  # Where the camera points (normalized)
+    target = 0.0
+    pending = []  # (arrival time, capture time, measured offset)
+    offsets = []
+    for i in range(int(seconds * FPS)):
+        now = i * dt
+        # Camera slews towards its target
+        move = max(-speed * dt, min(speed * dt, target - camera))
+        camera += move
+        offset = trajectory(now) - camera
+        offsets.append(offset)
+        pending.append((now + latency, now, offset + rng.normal(0, noise)))
+
+        measured = None
+        captured = now
+        while pending and pending[0][0] <= now + 1e-9:
+            _, captured, measured = pending.pop(0)
+        pan = loop.step(measured, captured, now)
+        if pan is not None:
+            # Negative pan moves the view towards a face on the right
+            target += -pan / PAN_RANGE / args.fov_ratio
+    return np.array(offsets)
+
+
+def metrics(offsets, stop_time, seconds):
+    times = np.arange(len(offsets)) / FPS
+    if stop_time is None:
+        settle = float("nan")
+    else:
+        outside = np.nonzero(np.abs(offsets) >= SETTLED)[0]
+        last = times[outside[-1]] if len(outside) else 0.0
+        settle = max(last - stop_time, 0.0) if last < seconds - 1 else float("inf")
+    overshoot = 0.0
+    if stop_time is not None:
+        after = offsets[times >= stop_time]
+        sign = np.sign(after[0]) if len(after) and after[0] else 1.0
+        overshoot = max(0.0, float(np.max(-sign * after)))
+    return settle, float(np.mean(np.abs(offsets))), overshoot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.066, help="seconds")
+    parser.add_argument("--speed", type=float, default=2.0, help="camera slew, 1/s")
+    parser.add_argument("--noise", type=float, default=0.01, help="detection std")
+    parser.add_argument("--fov-ratio", type=float, default=1.0)
+    parser.add_argument("--seconds", type=float, default=8.0)
+    args = parser.parse_args()
+
+    print(
+        f"latency={args.latency * 1000:.0f}ms slew={args.speed}/s "
+        f"noise={args.noise} fov-ratio={args.fov_ratio} ({args.seconds:.0f}s per run)"
+    )
+    print(
+        f"  {'trajectory':10} {'loop':6} {'settle':>8} {'mean|e|':>8} "
+        f"{'overshoot':>9} {'cmd/s':>6}"
+    )
+    for name, (trajectory, stop_time) in TRAJECTORIES.items():
+        for label, loop in (("ema", LegacyLoop()), ("pid", PidLoop())):
+            offsets = simulate(loop, trajectory, args)
+            settle, mean_error, overshoot = metrics(offsets, stop_time, args.seconds)
+            print(
+                f"  {name:10} {label:6} {settle:7.2f}s {mean_error:8.3f} "
+                f"{overshoot:9.3f} {loop.commands / args.seconds:6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,20 @@
 from __future__ import annotations
 
 import subprocess
+import threading
+import time
 from pathlib import Path
+from typing import NamedTuple
 
 import cv2
 import numpy as np
 
+from core.framepool import FramePool, PooledFrame
+from core.synthetic import SyntheticSource
+from core.v4l2_capture import MmapCapture
+from utils.constants import CAPTURE_HEIGHT, CAPTURE_WIDTH
+from utils.metrics import timed
+
 
 def list_devices() -> list[tuple[str, str]]:
     """List available video devices. Returns [(path, name), ...]."""
@@ -37,18 +46,206 @@ def list_devices() -> list[tuple[str, str]]:
     return devices
 
 
+def is_yuyv(frame: np.ndarray) -> bool:
+    """True for a raw YUYV 4:2:2 frame, shaped (h, w, 2)."""
+    return frame.ndim == 3 and frame.shape[2] == 2
+
+
+class YuyvCapture:
+    """cv2.VideoCapture delivering raw YUYV frames (CONVERT_RGB off).
+
+    OpenCV hands raw frames out as a single row of bytes; they are read
+    straight into an (h, w, 2) buffer so the rest of the app sees the
+    same layout as the mmap backend.
+    """
+
+    def __init__(self, cap, width: int, height: int):
+        self.cap = cap
+        self.shape = (height, width, 2)
+
+    def read(self, image: np.ndarray | None = None):
+        if image is None or image.shape != self.shape:
+            image = np.empty(self.shape, dtype=np.uint8)
+        flat = image.reshape(1, -1)
+        ret, raw = self.cap.read(image=flat)
+        if not ret or raw is None or raw.size != image.size:
+            return False, None
+        if not np.shares_memory(raw, image):
+            np.copyto(flat, raw.reshape(1, -1))
+        return True, image
+
+    def __getattr__(self, name):
+        return getattr(self.cap, name)
+
+
+class CapturedFrame(NamedTuple):
+    """A frame with its capture sequence number and monotonic timestamp.
+
+    `buffer` is the pooled buffer behind `image`, if any. Camera keeps it
+    alive until the next read; retain() it to hold the frame longer.
+    """
+
+    image: np.ndarray
+    seq: int
+    timestamp: float
+    buffer: PooledFrame | None = None
+
+
+@timed("camera.read")
+def read_into_pool(
+    cap, pool: FramePool
+) -> tuple[np.ndarray | None, PooledFrame | None]:
+    """Read a frame from `cap` straight into a pooled buffer.
+
+    Returns (image, buffer). If the capture delivered a different size it
+    allocates its own array; buffer is then None and the pool switches to
+    the new shape so the next read fits.
+    """
+    buffer = pool.acquire()
+    ret, frame = cap.read(image=buffer.array)
+    if not ret or frame is None:
+        buffer.release()
+        return None, None
+    if frame is buffer.array:
+        return frame, buffer
+    buffer.release()
+    pool.resize(frame.shape)
+    return frame, None
+
+
+class CaptureThread:
+    """Grabs frames continuously into a single slot.
+
+    The reader always gets the newest frame without blocking, so a slow
+    consumer never backs up the driver queue. With a pool, frames are
+    captured into pooled buffers: the slot holds one reference and the
+    reader holds one until its next read.
+    """
+
+    def __init__(self, cap, pool: FramePool | None = None):
+        self.cap = cap
+        self.pool = pool
+        self._cond = threading.Condition()
+        self._latest: CapturedFrame | None = None
+        self._handed: CapturedFrame | None = None
+        self._consumed = True
+        self._running = False
+        self._thread = None
+        self.captured = 0
+        self.skipped = 0  # Frames replaced before anyone read them
+
+    def start(self):
+        """Start grabbing frames."""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 2.0):
+        """Stop grabbing and wait for the thread to exit."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def latest(self) -> CapturedFrame | None:
+        """Newest frame, or None before the first one arrives."""
+        with self._cond:
+            self._consumed = True
+            return self._hand_out(self._latest)
+
+    def wait(
+        self, after_seq: int, timeout: float | None = None
+    ) -> CapturedFrame | None:
+        """Block until a frame newer than `after_seq` arrives (or timeout)."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._latest is not None and self._latest.seq > after_seq,
+                timeout,
+            )
+            self._consumed = True
+            return self._hand_out(self._latest)
+
+    def _hand_out(self, frame: CapturedFrame | None) -> CapturedFrame | None:
+        """Move the reader's buffer reference to `frame` (lock held)."""
+        if frame is not self._handed:
+            if frame is not None and frame.buffer is not None:
+                frame.buffer.retain()
+            previous, self._handed = self._handed, frame
+            if previous is not None and previous.buffer is not None:
+                previous.buffer.release()
+        return frame
+
+    def _run(self):
+        seq = 0
+        while self._running:
+            if self.pool is not None:
+                frame, buffer = read_into_pool(self.cap, self.pool)
+            else:
+                frame = self.cap.read()[1]
+                buffer = None
+            if frame is None:
+                time.sleep(0.01)
+                continue
+            seq += 1
+            captured = CapturedFrame(frame, seq, time.monotonic(), buffer)
+            with self._cond:
+                if not self._consumed:
+                    self.skipped += 1
+                previous, self._latest = self._latest, captured
+                self._consumed = False
+                self.captured += 1
+                self._cond.notify_all()
+            if previous is not None and previous.buffer is not None:
+                previous.buffer.release()
+
+
 class Camera:
-    """OpenCV video capture wrapper."""
+    """OpenCV video capture wrapper.
+
+    With `threaded` set, a background thread grabs frames and read() returns
+    the newest one without waiting for the camera. The device "synthetic"
+    opens a generated test pattern instead of real hardware.
 
-    def __init__(self, device: str = "/dev/video0"):
+    `backend` picks how frames come off the device: "opencv" uses
+    cv2.VideoCapture, "mmap" streams kernel buffers directly (falling back
+    to OpenCV if the device can't stream).
+
+    Frames are captured into a FramePool, so steady-state reads allocate
+    nothing. A returned frame stays valid until the next read.
+
+    With `raw` set, frames are kept as YUYV (h, w, 2) instead of being
+    converted to BGR: tracking reads the Y plane and the preview converts
+    colour at its own, smaller size. Sources that can't deliver YUYV stay
+    BGR.
+    """
+
+    def __init__(
+        self,
+        device: str = "/dev/video0",
+        threaded: bool = False,
+        backend: str = "opencv",
+        raw: bool = False,
+    ):
         self.device = device
+        self.threaded = threaded
+        self.backend = backend
+        self.raw = raw
         self.cap = None
-        self.width = 640
-        self.height = 360
+        self.width = CAPTURE_WIDTH
+        self.height = CAPTURE_HEIGHT
+        self.pool: FramePool | None = None
+        self._grabber: CaptureThread | None = None
+        self._held: PooledFrame | None = None
+        self._seq = 0
 
-    def open(self) -> bool:
-        """Open the camera device."""
-        self.close()
+    def _create_capture(self):
+        """Create the underlying capture for self.device."""
+        if self.device == "synthetic":
+            return SyntheticSource(self.width, self.height)
+        if self.backend == "mmap":
+            cap = MmapCapture(self.device, self.width, self.height)
+            if cap.isOpened():
+                return cap
         # Extract device index from path
         if self.device.startswith("/dev/video"):
             try:
@@ -57,26 +254,89 @@ class Camera:
                 idx = 0
         else:
             idx = 0
+        return cv2.VideoCapture(idx)
 
-        self.cap = cv2.VideoCapture(idx)
+    def open(self) -> bool:
+        """Open the camera device."""
+        self.close()
+        self.cap = self._create_capture()
         if self.cap.isOpened():
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+            channels = 3
+            if self.raw and self._enable_raw():
+                channels = 2
+            self.pool = FramePool((self.height, self.width, channels))
+            if self.threaded:
+                self._grabber = CaptureThread(self.cap, self.pool)
+                self._grabber.start()
             return True
         return False
 
+    def _enable_raw(self) -> bool:
+        """Switch the open capture to raw YUYV output. False if unsupported."""
+        if isinstance(self.cap, (SyntheticSource, MmapCapture)):
+            return self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        yuyv = cv2.VideoWriter_fourcc(*"YUYV")
+        self.cap.set(cv2.CAP_PROP_FOURCC, yuyv)
+        # Drivers may accept the request and stay on MJPEG; trust only a readback
+        if int(self.cap.get(cv2.CAP_PROP_FOURCC)) != yuyv:
+            self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+            return False
+        if not self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0):
+            return False
+        width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or self.width
+        height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or self.height
+        self.cap = YuyvCapture(self.cap, width, height)
+        return True
+
     def close(self):
         """Release the camera."""
+        if self._grabber is not None:
+            self._grabber.stop()
+            self._grabber = None
         if self.cap is not None:
             self.cap.release()
             self.cap = None
+        self._held = None
 
     def read(self) -> np.ndarray | None:
-        """Read a frame. Returns BGR numpy array or None."""
+        """Read a frame. Returns a BGR (or raw YUYV) numpy array or None."""
+        captured = self.read_frame()
+        return captured.image if captured is not None else None
+
+    def read_frame(self) -> CapturedFrame | None:
+        """Read a frame with its sequence number and capture time.
+
+        In threaded mode this never blocks and may return the same frame
+        again; compare `seq` to spot new ones.
+        """
         if self.cap is None or not self.cap.isOpened():
             return None
-        ret, frame = self.cap.read()
-        return frame if ret else None
+        if self._grabber is not None:
+            return self._grabber.latest()
+        frame, buffer = read_into_pool(self.cap, self.pool)
+        if frame is None:
+            return None
+        if self._held is not None:
+            self._held.release()
+        self._held = buffer
+        self._seq += 1
+        return CapturedFrame(frame, self._seq, time.monotonic(), buffer)
+
+    def wait_frame(
+        self, after_seq: int, timeout: float | None = None
+    ) -> CapturedFrame | None:
+        """Read a frame newer than `after_seq`, waiting up to `timeout`.
+
+        In threaded mode this blocks on the capture thread; otherwise it
+        reads the device, which blocks anyway. May still return an old
+        frame (or None) when the timeout expires.
+        """
+        grabber = self._grabber
+        if grabber is not None:
+            return grabber.wait(after_seq, timeout)
+        return self.read_frame()
 
     def set_device(self, device: str):
         """Change device and reopen."""
@@ -0,0 +1,266 @@
+"""Pan/tilt controller: Kalman-filtered face position driving a PID loop.
+
+Positions are normalized frame offsets of the face centre (-1 to 1, 0 is
+centred), the same units FaceTracker.calculate_offset() returns. Commands
+are relative pan/tilt moves in device units.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+
+import numpy as np
+
+from utils.constants import (
+    TRACK_COMMAND_INTERVAL,
+    TRACK_HYSTERESIS,
+    TRACK_KALMAN_NOISE,
+    TRACK_MAX_EXTRAPOLATION,
+    TRACK_MIN_STEP,
+    TRACK_PID,
+    TRACK_SETTLE_TIME,
+)
+
+
+class KalmanFilter2D:
+    """Constant-velocity Kalman filter on a 2D point.
+
+    State is (x, y, vx, vy). `accel_noise` is the std-dev of unmodelled
+    acceleration (units/s^2); `measurement_noise` the std-dev of a position
+    measurement.
+    """
+
+    def __init__(self, accel_noise: float, measurement_noise: float):
+        self.accel_noise = accel_noise
+        self.r = np.eye(2) * measurement_noise**2
+        self.h = np.hstack([np.eye(2), np.zeros((2, 2))])
+        self.x = np.zeros(4)
+        self.p = np.eye(4)
+        self.time: float | None = None
+
+    @property
+    def initialized(self) -> bool:
+        """True once the first measurement has been folded in."""
+        return self.time is not None
+
+    def reset(self):
+        """Forget the state; the next measurement re-initializes it."""
+        self.x[:] = 0.0
+        self.p = np.eye(4)
+        self.time = None
+
+    def predict(self, t: float) -> np.ndarray:
+        """Advance the state to time `t` and return it."""
+        dt = t - self.time
+        if dt <= 0:
+            return self.x
+        f = np.eye(4)
+        f[0, 2] = f[1, 3] = dt
+        # Discrete white-noise acceleration model
+        g = np.array([[dt * dt / 2, 0], [0, dt * dt / 2], [dt, 0], [0, dt]])
+        q = g @ g.T * self.accel_noise**2
+        self.x = f @ self.x
+        self.p = f @ self.p @ f.T + q
+        self.time = t
+        return self.x
+
+    def update(self, z: tuple[float, float], t: float) -> np.ndarray:
+        """Fold in a position measurement taken at time `t`."""
+        z = np.asarray(z, dtype=float)
+        if not self.initialized:
+            self.x = np.array([z[0], z[1], 0.0, 0.0])
+            self.p = np.diag([self.r[0, 0], self.r[1, 1], 1.0, 1.0])
+            self.time = t
+            return self.x
+        self.predict(t)
+        y = z - self.h @ self.x
+        s = self.h @ self.p @ self.h.T + self.r
+        k = self.p @ self.h.T @ np.linalg.inv(s)
+        self.x = self.x + k @ y
+        self.p = (np.eye(4) - k @ self.h) @ self.p
+        return self.x
+
+    def shift(self, dx: float, dy: float):
+        """Move the position estimate, e.g. by an expected camera move."""
+        self.x[0] += dx
+        self.x[1] += dy
+
+    def position_at(self, t: float) -> tuple[float, float]:
+        """Predicted position at `t` without changing the state."""
+        dt = max(t - self.time, 0.0)
+        return (self.x[0] + self.x[2] * dt, self.x[1] + self.x[3] * dt)
+
+
+class PID:
+    """PID loop with integral clamping and conditional integration.
+
+    The integral only accumulates while the output is not saturated (or
+    when the error would pull it back), so it can't wind up during long
+    moves. The derivative acts on the measurement to avoid kicks.
+    """
+
+    def __init__(
+        self,
+        kp: float,
+        ki: float,
+        kd: float,
+        output_limit: float = 1.0,
+        integral_limit: float = 0.5,
+    ):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.output_limit = output_limit
+        self.integral_limit = integral_limit
+        self.integral = 0.0
+        self._last_measurement: float | None = None
+
+    def reset(self):
+        """Clear the integral and derivative history."""
+        self.integral = 0.0
+        self._last_measurement = None
+
+    def update(self, error: float, dt: float) -> float:
+        """One control step; `error` is setpoint minus measurement."""
+        derivative = 0.0
+        if self._last_measurement is not None and dt > 0:
+            derivative = (self._last_measurement - error) / dt
+        self._last_measurement = error
+
+        output = self.kp * error + self.ki * self.integral - self.kd * derivative
+        saturated = abs(output) >= self.output_limit
+        if dt > 0 and (not saturated or output * error < 0):
+            self.integral = float(
+                np.clip(
+                    self.integral + error * dt,
+                    -self.integral_limit,
+                    self.integral_limit,
+                )
+            )
+            output = self.kp * error + self.ki * self.integral - self.kd * derivative
+        return float(np.clip(output, -self.output_limit, self.output_limit))
+
+
+class PanTiltController:
+    """Turns face observations into rate-limited pan/tilt commands.
+
+    observe() feeds face positions (with their capture time) to a Kalman
+    filter; command() runs the PID on the filter's prediction for `now`.
+    Each axis has hysteresis: it starts moving when the offset exceeds the
+    enter threshold and holds still once it is back under the exit
+    threshold. Commands are sent at most every `interval` seconds and only
+    when at least `min_step` device units.
+
+    Detections arrive late. A measurement captured before a command was
+    sent doesn't show that move yet, so moves issued after its capture time
+    are added to it before it reaches the filter. Frames captured while the
+    camera is still moving (`settle` seconds after a command) are ignored,
+    and the next command waits for a frame captured after that.
+    """
+
+    def __init__(
+        self,
+        pan_range: int = 36000,
+        tilt_range: int = 36000,
+        gains: tuple[float, float, float] = TRACK_PID,
+        hysteresis: tuple[float, float] = TRACK_HYSTERESIS,
+        interval: float = TRACK_COMMAND_INTERVAL,
+        min_step: int = TRACK_MIN_STEP,
+        noise: tuple[float, float] = TRACK_KALMAN_NOISE,
+        settle: float = TRACK_SETTLE_TIME,
+    ):
+        self.pan_range = pan_range
+        self.tilt_range = tilt_range
+        self.enter, self.exit = hysteresis
+        self.interval = interval
+        self.min_step = min_step
+        self.settle = settle
+        self.filter = KalmanFilter2D(*noise)
+        self.pids = (PID(*gains), PID(*gains))
+        self._active = [False, False]
+        self._last_command: float | None = None
+        self._moves: deque[tuple[float, float, float]] = deque(maxlen=32)
+        self._last_seen: float | None = None  # Capture time of newest observation
+        self.commands = 0
+
+    def reset(self):
+        """Forget the face and all controller state."""
+        self.filter.reset()
+        for pid in self.pids:
+            pid.reset()
+        self._active = [False, False]
+        self._last_command = None
+        self._moves.clear()
+        self._last_seen = None
+
+    def observe(self, offset: tuple[float, float], timestamp: float):
+        """Feed a normalized face offset captured at `timestamp`."""
+        if self._last_command is not None and (
+            self._last_command < timestamp < self._last_command + self.settle
+        ):
+            return  # Camera is mid-move
+        dx, dy = offset
+        for sent, move_x, move_y in self._moves:
+            if sent > timestamp:
+                dx += move_x
+                dy += move_y
+        self.filter.update((dx, dy), timestamp)
+        self._last_seen = timestamp
+
+    def observe_face(
+        self,
+        face: tuple[int, int, int, int],
+        frame_shape: tuple[int, ...],
+        timestamp: float,
+    ):
+        """Feed a face box (x, y, w, h) detected in a frame of `frame_shape`."""
+        height, width = frame_shape[:2]
+        x, y, w, h = face
+        self.observe(
+            (
+                (x + w / 2 - width / 2) / (width / 2),
+                (y + h / 2 - height / 2) / (height / 2),
+            ),
+            timestamp,
+        )
+
+    def command(self, now: float) -> tuple[int, int] | None:
+        """Pan/tilt move to send at `now`, or None to hold still."""
+        if not self.filter.initialized:
+            return None
+        if self._last_command is not None and (
+            now - self._last_command < self.interval
+            or self._last_seen < self._last_command + self.settle
+        ):
+            return None
+        dt = self.interval if self._last_command is None else now - self._last_command
+
+        # Don't project a lost face further than a detection's worth
+        offset = self.filter.position_at(
+            min(now, self._last_seen + TRACK_MAX_EXTRAPOLATION)
+        )
+        outputs = []
+        for axis in range(2):
+            error = offset[axis]
+            if abs(error) > self.enter:
+                self._active[axis] = True
+            elif abs(error) < self.exit:
+                self._active[axis] = False
+                self.pids[axis].reset()
+            if self._active[axis]:
+                outputs.append(self.pids[axis].update(error, dt))
+            else:
+                outputs.append(0.0)
+
+        # Negative pan = move left (face on right), as in FaceTracker
+        pan = int(-outputs[0] * self.pan_range)
+        tilt = int(-outputs[1] * self.tilt_range)
+        if abs(pan) < self.min_step and abs(tilt) < self.min_step:
+            return None
+
+        # The move will pull the face towards the centre by this much
+        self.filter.shift(-outputs[0], -outputs[1])
+        self._moves.append((now, -outputs[0], -outputs[1]))
+        self._last_command = now
+        self.commands += 1
+        return (pan, tilt)
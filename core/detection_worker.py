@@ -0,0 +1,175 @@
+"""Face detection on a background thread, decoupled from the UI frame rate."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from core.tracker import FaceTracker
+from utils.constants import TRACK_MAX_EXTRAPOLATION
+
+
+class DetectionResult(NamedTuple):
+    """Tracker output for one submitted frame.
+
+    `velocity` is the face centre's motion in pixels/second, estimated from
+    the previous result; (0, 0) when unknown.
+    """
+
+    frame_id: int
+    timestamp: float  # Capture time of the frame (time.monotonic())
+    face: tuple[int, int, int, int] | None
+    velocity: tuple[float, float] = (0.0, 0.0)
+    latency: float = 0.0  # Seconds from capture to result
+
+    def face_at(self, now: float | None = None) -> tuple[int, int, int, int] | None:
+        """Face box extrapolated from capture time to `now`.
+
+        Compensates for detection latency; extrapolation is capped at
+        TRACK_MAX_EXTRAPOLATION seconds.
+        """
+        if self.face is None:
+            return None
+        if now is None:
+            now = time.monotonic()
+        age = min(max(now - self.timestamp, 0.0), TRACK_MAX_EXTRAPOLATION)
+        x, y, w, h = self.face
+        return (
+            int(round(x + self.velocity[0] * age)),
+            int(round(y + self.velocity[1] * age)),
+            w,
+            h,
+        )
+
+
+class DetectionWorker:
+    """Runs FaceTracker.track() on a worker thread.
+
+    submit() copies the frame into a preallocated buffer and returns at
+    once; if the worker is still busy the previous unprocessed frame is
+    replaced, so detection always works on the newest frame. OpenCV
+    releases the GIL while detecting, so the UI thread keeps running.
+    """
+
+    def __init__(self, tracker: FaceTracker):
+        self.tracker = tracker
+        self._cond = threading.Condition()
+        self._track_lock = threading.Lock()
+        self._slot = None  # Buffer submit() copies into
+        self._work = None  # Buffer the worker is reading
+        self._pending = None  # (frame_id, timestamp) waiting in _slot
+        self._latest: DetectionResult | None = None
+        self._generation = 0  # Bumped by reset() to discard in-flight work
+        self._running = False
+        self._thread = None
+        # Metrics
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0  # Frames replaced before the worker got to them
+
+    def start(self):
+        """Start the worker thread."""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="face-detection", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 2.0):
+        """Stop the worker; a frame being processed is finished first."""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, frame: np.ndarray, frame_id: int, timestamp: float):
+        """Hand a frame to the worker without waiting for detection."""
+        with self._cond:
+            if self._slot is None or self._slot.shape != frame.shape:
+                self._slot = np.empty_like(frame)
+            np.copyto(self._slot, frame)
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = (frame_id, timestamp)
+            self.submitted += 1
+            self._cond.notify_all()
+
+    def latest(self) -> DetectionResult | None:
+        """Newest result, or None before the first frame is processed."""
+        with self._cond:
+            return self._latest
+
+    def wait(self, after_id: int, timeout: float | None = None):
+        """Block until a result newer than `after_id` is published (or timeout)."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._latest is not None and self._latest.frame_id > after_id,
+                timeout,
+            )
+            return self._latest
+
+    def reset(self):
+        """Drop pending work and results and reset the tracker."""
+        with self._track_lock, self._cond:
+            self._pending = None
+            self._latest = None
+            self._generation += 1
+            self.tracker.reset()
+
+    def stats(self) -> dict[str, int]:
+        """Worker counters."""
+        with self._cond:
+            return {
+                "submitted": self.submitted,
+                "processed": self.processed,
+                "dropped": self.dropped,
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._pending is None:
+                    self._cond.wait()
+                if not self._running:
+                    break
+                frame_id, timestamp = self._pending
+                self._pending = None
+                generation = self._generation
+                # Swap so submit() can fill the other buffer meanwhile
+                self._slot, self._work = self._work, self._slot
+                work = self._work
+            # Publish before releasing the lock, so a reset() can't land in
+            # between and let a pre-reset face through as a new result
+            with self._track_lock:
+                if generation != self._generation:
+                    continue
+                face = self.tracker.track(work)
+                result = self._result(frame_id, timestamp, face)
+                with self._cond:
+                    self._latest = result
+                    self.processed += 1
+                    self._cond.notify_all()
+
+    def _result(self, frame_id: int, timestamp: float, face) -> DetectionResult:
+        velocity = (0.0, 0.0)
+        previous = self._latest
+        if face is not None and previous is not None and previous.face is not None:
+            dt = timestamp - previous.timestamp
+            if dt > 0:
+                velocity = (
+                    (face[0] + face[2] / 2 - previous.face[0] - previous.face[2] / 2)
+                    / dt,
+                    (face[1] + face[3] / 2 - previous.face[1] - previous.face[3] / 2)
+                    / dt,
+                )
+        return DetectionResult(
+            frame_id, timestamp, face, velocity, time.monotonic() - timestamp
+        )
@@ -0,0 +1,173 @@
+"""Interchangeable face detector backends.
+
+Every detector takes a grayscale image and returns (boxes, scores): an
+Nx4 int32 array of (x, y, w, h) and N float32 confidence values. Scores
+are only comparable within one backend.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from utils.constants import TRACK_DNN_SCORE
+
+# Models not shipped with opencv-python are looked up here, in order
+MODEL_DIRS = [
+    Path(__file__).parent.parent / "assets" / "models",
+    Path.home() / ".local/share/meet2ui/models",
+]
+
+# Distro OpenCV packages install the LBP cascades here
+CASCADE_DIRS = [
+    Path("/usr/share/opencv4/lbpcascades"),
+    Path("/usr/share/opencv/lbpcascades"),
+]
+
+LBP_CASCADE = "lbpcascade_frontalface_improved.xml"
+YUNET_MODEL = "face_detection_yunet_2023mar.onnx"
+YUNET_URL = (
+    "https://github.com/opencv/opencv_zoo/raw/main/models/"
+    f"face_detection_yunet/{YUNET_MODEL}"
+)
+
+# YuNet inputs are padded up to a multiple of this, so ROI crops of similar
+# size share one network input size instead of resizing it on every call
+_YUNET_STEP = 64
+
+
+def find_model(filename: str, extra_dirs: list[Path] | None = None) -> Path:
+    """Locate a model file in MODEL_DIRS, then in `extra_dirs`."""
+    directories = MODEL_DIRS + (extra_dirs or [])
+    for directory in directories:
+        path = directory / filename
+        if path.exists():
+            return path
+    searched = ", ".join(str(d) for d in directories)
+    raise FileNotFoundError(f"{filename} not found in: {searched}")
+
+
+def _empty() -> tuple[np.ndarray, np.ndarray]:
+    return np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.float32)
+
+
+class CascadeDetector:
+    """OpenCV cascade classifier (Haar or LBP).
+
+    Scores are the number of merged neighbour windows behind each box.
+    `scale_factor` is the step between scanned window sizes; larger is
+    faster and coarser.
+    """
+
+    def __init__(self, path: str | Path, name: str = "cascade"):
+        self.name = name
+        self.scale_factor = 1.1
+        self.cascade = cv2.CascadeClassifier(str(path))
+        if self.cascade.empty():
+            raise FileNotFoundError(f"Could not load cascade: {path}")
+
+    def detect(
+        self,
+        image: np.ndarray,
+        min_size: int,
+        max_size: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Detect faces between min_size and max_size pixels wide."""
+        boxes, neighbours = self.cascade.detectMultiScale2(
+            image,
+            scaleFactor=self.scale_factor,
+            minNeighbors=5,
+            minSize=(min_size, min_size),
+            maxSize=(max_size, max_size) if max_size else (0, 0),
+        )
+        if len(boxes) == 0:
+            return _empty()
+        return (
+            np.asarray(boxes, dtype=np.int32).reshape(-1, 4),
+            np.asarray(neighbours, dtype=np.float32).reshape(-1),
+        )
+
+
+class HaarDetector(CascadeDetector):
+    """Haar frontal face cascade bundled with opencv-python."""
+
+    def __init__(self):
+        super().__init__(
+            cv2.data.haarcascades + "haarcascade_frontalface_default.xml", "haar"
+        )
+
+
+class LbpDetector(CascadeDetector):
+    """LBP frontal face cascade: faster than Haar, a little less accurate."""
+
+    def __init__(self, path: str | Path | None = None):
+        super().__init__(path or find_model(LBP_CASCADE, CASCADE_DIRS), "lbp")
+
+
+class YuNetDetector:
+    """CPU DNN detector (cv2.FaceDetectorYN with the YuNet ONNX model).
+
+    YuNet expects 3-channel input; images are copied into a reused canvas
+    padded to a multiple of 64 pixels, so the network is only resized when
+    the padded size changes (e.g. between full scans and ROI crops), not
+    on every crop. Scores are face probabilities in [0, 1].
+    """
+
+    name = "yunet"
+
+    def __init__(
+        self, path: str | Path | None = None, score_threshold: float = TRACK_DNN_SCORE
+    ):
+        path = path or find_model(YUNET_MODEL)
+        self.net = cv2.FaceDetectorYN.create(str(path), "", (320, 320), score_threshold)
+        self._canvas = None  # Padded BGR network input
+
+    def detect(
+        self,
+        image: np.ndarray,
+        min_size: int,
+        max_size: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Detect faces between min_size and max_size pixels wide."""
+        height, width = image.shape[:2]
+        shape = (
+            -(-height // _YUNET_STEP) * _YUNET_STEP,
+            -(-width // _YUNET_STEP) * _YUNET_STEP,
+            3,
+        )
+        if self._canvas is None or self._canvas.shape != shape:
+            self._canvas = np.zeros(shape, dtype=np.uint8)
+            self.net.setInputSize((shape[1], shape[0]))
+        canvas = self._canvas
+        # Faces sit at the top-left, so boxes need no offset
+        canvas[:height, :width] = image[:, :, None] if image.ndim == 2 else image
+        canvas[height:] = 0
+        canvas[:height, width:] = 0
+
+        _, faces = self.net.detect(canvas)
+        if faces is None:
+            return _empty()
+        boxes = faces[:, :4].round().astype(np.int32)
+        keep = boxes[:, 2] >= min_size
+        if max_size:
+            keep &= boxes[:, 2] <= max_size
+        return boxes[keep], faces[keep, -1].astype(np.float32)
+
+
+DETECTORS = {
+    "haar": HaarDetector,
+    "lbp": LbpDetector,
+    "yunet": YuNetDetector,
+}
+
+
+def create_detector(name: str):
+    """Create a face detector by name: "haar", "lbp" or "yunet".
+
+    Raises FileNotFoundError if the backend's model file is missing.
+    """
+    if name not in DETECTORS:
+        raise ValueError(f"Unknown face detector: {name}")
+    return DETECTORS[name]()
@@ -0,0 +1,91 @@
+"""Preallocated, reference-counted frame buffers."""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+
+class PooledFrame:
+    """An image buffer on loan from a FramePool.
+
+    The buffer goes back to the pool when the last holder calls release().
+    """
+
+    __slots__ = ("array", "pool", "refs")
+
+    def __init__(self, array: np.ndarray, pool: FramePool):
+        self.array = array
+        self.pool = pool
+        self.refs = 0
+
+    def retain(self) -> PooledFrame:
+        """Add a holder."""
+        with self.pool._lock:
+            self.refs += 1
+        return self
+
+    def release(self):
+        """Drop a holder; the last release returns the buffer to the pool."""
+        self.pool._release(self)
+
+
+class FramePool:
+    """Fixed set of same-shaped buffers reused frame after frame.
+
+    acquire() hands out a free buffer with one reference. If every buffer
+    is in use the pool grows by one (counted in `grown`) rather than block.
+    """
+
+    def __init__(self, shape: tuple[int, ...], dtype=np.uint8, size: int = 4):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.Lock()
+        self._free = [self._new() for _ in range(size)]
+        self.allocated = size
+        self.grown = 0
+
+    def _new(self) -> PooledFrame:
+        return PooledFrame(np.empty(self.shape, dtype=self.dtype), self)
+
+    def acquire(self) -> PooledFrame:
+        """Take a free buffer (refcount 1)."""
+        with self._lock:
+            if self._free:
+                frame = self._free.pop()
+            else:
+                frame = self._new()
+                self.allocated += 1
+                self.grown += 1
+            frame.refs = 1
+        return frame
+
+    def _release(self, frame: PooledFrame):
+        with self._lock:
+            frame.refs -= 1
+            if frame.refs > 0:
+                return
+            if frame.refs < 0:
+                raise RuntimeError("PooledFrame released more times than retained")
+            # Buffers from before a resize are simply dropped
+            if frame.array.shape == self.shape:
+                self._free.append(frame)
+            else:
+                self.allocated -= 1
+
+    def resize(self, shape: tuple[int, ...]):
+        """Switch to a new frame shape, reallocating the free buffers."""
+        shape = tuple(shape)
+        with self._lock:
+            if shape == self.shape:
+                return
+            self.shape = shape
+            count = len(self._free)
+            self._free = [self._new() for _ in range(count)]
+
+    @property
+    def available(self) -> int:
+        """Number of free buffers."""
+        with self._lock:
+            return len(self._free)
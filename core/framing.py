@@ -0,0 +1,82 @@
+"""Software auto-framing: digital pan/tilt/zoom by cropping the frame."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from core.camera import is_yuyv
+from utils.constants import (
+    PREVIEW_HEIGHT,
+    PREVIEW_WIDTH,
+    TRACK_CROP_FACE,
+    TRACK_CROP_MAX_ZOOM,
+    TRACK_CROP_SPEED,
+)
+
+
+class AutoFramer:
+    """Smoothed, aspect-locked crop window that follows a face.
+
+    The window is sized so the face fills `face_fraction` of its height,
+    zooms in no further than `max_zoom` and always stays inside the frame.
+    It holds still while no face is reported. crop() returns a view of the
+    frame, so the preview's resize is the only copy.
+    """
+
+    def __init__(
+        self,
+        aspect: float = PREVIEW_WIDTH / PREVIEW_HEIGHT,
+        face_fraction: float = TRACK_CROP_FACE,
+        max_zoom: float = TRACK_CROP_MAX_ZOOM,
+        speed: float = TRACK_CROP_SPEED,
+    ):
+        self.aspect = aspect
+        self.face_fraction = face_fraction
+        self.max_zoom = max_zoom
+        self.speed = speed
+        self._window: list[float] | None = None  # centre x, centre y, height
+
+    def reset(self):
+        """Zoom back out to the full frame."""
+        self._window = None
+
+    def update(
+        self,
+        face: tuple[int, int, int, int] | None,
+        frame_shape: tuple[int, ...],
+    ) -> tuple[int, int, int, int]:
+        """Ease the window towards `face` and return it as (x, y, w, h)."""
+        height, width = frame_shape[:2]
+        full = min(height, width / self.aspect)
+        if self._window is None:
+            self._window = [width / 2, height / 2, full]
+        if face is not None:
+            x, y, w, h = face
+            size = min(max(h / self.face_fraction, full / self.max_zoom), full)
+            for i, target in enumerate((x + w / 2, y + h / 2, size)):
+                self._window[i] += self.speed * (target - self._window[i])
+        return self.rect(frame_shape)
+
+    def rect(self, frame_shape: tuple[int, ...]) -> tuple[int, int, int, int]:
+        """Current window in pixels, clamped to the frame."""
+        height, width = frame_shape[:2]
+        if self._window is None:
+            return (0, 0, width, height)
+        cx, cy, size = self._window
+        h = min(int(round(size)), height)
+        w = min(int(round(size * self.aspect)), width)
+        x = max(0, min(round(cx - w / 2), width - w))
+        y = max(0, min(round(cy - h / 2), height - h))
+        return (x, y, w, h)
+
+    def crop(self, frame: np.ndarray) -> np.ndarray:
+        """View of `frame` inside the current window (no copy).
+
+        On YUYV frames the window snaps to even columns so pixel pairs
+        sharing chroma stay together.
+        """
+        x, y, w, h = self.rect(frame.shape)
+        if is_yuyv(frame):
+            x -= x % 2
+            w -= w % 2
+        return frame[y : y + h, x : x + w]
@@ -0,0 +1,74 @@
+"""Cheap scene-change detection used to skip face detection on static frames."""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+from core.camera import is_yuyv
+from utils.constants import TRACK_MOTION_MAX_SKIP, TRACK_MOTION_THRESHOLD
+
+# Thumbnail size (width, height); each pixel averages a block of the frame
+_THUMB_SIZE = (32, 18)
+
+
+class MotionGate:
+    """Compares a tiny grayscale thumbnail of each frame with a reference.
+
+    Each thumbnail pixel is the mean of one block of the frame, so sensor
+    noise averages out while a moving face still shifts a few blocks. The
+    scene counts as static while no block differs from the reference by
+    more than `threshold` grey levels. The reference is the last frame that
+    was let through, so slow drift still adds up; after `max_skip` static
+    frames in a row one is let through anyway.
+    """
+
+    def __init__(
+        self,
+        threshold: int = TRACK_MOTION_THRESHOLD,
+        max_skip: int = TRACK_MOTION_MAX_SKIP,
+    ):
+        self.threshold = threshold
+        self.max_skip = max_skip
+        width, height = _THUMB_SIZE
+        self._thumb = np.empty((height, width, 3), dtype=np.uint8)
+        self._thumb_yuyv = np.empty((height, width, 2), dtype=np.uint8)
+        self._current = np.empty((height, width), dtype=np.uint8)
+        self._reference = np.empty((height, width), dtype=np.uint8)
+        self._diff = np.empty((height, width), dtype=np.uint8)
+        self._has_reference = False
+        self._skipped = 0  # Static frames since the last one let through
+
+    def reset(self):
+        """Forget the reference; the next frame is let through."""
+        self._has_reference = False
+        self._skipped = 0
+
+    def static(self, frame: np.ndarray) -> bool:
+        """True if `frame` looks like the reference and may be skipped."""
+        if frame.ndim == 2:
+            cv2.resize(
+                frame, _THUMB_SIZE, dst=self._current, interpolation=cv2.INTER_AREA
+            )
+        elif is_yuyv(frame):
+            # Channel 0 is Y at every pixel, so it shrinks like a gray image
+            cv2.resize(
+                frame, _THUMB_SIZE, dst=self._thumb_yuyv, interpolation=cv2.INTER_AREA
+            )
+            cv2.extractChannel(self._thumb_yuyv, 0, dst=self._current)
+        else:
+            cv2.resize(
+                frame, _THUMB_SIZE, dst=self._thumb, interpolation=cv2.INTER_AREA
+            )
+            cv2.cvtColor(self._thumb, cv2.COLOR_BGR2GRAY, dst=self._current)
+
+        if self._has_reference and self._skipped < self.max_skip:
+            cv2.absdiff(self._current, self._reference, dst=self._diff)
+            if self._diff.max() <= self.threshold:
+                self._skipped += 1
+                return True
+
+        self._current, self._reference = self._reference, self._current
+        self._has_reference = True
+        self._skipped = 0
+        return False
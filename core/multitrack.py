@@ -0,0 +1,208 @@
+"""Multi-face tracking: identity association across frames and target choice."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from utils.constants import TRACK_MAX_MISSES, TRACK_POLICY, TRACK_RESCAN_INTERVAL
+
+POLICIES = ("largest", "persistent", "center", "all")
+
+# A new target must beat the current one by this factor to take over
+_SWITCH_MARGIN = 1.2
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of (x, y, w, h) boxes: NxM for N boxes in a, M in b."""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    ax1, ay1 = a[:, 0:1], a[:, 1:2]
+    ax2, ay2 = ax1 + a[:, 2:3], ay1 + a[:, 3:4]
+    bx1, by1 = b[:, 0], b[:, 1]
+    bx2, by2 = bx1 + b[:, 2], by1 + b[:, 3]
+    w = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+    h = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+    inter = w * h
+    union = a[:, 2:3] * a[:, 3:4] + b[:, 2] * b[:, 3] - inter
+    return inter / np.maximum(union, 1e-6)
+
+
+def match_scores(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Association score: the higher of IoU and centroid proximity.
+
+    Proximity falls from 1 to 0 as the centres move two face widths apart,
+    so fast-moving faces whose boxes no longer overlap keep their track.
+    """
+    iou = iou_matrix(a, b)
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    ca = a[:, :2] + a[:, 2:] / 2
+    cb = b[:, :2] + b[:, 2:] / 2
+    dist = np.linalg.norm(ca[:, None, :] - cb[None, :, :], axis=2)
+    size = (a[:, 2:3] + b[:, 2]) / 2
+    proximity = np.clip(1 - dist / np.maximum(2 * size, 1e-6), 0, None)
+    return np.maximum(iou, proximity)
+
+
+def assign(scores: np.ndarray, threshold: float) -> list[tuple[int, int]]:
+    """Match rows to columns by repeatedly taking mutual best pairs.
+
+    Each round is vectorized; a pair is taken when the row and column are
+    each other's best remaining choice and the score beats `threshold`.
+    """
+    scores = scores.astype(np.float32, copy=True)
+    rows = np.arange(scores.shape[0])
+    matches = []
+    while scores.size and scores.max() > threshold:
+        best_col = scores.argmax(axis=1)
+        best_row = scores.argmax(axis=0)
+        mutual = (best_row[best_col] == rows) & (scores[rows, best_col] > threshold)
+        if not mutual.any():
+            break
+        for row in rows[mutual]:
+            matches.append((int(row), int(best_col[row])))
+        scores[rows[mutual], :] = -1.0
+        scores[:, best_col[mutual]] = -1.0
+    return matches
+
+
+class Track:
+    """One face followed across frames."""
+
+    __slots__ = ("id", "box", "hits", "age", "misses", "seen")
+
+    def __init__(self, track_id: int, box: tuple[int, int, int, int], seen: int = 0):
+        self.id = track_id
+        self.box = box
+        self.hits = 1  # Frames the face was detected in
+        self.age = 1  # Frames since the track started
+        self.misses = 0  # Consecutive frames without a detection
+        self.seen = seen  # Tracker frame the box was last refreshed on
+
+    def __repr__(self) -> str:
+        return f"Track(id={self.id}, box={self.box}, hits={self.hits})"
+
+
+class MultiFaceTracker:
+    """Keeps stable IDs for every detected face and picks the target.
+
+    Policies:
+        largest     biggest face
+        persistent  face seen in the most frames
+        center      face closest to the frame centre
+        all         bounding box around every face
+
+    The current target is kept unless another face beats it by 20% on the
+    policy's measure, so two similar faces don't make the camera hunt.
+    Faces not refreshed within `stale_after` frames are no longer visible.
+    """
+
+    def __init__(
+        self,
+        policy: str = TRACK_POLICY,
+        threshold: float = 0.3,
+        max_misses: int = TRACK_MAX_MISSES,
+        stale_after: int = TRACK_RESCAN_INTERVAL,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown target policy: {policy}")
+        self.policy = policy
+        self.threshold = threshold
+        self.max_misses = max_misses
+        self.stale_after = stale_after
+        self.frame = 0  # Frames seen through update() or follow()
+        self.tracks: list[Track] = []
+        self.target_id: int | None = None
+        self._next_id = 1
+
+    def reset(self):
+        """Drop all tracks."""
+        self.tracks = []
+        self.target_id = None
+
+    def update(self, boxes: np.ndarray) -> list[Track]:
+        """Associate this frame's detections with existing tracks.
+
+        Returns the tracks seen in this frame.
+        """
+        self.frame += 1
+        boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        matched_tracks = set()
+        matched_boxes = set()
+        if self.tracks and len(boxes):
+            previous = np.array([t.box for t in self.tracks], dtype=np.int32)
+            for ti, bi in assign(match_scores(previous, boxes), self.threshold):
+                track = self.tracks[ti]
+                track.box = tuple(boxes[bi].tolist())
+                track.hits += 1
+                track.misses = 0
+                track.seen = self.frame
+                matched_tracks.add(ti)
+                matched_boxes.add(bi)
+
+        for ti, track in enumerate(self.tracks):
+            track.age += 1
+            if ti not in matched_tracks:
+                track.misses += 1
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+
+        for bi in range(len(boxes)):
+            if bi not in matched_boxes:
+                box = tuple(boxes[bi].tolist())
+                self.tracks.append(Track(self._next_id, box, self.frame))
+                self._next_id += 1
+        return self.visible()
+
+    def follow(self, box: tuple[int, int, int, int] | None):
+        """Advance one frame without a full scan.
+
+        `box` is the target's box if it was found around its last position;
+        the other tracks are not refreshed and go stale.
+        """
+        self.frame += 1
+        if box is None:
+            return
+        for track in self.tracks:
+            if track.id == self.target_id:
+                track.box = box
+                track.seen = self.frame
+                return
+
+    def visible(self) -> list[Track]:
+        """Tracks detected in the latest full scan and refreshed recently."""
+        oldest = self.frame - self.stale_after
+        return [t for t in self.tracks if t.misses == 0 and t.seen >= oldest]
+
+    def select(self, frame_shape: tuple[int, ...]) -> tuple[int, int, int, int] | None:
+        """Box to follow under the policy, or None if no face is visible."""
+        visible = self.visible()
+        if not visible:
+            return None
+        if self.policy == "all":
+            boxes = np.array([t.box for t in visible])
+            x1, y1 = boxes[:, :2].min(axis=0)
+            x2, y2 = (boxes[:, :2] + boxes[:, 2:]).max(axis=0)
+            return (int(x1), int(y1), int(x2 - x1), int(y2 - y1))
+
+        scores = np.array([self._score(t, frame_shape) for t in visible])
+        best = visible[int(scores.argmax())]
+        current = next((t for t in visible if t.id == self.target_id), None)
+        if (
+            current is not None
+            and scores.max() <= self._score(current, frame_shape) * _SWITCH_MARGIN
+        ):
+            best = current
+        self.target_id = best.id
+        return best.box
+
+    def _score(self, track: Track, frame_shape: tuple[int, ...]) -> float:
+        """Higher is better for the active policy."""
+        x, y, w, h = track.box
+        if self.policy == "largest":
+            return float(w * h)
+        if self.policy == "persistent":
+            return float(track.hits)
+        # center: inverse distance, so closer scores higher
+        height, width = frame_shape[:2]
+        dist = np.hypot(x + w / 2 - width / 2, y + h / 2 - height / 2)
+        return 1.0 / (1.0 + dist)
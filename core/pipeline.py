@@ -0,0 +1,298 @@
+"""Frame pipeline building blocks: bounded queues and worker stages."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from typing import NamedTuple
+
+from core.camera import Camera, CapturedFrame
+from utils.trace import TRACER
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+def retain_frame(item):
+    """Take another reference on a frame's pooled buffer, if it has one."""
+    buffer = getattr(item, "buffer", None)
+    if buffer is not None:
+        buffer.retain()
+
+
+def release_frame(item):
+    """Give back a reference taken with retain_frame(); also an on_drop hook."""
+    buffer = getattr(item, "buffer", None)
+    if buffer is not None:
+        buffer.release()
+
+
+class AnalysedFrame(NamedTuple):
+    """A captured frame with the face the analyse stage found in it."""
+
+    captured: CapturedFrame
+    face: tuple[int, int, int, int] | None
+
+    @property
+    def buffer(self):
+        return self.captured.buffer
+
+
+class CameraSource:
+    """Source-stage callable returning each new camera frame once.
+
+    Every frame comes with its own reference on its pooled buffer; whoever
+    consumes it calls release_frame(). Call reset() after reopening the
+    camera, since sequence numbers start over.
+    """
+
+    def __init__(self, camera: Camera, timeout: float = 0.1):
+        self.camera = camera
+        self.timeout = timeout
+        self._last_seq = 0
+
+    def reset(self):
+        self._last_seq = 0
+
+    def __call__(self) -> CapturedFrame | None:
+        if not self.camera.is_open:
+            time.sleep(self.timeout)
+            return None
+        captured = self.camera.wait_frame(self._last_seq, self.timeout)
+        if captured is None or captured.seq == self._last_seq:
+            return None
+        self._last_seq = captured.seq
+        retain_frame(captured)
+        return captured
+
+
+class BoundedQueue:
+    """Thread-safe FIFO holding at most `maxsize` items.
+
+    When full, put() follows `policy`: DROP_OLDEST evicts the head (the
+    consumer always gets the freshest items), DROP_NEWEST discards the
+    new item, BLOCK waits for room. Every discarded item goes to
+    `on_drop`, e.g. to release a pooled buffer. `on_put` runs after each
+    accepted item, e.g. to wake a consumer that waits on something else.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1,
+        policy: str = DROP_OLDEST,
+        on_drop: Callable | None = None,
+        on_put: Callable | None = None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.on_drop = on_drop
+        self.on_put = on_put
+        self._items: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.put_count = 0
+        self.got = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    def put(self, item, timeout: float | None = None) -> bool:
+        """Add an item. Returns False if it was dropped instead."""
+        evicted = None
+        with self._cond:
+            if not self._closed and len(self._items) >= self.maxsize:
+                if self.policy == DROP_OLDEST:
+                    evicted = self._items.popleft()
+                elif self.policy == BLOCK:
+                    self._cond.wait_for(
+                        lambda: self._closed or len(self._items) < self.maxsize,
+                        timeout,
+                    )
+            accepted = not self._closed and len(self._items) < self.maxsize
+            if accepted:
+                self._items.append(item)
+                self.put_count += 1
+                self.max_depth = max(self.max_depth, len(self._items))
+                self._cond.notify_all()
+            self.dropped += (evicted is not None) + (not accepted)
+        # Callbacks may take other locks; run them outside ours
+        if evicted is not None:
+            self._drop(evicted)
+        if not accepted:
+            self._drop(item)
+        elif self.on_put is not None:
+            self.on_put()
+        return accepted
+
+    def get(self, timeout: float | None = None):
+        """Take the oldest item, waiting up to `timeout`. None if there's none."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self._closed, timeout)
+            return self._pop()
+
+    def get_nowait(self):
+        """Take the oldest item, or None if the queue is empty."""
+        with self._cond:
+            return self._pop()
+
+    def _pop(self):
+        if not self._items:
+            return None
+        self.got += 1
+        item = self._items.popleft()
+        self._cond.notify_all()
+        return item
+
+    def clear(self):
+        """Drop everything queued."""
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            self.dropped += len(items)
+            self._cond.notify_all()
+        for item in items:
+            self._drop(item)
+
+    def close(self):
+        """Wake all waiters and refuse further items."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.clear()
+
+    def _drop(self, item):
+        if self.on_drop is not None:
+            self.on_drop(item)
+
+    def stats(self) -> dict[str, int]:
+        """Queue counters."""
+        with self._cond:
+            return {
+                "depth": len(self._items),
+                "max_depth": self.max_depth,
+                "put": self.put_count,
+                "got": self.got,
+                "dropped": self.dropped,
+            }
+
+
+class Stage:
+    """Worker thread(s) running `fn` on items from `inbox`.
+
+    Non-None results go to every queue in `outboxes`. Without an inbox the
+    stage is a source: `fn` is called with no arguments and returns the
+    next item, or None if there's nothing yet. Several `workers` only make
+    sense for stateless `fn`s; results may then leave out of order.
+    Exceptions in `fn` are counted and the item is dropped through the
+    inbox's on_drop, so one bad frame doesn't stop the pipeline. A stage
+    that passes an item on hands its references over with it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        inbox: BoundedQueue | None = None,
+        outboxes: Sequence[BoundedQueue] = (),
+        workers: int = 1,
+        on_fanout: Callable | None = None,
+    ):
+        self.name = name
+        self.fn = fn
+        self.inbox = inbox
+        self.outboxes = list(outboxes)
+        self.workers = max(1, workers)
+        # Called once per extra outbox, e.g. to retain a shared buffer
+        self.on_fanout = on_fanout
+        self._threads: list[threading.Thread] = []
+        self._running = False
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.calls = 0
+        self.errors = 0
+        self.last_error: str | None = None
+        self.busy = 0.0  # Seconds spent in fn
+        self._started = 0.0
+
+    def start(self):
+        """Start the worker threads."""
+        if self._threads:
+            return
+        self._running = True
+        self._started = time.monotonic()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"{self.name}-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = 2.0):
+        """Stop the workers and wait for them to exit."""
+        self._running = False
+        if self.inbox is not None:
+            self.inbox.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self):
+        while self._running:
+            if self.inbox is not None:
+                item = self.inbox.get(timeout=0.1)
+                if item is None:
+                    continue
+                args = (item,)
+            else:
+                args = ()
+            start = time.perf_counter()
+            try:
+                result = self.fn(*args)
+            except Exception as e:  # noqa: BLE001
+                with self._lock:
+                    self.errors += 1
+                    self.last_error = repr(e)
+                if args and self.inbox.on_drop is not None:
+                    self.inbox.on_drop(args[0])
+                continue
+            finally:
+                end = time.perf_counter()
+                with self._lock:
+                    self.busy += end - start
+                    self.calls += 1
+                if TRACER.enabled:
+                    TRACER.add(self.name, start, end)
+            if result is None and not args:
+                continue  # Source had nothing yet
+            with self._lock:
+                self.processed += 1
+            if result is None:
+                continue
+            for i, outbox in enumerate(self.outboxes):
+                if i and self.on_fanout is not None:
+                    self.on_fanout(result)
+                outbox.put(result)
+
+    def stats(self) -> dict:
+        """Throughput counters: items/s since start and mean ms per call.
+
+        A source's busy_ms includes the time it waits for input.
+        """
+        with self._lock:
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            return {
+                "processed": self.processed,
+                "fps": self.processed / elapsed if self._started else 0.0,
+                "busy_ms": self.busy * 1000 / max(self.calls, 1),
+                "errors": self.errors,
+                "last_error": self.last_error,
+            }
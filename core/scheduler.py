@@ -0,0 +1,142 @@
+"""Adaptive detection quality driven by a per-frame time budget."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from utils.constants import TRACK_BUDGET_MS
+
+# Quality ladder, best first: (detect interval factor, detection width cap,
+# cascade scaleFactor, min face factor). None keeps the configured width.
+_LADDER = (
+    (1, None, 1.1, 1.0),
+    (1, 480, 1.1, 1.0),
+    (2, 480, 1.2, 1.25),
+    (2, 320, 1.2, 1.5),
+    (3, 320, 1.3, 1.5),
+)
+
+# Step down after this many frames over budget, up after this many with
+# load under _HEADROOM of the budget; hold for _SETTLE frames after a change
+_DOWN_FRAMES = 10
+_UP_FRAMES = 60
+_HEADROOM = 0.6
+_SETTLE = 30
+
+# Smoothing factor for the frame and detection time averages
+_ALPHA = 0.1
+
+
+class Quality(NamedTuple):
+    """Detection settings for one rung of the ladder."""
+
+    level: int
+    detect_interval: int
+    detect_width: int
+    scale_factor: float
+    min_face: int
+
+
+class DetectionScheduler:
+    """Trades detection quality for time to keep frames under `budget_ms`.
+
+    The app reports whole-loop frame times with frame_done(); FaceTracker
+    reports its own time per tracked frame with track_done(). Load is the
+    larger of the average frame time and the average cost of a frame that
+    ran detection (the spike that makes a frame late). Sustained load over
+    budget steps down the ladder: longer detection interval, smaller
+    detection image, coarser cascade scale steps and a larger minimum
+    face. Sustained headroom steps back up.
+    """
+
+    def __init__(self, budget_ms: float = TRACK_BUDGET_MS):
+        self.budget_ms = budget_ms
+        self.levels: list[Quality] = []
+        self.level = 0
+        self.frame_ms = 0.0
+        self.detect_ms = 0.0
+        self._over = 0
+        self._under = 0
+        self._settle = 0
+        self.stats = {
+            "level": 0,
+            "load_ms": 0.0,
+            "budget_ms": budget_ms,
+            "reason": "initial",
+            "changes": 0,
+        }
+
+    def configure(
+        self, detect_interval: int, detect_width: int, min_face: int
+    ) -> Quality:
+        """Build the ladder from the tracker's configured settings."""
+        self.levels = []
+        for level, (interval, width, scale_factor, face) in enumerate(_LADDER):
+            if width is None or (detect_width and detect_width < width):
+                width = detect_width
+            self.levels.append(
+                Quality(
+                    level,
+                    detect_interval * interval,
+                    width,
+                    scale_factor,
+                    round(min_face * face),
+                )
+            )
+        self.level = 0
+        self.stats.update(self.levels[0]._asdict())
+        return self.levels[0]
+
+    @property
+    def quality(self) -> Quality:
+        return self.levels[self.level]
+
+    @property
+    def load_ms(self) -> float:
+        return max(self.frame_ms, self.detect_ms)
+
+    def frame_done(self, frame_ms: float):
+        """Report the time one whole loop iteration took."""
+        self.frame_ms += (frame_ms - self.frame_ms) * _ALPHA
+
+    def track_done(self, elapsed_ms: float, detected: bool) -> Quality | None:
+        """Report one tracked frame. Returns new settings when they change."""
+        if detected:
+            self.detect_ms += (elapsed_ms - self.detect_ms) * _ALPHA
+        load = self.load_ms
+        self.stats["load_ms"] = load
+        if self._settle > 0:
+            # Averages still include frames from the old settings
+            self._settle -= 1
+            return None
+        if load > self.budget_ms:
+            self._over += 1
+            self._under = 0
+        elif load < self.budget_ms * _HEADROOM:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+            self.stats["reason"] = "within budget"
+            return None
+
+        if self._over >= _DOWN_FRAMES and self.level < len(self.levels) - 1:
+            return self._step(
+                1, f"load {load:.1f} ms over {self.budget_ms:.0f} ms budget"
+            )
+        if self._under >= _UP_FRAMES and self.level > 0:
+            return self._step(-1, f"load {load:.1f} ms under {_HEADROOM:.0%} of budget")
+        self.stats["reason"] = "over budget" if self._over else "headroom"
+        return None
+
+    def _step(self, direction: int, reason: str) -> Quality:
+        self.level += direction
+        self._over = self._under = 0
+        self._settle = _SETTLE
+        # Detection times at the old settings no longer apply
+        self.detect_ms = 0.0
+        quality = self.levels[self.level]
+        self.stats.update(quality._asdict())
+        self.stats["reason"] = reason
+        self.stats["changes"] += 1
+        return quality
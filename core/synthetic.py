@@ -0,0 +1,147 @@
+"""Synthetic video source for tests and benchmarks without a camera."""
+
+from __future__ import annotations
+
+import math
+import time
+
+import cv2
+import numpy as np
+
+
+def bgr_to_yuyv(bgr: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """Pack a BGR image as YUYV 4:2:2, shaped (h, w, 2) like a V4L2 buffer."""
+    h, w = bgr.shape[:2]
+    yuv = cv2.cvtColor(bgr, cv2.COLOR_BGR2YUV)
+    if out is None:
+        out = np.empty((h, w, 2), dtype=np.uint8)
+    out[:, :, 0] = yuv[:, :, 0]
+    # Chroma is shared by each pixel pair: U on even columns, V on odd
+    out[:, 0::2, 1] = yuv[:, 0::2, 1]
+    out[:, 1::2, 1] = yuv[:, 0::2, 2]
+    return out
+
+
+class SyntheticSource:
+    """cv2.VideoCapture stand-in producing a moving face-like pattern.
+
+    Frames are paced to `fps` when `realtime` is set, like a real camera.
+    Setting CAP_PROP_CONVERT_RGB to 0 switches read() to YUYV output.
+    """
+
+    def __init__(
+        self,
+        width: int = 640,
+        height: int = 360,
+        fps: float = 30.0,
+        realtime: bool = True,
+    ):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.realtime = realtime
+        self.frame_index = 0
+        self.convert_rgb = True
+        self._bgr = None  # Scratch frame for YUYV output
+        self._opened = True
+        self._next_time = None
+        self._background = self._create_background()
+
+    def _create_background(self) -> np.ndarray:
+        """Textured gradient so detectors have something to chew on."""
+        rng = np.random.default_rng(0)
+        ramp = np.linspace(40, 120, self.width, dtype=np.float32)
+        background = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        noise = rng.integers(0, 24, (self.height, self.width), dtype=np.uint8)
+        for channel, weight in enumerate((0.8, 0.9, 1.0)):
+            background[:, :, channel] = ramp * weight
+            background[:, :, channel] += noise
+        return background
+
+    def face_box(self, index: int | None = None) -> tuple[int, int, int, int]:
+        """Ground-truth (x, y, w, h) of the face in a given frame."""
+        if index is None:
+            index = self.frame_index
+        size = self.height // 3
+        t = index / self.fps
+        cx = self.width / 2 + self.width / 4 * math.sin(t * 0.7)
+        cy = self.height / 2 + self.height / 6 * math.sin(t * 1.1)
+        return (int(cx - size / 2), int(cy - size / 2), size, size)
+
+    def render(self, index: int, image: np.ndarray | None = None) -> np.ndarray:
+        """Draw frame `index`, into `image` if it has the right shape."""
+        if image is None or image.shape != self._background.shape:
+            image = self._background.copy()
+        else:
+            np.copyto(image, self._background)
+        x, y, w, h = self.face_box(index)
+        center = (x + w // 2, y + h // 2)
+        cv2.ellipse(image, center, (w // 2, h * 3 // 5), 0, 0, 360, (150, 180, 220), -1)
+        for eye_x in (x + w // 3, x + 2 * w // 3):
+            cv2.circle(
+                image, (eye_x, y + h * 2 // 5), max(w // 12, 1), (30, 30, 30), -1
+            )
+        cv2.ellipse(
+            image,
+            (center[0], y + h * 3 // 4),
+            (w // 5, h // 12),
+            0,
+            0,
+            180,
+            (40, 40, 90),
+            2,
+        )
+        return image
+
+    # cv2.VideoCapture interface
+
+    def isOpened(self) -> bool:  # noqa: N802
+        return self._opened
+
+    def read(self, image: np.ndarray | None = None):
+        if not self._opened:
+            return False, None
+        if self.realtime:
+            now = time.monotonic()
+            if self._next_time is None:
+                self._next_time = now
+            if self._next_time > now:
+                time.sleep(self._next_time - now)
+            self._next_time = max(self._next_time + 1.0 / self.fps, now)
+        if self.convert_rgb:
+            frame = self.render(self.frame_index, image)
+        else:
+            self._bgr = self.render(self.frame_index, self._bgr)
+            shape = (self.height, self.width, 2)
+            out = image if image is not None and image.shape == shape else None
+            frame = bgr_to_yuyv(self._bgr, out)
+        self.frame_index += 1
+        return True, frame
+
+    def set(self, prop: int, value: float) -> bool:
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self.width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            self.height = int(value)
+        elif prop == cv2.CAP_PROP_FPS:
+            self.fps = float(value)
+            return True
+        elif prop == cv2.CAP_PROP_CONVERT_RGB:
+            self.convert_rgb = bool(value)
+            return True
+        else:
+            return False
+        self._background = self._create_background()
+        return True
+
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        return 0.0
+
+    def release(self):
+        self._opened = False
@@ -2,40 +2,328 @@
 
 from __future__ import annotations
 
+import time
+
 import cv2
 import numpy as np
 
-from utils.constants import TRACK_DEADZONE, TRACK_SPEED
+from core.camera import is_yuyv
+from core.detectors import create_detector
+from core.motion import MotionGate
+from core.multitrack import MultiFaceTracker, match_scores
+from core.scheduler import DetectionScheduler, Quality
+from utils.constants import (
+    TRACK_DEADZONE,
+    TRACK_DETECT_INTERVAL,
+    TRACK_DETECT_WIDTH,
+    TRACK_DETECTOR,
+    TRACK_MATCH_THRESHOLD,
+    TRACK_MIN_FACE,
+    TRACK_MOTION_THRESHOLD,
+    TRACK_POLICY,
+    TRACK_RESCAN_INTERVAL,
+    TRACK_ROI_MISSES,
+    TRACK_SPEED,
+)
+from utils.metrics import timed
+
+# Smallest face window worth scanning (Haar and LBP cascades are 24 px)
+_CASCADE_WINDOW = 24
+
+# Template search window margin, as a fraction of the face size
+_SEARCH_MARGIN = 0.5
+
+# Overlay colours as (Y, chroma) for raw YUYV frames; see draw_overlay()
+_YUYV_GREEN = (150, 44)
+_YUYV_GRAY = (128, 128)
+
+# ROI re-detection: region margin and face size range relative to last face
+_ROI_MARGIN = 0.75
+_ROI_MIN_SCALE = 0.7
+_ROI_MAX_SCALE = 1.4
 
 
 class FaceTracker:
-    """Detects faces and calculates pan/tilt adjustments."""
+    """Detects faces and calculates pan/tilt adjustments.
 
-    def __init__(self):
-        # Use OpenCV's built-in Haar cascade
-        self.cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-        )
+    Frames wider than `detect_width` are downscaled once before detection;
+    boxes are always reported in full-frame coordinates. `detector` is a
+    backend name from core.detectors or a detector instance. track() runs
+    the detector every `detect_interval` frames and follows the face with
+    template matching in between. Detection first searches around the
+    last face and scans the whole frame only after `roi_misses` misses.
+    Full scans feed every face to a MultiFaceTracker, whose `policy` picks
+    the face to follow; one is forced every `rescan_interval` frames so
+    faces that leave or join are noticed. The "all" policy frames every
+    face, so it always scans the full frame. While the scene is static
+    (see MotionGate), track() skips all of this and repeats its last
+    result; `motion_threshold` 0 turns that off. A DetectionScheduler, if
+    given, lowers and restores detection quality to keep frames within
+    budget.
+    """
+
+    def __init__(
+        self,
+        detect_width: int = TRACK_DETECT_WIDTH,
+        detect_interval: int = TRACK_DETECT_INTERVAL,
+        match_threshold: float = TRACK_MATCH_THRESHOLD,
+        roi_misses: int = TRACK_ROI_MISSES,
+        detector=TRACK_DETECTOR,
+        policy: str = TRACK_POLICY,
+        motion_threshold: int = TRACK_MOTION_THRESHOLD,
+        scheduler: DetectionScheduler | None = None,
+        rescan_interval: int = TRACK_RESCAN_INTERVAL,
+    ):
+        if isinstance(detector, str):
+            detector = create_detector(detector)
+        self.detector = detector
         self.enabled = False
         self.last_face = None  # (x, y, w, h)
         self.smoothed_offset = (0.0, 0.0)
+        self.detect_width = detect_width
+        self._gray = None  # Reused grayscale buffer
+        self._small = None  # Reused downscaled buffer
+        self.detect_interval = max(1, detect_interval)
+        self.match_threshold = match_threshold
+        self._template = None  # Face patch from the last detection
+        self._box = None  # Face box in detection-image coordinates
+        self._since_detect = 0
+        self.roi_misses = roi_misses
+        self._misses = 0  # Consecutive ROI misses
+        self.rescan_interval = max(1, rescan_interval)
+        self.targets = MultiFaceTracker(policy, stale_after=self.rescan_interval)
+        self._last_scan = 0  # targets.frame of the last full scan
+        self._follow_one = policy != "all"  # ROI and template need one face
+        self._scale = 1.0  # Detection-image scale of the last full scan
+        self.motion = MotionGate(motion_threshold) if motion_threshold > 0 else None
+        self._result = None  # Last value track() returned
+        self.min_face = TRACK_MIN_FACE
+        self.scheduler = scheduler
+        if scheduler is not None:
+            scheduler.configure(self.detect_interval, detect_width, self.min_face)
+        self._detect_ms = 0.0  # Running mean cost of a track() that detected
+        self._match_ms = 0.0  # ... and of one that template-matched
+        self.stats = {
+            "detections": 0,
+            "matches": 0,
+            "lost": 0,
+            "roi_hits": 0,
+            "full_scans": 0,
+            "frames": 0,
+            "motion_skips": 0,
+            "skip_rate": 0.0,
+            "saved_ms": 0.0,  # Estimated tracking time the skips saved
+        }
+
+    def _to_gray(self, frame: np.ndarray) -> np.ndarray:
+        """Convert to grayscale into a reused buffer.
+
+        YUYV frames already carry grayscale: their Y plane is copied out
+        without any colour maths.
+        """
+        if frame.ndim == 2:
+            return frame
+        if self._gray is None or self._gray.shape != frame.shape[:2]:
+            self._gray = np.empty(frame.shape[:2], dtype=np.uint8)
+        code = cv2.COLOR_YUV2GRAY_YUYV if is_yuyv(frame) else cv2.COLOR_BGR2GRAY
+        return cv2.cvtColor(frame, code, dst=self._gray)
+
+    def _downscale(self, gray: np.ndarray) -> tuple[np.ndarray, float]:
+        """Shrink to detect_width with INTER_AREA. Returns (image, scale)."""
+        height, width = gray.shape
+        if not self.detect_width or width <= self.detect_width:
+            return gray, 1.0
+        scale = self.detect_width / width
+        size = (self.detect_width, max(1, round(height * scale)))
+        if self._small is None or self._small.shape != size[::-1]:
+            self._small = np.empty(size[::-1], dtype=np.uint8)
+        cv2.resize(gray, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        return self._small, scale
 
     def detect(self, frame: np.ndarray) -> tuple[int, int, int, int] | None:
         """Detect largest face in frame. Returns (x, y, w, h) or None."""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.cascade.detectMultiScale(
-            gray,
-            scaleFactor=1.1,
-            minNeighbors=5,
-            minSize=(60, 60),
+        small, scale = self._downscale(self._to_gray(frame))
+        box = self._detect_in(small, scale)
+        if box is None:
+            return None
+        self.last_face = self._to_full(box, scale)
+        return self.last_face
+
+    @timed("tracker.detect")
+    def _detect_in(
+        self, small: np.ndarray, scale: float
+    ) -> tuple[int, int, int, int] | None:
+        """Run the detector on a prepared gray image.
+
+        Searches around the last face first. Returns the target face in
+        `small` coordinates, or None.
+        """
+        self.stats["detections"] += 1
+        if (
+            self._box is not None
+            and self.roi_misses > 0
+            and self._follow_one
+            and not self._rescan_due()
+        ):
+            box = self._detect_roi(small)
+            if box is not None:
+                self.stats["roi_hits"] += 1
+                self._misses = 0
+                self._box = box
+                self.targets.follow(box)
+                return box
+            self._misses += 1
+            if self._misses < self.roi_misses:
+                self.targets.follow(None)
+                return None
+
+        self.stats["full_scans"] += 1
+        self._misses = 0
+        min_face = max(_CASCADE_WINDOW, round(self.min_face * scale))
+        boxes, _ = self.detector.detect(small, min_face)
+        self.targets.update(boxes)
+        self._last_scan = self.targets.frame
+        self._scale = scale
+        self._box = self.targets.select(small.shape)
+        return self._box
+
+    def _rescan_due(self) -> bool:
+        """Whether this frame needs a full scan to refresh the other faces."""
+        return self.targets.frame + 1 - self._last_scan >= self.rescan_interval
+
+    def _detect_roi(self, small: np.ndarray) -> tuple[int, int, int, int] | None:
+        """Run the detector on the region around the last face only.
+
+        The scale range is narrowed to sizes near the last face.
+        """
+        x, y, w, h = self._box
+        margin = int(max(w, h) * _ROI_MARGIN)
+        left = max(0, x - margin)
+        top = max(0, y - margin)
+        right = min(small.shape[1], x + w + margin)
+        bottom = min(small.shape[0], y + h + margin)
+        min_face = max(_CASCADE_WINDOW, int(w * _ROI_MIN_SCALE))
+        max_face = int(w * _ROI_MAX_SCALE)
+        if min(right - left, bottom - top) < min_face:
+            return None
+        boxes, _ = self.detector.detect(
+            small[top:bottom, left:right], min_face, max_face
         )
-        if len(faces) == 0:
+        if len(boxes) == 0:
+            return None
+        # Several faces near the target: keep the one that matches it best
+        boxes = boxes + np.array([left, top, 0, 0], dtype=np.int32)
+        best = boxes[match_scores([self._box], boxes)[0].argmax()]
+        return tuple(best.tolist())
+
+    def set_quality(self, quality: Quality):
+        """Apply detection settings chosen by the scheduler."""
+        self.detect_interval = quality.detect_interval
+        self.min_face = quality.min_face
+        if hasattr(self.detector, "scale_factor"):
+            self.detector.scale_factor = quality.scale_factor
+        if quality.detect_width != self.detect_width:
+            self.detect_width = quality.detect_width
+            # Boxes and template are in the old detection image's pixels
+            self._template = None
+            self._box = None
+            self.targets.reset()
+
+    @property
+    def faces(self) -> list[tuple[int, tuple[int, int, int, int]]]:
+        """(track id, box) of every face seen recently."""
+        return [
+            (t.id, self._to_full(t.box, self._scale)) for t in self.targets.visible()
+        ]
+
+    @staticmethod
+    def _to_full(box: tuple, scale: float) -> tuple[int, int, int, int]:
+        """Map a detection-image box back to full-frame coordinates."""
+        return tuple(int(round(v / scale)) for v in box)
+
+    @timed("tracker.track")
+    def track(self, frame: np.ndarray) -> tuple[int, int, int, int] | None:
+        """Follow the face, running the detector only every `detect_interval` frames.
+
+        Falls back to full detection as soon as the template match score
+        drops below `match_threshold`. Returns (x, y, w, h) or None.
+        """
+        stats = self.stats
+        stats["frames"] += 1
+        if self.motion is not None and self.motion.static(frame):
+            stats["motion_skips"] += 1
+            # Ungated, a static scene costs one detection per interval
+            interval = self.detect_interval
+            stats["saved_ms"] += (
+                self._detect_ms + (interval - 1) * self._match_ms
+            ) / interval
+            stats["skip_rate"] = stats["motion_skips"] / stats["frames"]
+            return self._result
+
+        start = time.perf_counter()
+        self._result = self._track(frame)
+        elapsed = (time.perf_counter() - start) * 1000
+        detected = self._since_detect == 1
+        if detected:
+            self._detect_ms += (elapsed - self._detect_ms) * 0.1
+        else:
+            self._match_ms += (elapsed - self._match_ms) * 0.1
+        if self.scheduler is not None:
+            quality = self.scheduler.track_done(elapsed, detected)
+            if quality is not None:
+                self.set_quality(quality)
+        stats["skip_rate"] = stats["motion_skips"] / stats["frames"]
+        return self._result
+
+    def _track(self, frame: np.ndarray) -> tuple[int, int, int, int] | None:
+        small, scale = self._downscale(self._to_gray(frame))
+        if (
+            self._follow_one
+            and self._template is not None
+            and self._since_detect < self.detect_interval
+            and not self._rescan_due()
+        ):
+            box = self._match(small)
+            if box is not None:
+                self._since_detect += 1
+                self.stats["matches"] += 1
+                self._box = box
+                self.targets.follow(box)
+                self.last_face = self._to_full(box, scale)
+                return self.last_face
+            self.stats["lost"] += 1
+
+        box = self._detect_in(small, scale)
+        self._since_detect = 1
+        if box is None:
+            self._template = None
             return None
-        # Return largest face
-        largest = max(faces, key=lambda f: f[2] * f[3])
-        self.last_face = tuple(largest)
+        x, y, w, h = box
+        self._template = small[y : y + h, x : x + w].copy()
+        self.last_face = self._to_full(box, scale)
         return self.last_face
 
+    def _match(self, small: np.ndarray) -> tuple[int, int, int, int] | None:
+        """Find the template near its last position. None if not confident."""
+        x, y = self._box[:2]
+        h, w = self._template.shape
+        margin_x = int(w * _SEARCH_MARGIN)
+        margin_y = int(h * _SEARCH_MARGIN)
+        left = max(0, x - margin_x)
+        top = max(0, y - margin_y)
+        right = min(small.shape[1], x + w + margin_x)
+        bottom = min(small.shape[0], y + h + margin_y)
+        if right - left < w or bottom - top < h:
+            return None
+        scores = cv2.matchTemplate(
+            small[top:bottom, left:right], self._template, cv2.TM_CCOEFF_NORMED
+        )
+        _, score, _, (dx, dy) = cv2.minMaxLoc(scores)
+        if score < self.match_threshold:
+            return None
+        return (left + dx, top + dy, w, h)
+
+    @timed("tracker.offset")
     def calculate_offset(
         self, frame: np.ndarray, face: tuple[int, int, int, int]
     ) -> tuple[float, float]:
@@ -77,10 +365,19 @@ class FaceTracker:
         self, frame: np.ndarray, pan_range: int = 36000, tilt_range: int = 36000
     ) -> tuple[int, int] | None:
         """Get pan/tilt adjustment values. Returns (pan_delta, tilt_delta) or None."""
-        face = self.detect(frame)
+        face = self.track(frame)
         if face is None:
             return None
+        return self.face_to_pan_tilt(frame, face, pan_range, tilt_range)
 
+    def face_to_pan_tilt(
+        self,
+        frame: np.ndarray,
+        face: tuple[int, int, int, int],
+        pan_range: int = 36000,
+        tilt_range: int = 36000,
+    ) -> tuple[int, int]:
+        """Pan/tilt adjustment that centres `face`. Returns (pan_delta, tilt_delta)."""
         offset_x, offset_y = self.calculate_offset(frame, face)
 
         # Convert normalized offset to pan/tilt delta
@@ -91,10 +388,20 @@ class FaceTracker:
         return (pan_delta, tilt_delta)
 
     def draw_overlay(self, frame: np.ndarray) -> np.ndarray:
-        """Draw face rectangle on frame."""
+        """Draw face rectangle on frame; other faces get a thin outline.
+
+        On a YUYV frame the second channel alternates U and V, so a colour
+        with U == V is drawn as (Y, chroma).
+        """
+        yuyv = is_yuyv(frame)
+        gray = _YUYV_GRAY if yuyv else (128, 128, 128)
+        if len(self.targets.visible()) > 1:
+            for _, (x, y, w, h) in self.faces:
+                cv2.rectangle(frame, (x, y), (x + w, y + h), gray, 1)
         if self.last_face is not None:
             x, y, w, h = self.last_face
-            color = (0, 255, 0) if self.enabled else (128, 128, 128)
+            green = _YUYV_GREEN if yuyv else (0, 255, 0)
+            color = green if self.enabled else gray
             cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
         return frame
 
@@ -102,3 +409,11 @@ class FaceTracker:
         """Reset tracking state."""
         self.last_face = None
         self.smoothed_offset = (0.0, 0.0)
+        self._template = None
+        self._box = None
+        self._since_detect = 0
+        self._misses = 0
+        self.targets.reset()
+        self._result = None
+        if self.motion is not None:
+            self.motion.reset()
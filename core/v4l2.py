@@ -1,22 +1,28 @@
-"""v4l2-ctl wrapper for camera control."""
+"""V4L2 camera control with ioctl and v4l2-ctl backends."""
 
 from __future__ import annotations
 
 import re
 import subprocess
+import threading
 
+from core.v4l2_ioctl import IoctlBackend
+from utils.constants import CONTROLS, V4L2_BACKEND
+from utils.metrics import timed
 
-class V4L2Control:
-    """Wrapper for v4l2-ctl commands."""
 
-    def __init__(self, device: str = "/dev/video0"):
+class SubprocessBackend:
+    """Control backend that shells out to v4l2-ctl for every call."""
+
+    def __init__(self, device: str, executable: str = "v4l2-ctl"):
         self.device = device
+        self.executable = executable
 
     def get(self, control: str) -> int | None:
         """Get current value of a control."""
         try:
             result = subprocess.run(
-                ["v4l2-ctl", "-d", self.device, "--get-ctrl", control],
+                [self.executable, "-d", self.device, "--get-ctrl", control],
                 capture_output=True,
                 text=True,
                 timeout=2,
@@ -29,11 +35,40 @@ class V4L2Control:
             pass
         return None
 
+    def get_many(self, controls: list[str]) -> dict[str, int]:
+        """Read several controls with a single v4l2-ctl invocation.
+
+        Unknown or unreadable controls are left out of the result.
+        """
+        if not controls:
+            return {}
+        try:
+            result = subprocess.run(
+                [self.executable, "-d", self.device, "--get-ctrl", ",".join(controls)],
+                capture_output=True,
+                text=True,
+                timeout=2,
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return {}
+        # v4l2-ctl prints whatever it could read even if one control failed
+        values = {}
+        for match in re.finditer(r"^\s*(\w+):\s*(-?\d+)", result.stdout, re.MULTILINE):
+            if match.group(1) in controls:
+                values[match.group(1)] = int(match.group(2))
+        return values
+
     def set(self, control: str, value: int) -> bool:
         """Set a control value."""
         try:
             result = subprocess.run(
-                ["v4l2-ctl", "-d", self.device, "--set-ctrl", f"{control}={value}"],
+                [
+                    self.executable,
+                    "-d",
+                    self.device,
+                    "--set-ctrl",
+                    f"{control}={value}",
+                ],
                 capture_output=True,
                 timeout=2,
             )
@@ -41,12 +76,33 @@ class V4L2Control:
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
 
+    def set_many(self, values: dict[str, int]) -> dict[str, bool]:
+        """Set several controls with a single v4l2-ctl invocation.
+
+        If the batch fails, each control is retried on its own so the
+        returned per-control status is exact.
+        """
+        if not values:
+            return {}
+        spec = ",".join(f"{control}={value}" for control, value in values.items())
+        try:
+            result = subprocess.run(
+                [self.executable, "-d", self.device, "--set-ctrl", spec],
+                capture_output=True,
+                timeout=2,
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return {control: False for control in values}
+        if result.returncode == 0:
+            return {control: True for control in values}
+        return {control: self.set(control, value) for control, value in values.items()}
+
     def list_controls(self) -> dict[str, tuple[int, int, int]]:
         """List available controls with (min, max, default)."""
         controls = {}
         try:
             result = subprocess.run(
-                ["v4l2-ctl", "-d", self.device, "--list-ctrls"],
+                [self.executable, "-d", self.device, "--list-ctrls"],
                 capture_output=True,
                 text=True,
                 timeout=5,
@@ -68,6 +124,144 @@ class V4L2Control:
             pass
         return controls
 
+    def close(self):
+        """Nothing to release; each call is its own process."""
+
+
+def create_backend(name: str, device: str, io=None):
+    """Create a control backend by name: "auto", "ioctl" or "subprocess".
+
+    "auto" opens the device for ioctl access and falls back to v4l2-ctl if
+    the node can't be opened or enumerated.
+    """
+    if name == "subprocess":
+        return SubprocessBackend(device)
+    if name == "ioctl":
+        return IoctlBackend(device, io)
+    if name == "auto":
+        try:
+            return IoctlBackend(device, io)
+        except OSError:
+            return SubprocessBackend(device)
+    raise ValueError(f"Unknown V4L2 backend: {name}")
+
+
+class V4L2Control:
+    """Camera control front-end over a pluggable backend.
+
+    Keeps a shadow copy of the last value known to be on the device and
+    skips writes that wouldn't change anything. The cache assumes this
+    object is the only writer; call invalidate() after external changes.
+    Safe to call from the UI thread and the control writer thread at once.
+    """
+
+    def __init__(
+        self, device: str = "/dev/video0", backend: str | None = None, io=None
+    ):
+        self.device = device
+        self.backend_name = backend or V4L2_BACKEND
+        self._io = io
+        self.backend = create_backend(self.backend_name, device, io)
+        self._lock = threading.RLock()
+        self._cache: dict[str, int] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @timed("v4l2.get", lambda self, control: {"control": control})
+    def get(self, control: str) -> int | None:
+        """Get current value of a control (always reads the device)."""
+        with self._lock:
+            value = self.backend.get(control)
+            if value is None:
+                self._cache.pop(control, None)
+            else:
+                self._cache[control] = value
+            return value
+
+    @timed("v4l2.get_many", lambda self, controls: {"controls": list(controls)})
+    def get_many(self, controls: list[str]) -> dict[str, int]:
+        """Read several controls in one device round trip.
+
+        Controls that couldn't be read are left out of the result.
+        """
+        with self._lock:
+            values = self.backend.get_many(list(controls))
+            self._cache.update(values)
+            return values
+
+    def snapshot(self) -> dict[str, int]:
+        """Read every control the app knows about in one round trip."""
+        return self.get_many(list(CONTROLS))
+
+    @timed("v4l2.set", lambda self, control, value: {control: value})
+    def set(self, control: str, value: int) -> bool:
+        """Set a control value, skipping the write if it's already set."""
+        value = int(value)
+        with self._lock:
+            if self._cache.get(control) == value:
+                self.cache_hits += 1
+                return True
+            self.cache_misses += 1
+            success = self.backend.set(control, value)
+            self._store(control, value, success)
+            return success
+
+    @timed("v4l2.set_many", lambda self, values: dict(values))
+    def set_many(self, values: dict[str, int]) -> dict[str, bool]:
+        """Set several controls in one device round trip.
+
+        Controls already at the requested value are skipped. Returns
+        per-control success.
+        """
+        results = {}
+        pending = {}
+        with self._lock:
+            for control, value in values.items():
+                if self._cache.get(control) == int(value):
+                    self.cache_hits += 1
+                    results[control] = True
+                else:
+                    self.cache_misses += 1
+                    pending[control] = int(value)
+            if pending:
+                written = self.backend.set_many(pending)
+                for control, value in pending.items():
+                    self._store(control, value, written[control])
+                results.update(written)
+        return {control: results[control] for control in values}
+
+    def _store(self, control: str, value: int, success: bool):
+        # A failed write leaves the device state unknown
+        if success:
+            self._cache[control] = value
+        else:
+            self._cache.pop(control, None)
+
+    def invalidate(self, control: str | None = None):
+        """Forget cached values so the next write always reaches the device."""
+        with self._lock:
+            if control is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(control, None)
+
+    def cache_stats(self) -> dict[str, int]:
+        """Cache hit/miss counters."""
+        return {"hits": self.cache_hits, "misses": self.cache_misses}
+
+    def list_controls(self) -> dict[str, tuple[int, int, int]]:
+        """List available controls with (min, max, default)."""
+        return self.backend.list_controls()
+
     def set_device(self, device: str):
         """Change the target device."""
-        self.device = device
+        with self._lock:
+            self.backend.close()
+            self.invalidate()
+            self.device = device
+            self.backend = create_backend(self.backend_name, device, self._io)
+
+    def close(self):
+        """Release the backend (closes the device fd for ioctl)."""
+        with self._lock:
+            self.backend.close()
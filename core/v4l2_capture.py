@@ -0,0 +1,449 @@
+"""V4L2 streaming capture over mmap'd kernel buffers."""
+
+from __future__ import annotations
+
+import contextlib
+import ctypes
+import errno
+import fcntl
+import mmap
+import os
+import select
+from collections import Counter, deque
+from types import SimpleNamespace
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+from core.synthetic import SyntheticSource, bgr_to_yuyv
+from core.v4l2_ioctl import _IOC_WRITE, _ioc, _iowr
+
+
+def fourcc(code: str) -> int:
+    """V4L2 pixel format code from its four characters."""
+    a, b, c, d = (ord(ch) for ch in code)
+    return a | (b << 8) | (c << 16) | (d << 24)
+
+
+PIXEL_FORMATS = {
+    "YUYV": fourcc("YUYV"),
+    "MJPG": fourcc("MJPG"),
+    "GREY": fourcc("GREY"),
+}
+
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_MEMORY_MMAP = 1
+V4L2_FIELD_NONE = 1
+
+
+class v4l2_pix_format(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_uint32),
+        ("height", ctypes.c_uint32),
+        ("pixelformat", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("bytesperline", ctypes.c_uint32),
+        ("sizeimage", ctypes.c_uint32),
+        ("colorspace", ctypes.c_uint32),
+        ("priv", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("ycbcr_enc", ctypes.c_uint32),
+        ("quantization", ctypes.c_uint32),
+        ("xfer_func", ctypes.c_uint32),
+    ]
+
+
+class _v4l2_format_union(ctypes.Union):
+    _fields_ = [
+        ("pix", v4l2_pix_format),
+        ("raw_data", ctypes.c_uint8 * 200),
+        ("_align", ctypes.c_void_p),  # Kernel union holds pointers
+    ]
+
+
+class v4l2_format(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("fmt", _v4l2_format_union),
+    ]
+
+
+class v4l2_requestbuffers(ctypes.Structure):
+    _fields_ = [
+        ("count", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("capabilities", ctypes.c_uint32),
+        ("flags", ctypes.c_uint8),
+        ("reserved", ctypes.c_uint8 * 3),
+    ]
+
+
+class timeval(ctypes.Structure):
+    _fields_ = [
+        ("tv_sec", ctypes.c_long),
+        ("tv_usec", ctypes.c_long),
+    ]
+
+
+class v4l2_timecode(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("frames", ctypes.c_uint8),
+        ("seconds", ctypes.c_uint8),
+        ("minutes", ctypes.c_uint8),
+        ("hours", ctypes.c_uint8),
+        ("userbits", ctypes.c_uint8 * 4),
+    ]
+
+
+class _v4l2_buffer_m(ctypes.Union):
+    _fields_ = [
+        ("offset", ctypes.c_uint32),
+        ("userptr", ctypes.c_ulong),
+        ("planes", ctypes.c_void_p),
+        ("fd", ctypes.c_int32),
+    ]
+
+
+class v4l2_buffer(ctypes.Structure):
+    _fields_ = [
+        ("index", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("bytesused", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("timestamp", timeval),
+        ("timecode", v4l2_timecode),
+        ("sequence", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("m", _v4l2_buffer_m),
+        ("length", ctypes.c_uint32),
+        ("reserved2", ctypes.c_uint32),
+        ("request_fd", ctypes.c_int32),
+    ]
+
+
+VIDIOC_S_FMT = _iowr(5, v4l2_format)
+VIDIOC_REQBUFS = _iowr(8, v4l2_requestbuffers)
+VIDIOC_QUERYBUF = _iowr(9, v4l2_buffer)
+VIDIOC_QBUF = _iowr(15, v4l2_buffer)
+VIDIOC_DQBUF = _iowr(17, v4l2_buffer)
+VIDIOC_STREAMON = _ioc(_IOC_WRITE, 18, ctypes.sizeof(ctypes.c_int))
+VIDIOC_STREAMOFF = _ioc(_IOC_WRITE, 19, ctypes.sizeof(ctypes.c_int))
+
+
+def _mmap(fd: int, length: int, offset: int):
+    return mmap.mmap(
+        fd, length, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE, offset=offset
+    )
+
+
+def _wait(fd: int, timeout: float) -> bool:
+    return bool(select.select([fd], [], [], timeout)[0])
+
+
+# Real device access; tests swap in FakeStreamingDevice
+CAPTURE_IO = SimpleNamespace(
+    open=os.open,
+    close=os.close,
+    ioctl=fcntl.ioctl,
+    mmap=_mmap,
+    wait=_wait,
+)
+
+
+class MappedFrame(NamedTuple):
+    """A dequeued kernel buffer exposed as a NumPy view (no copy).
+
+    `data` is (h, w, 2) for YUYV, (h, w) for GREY and the compressed bytes
+    for MJPG. It's only valid until passed back to MmapCapture.requeue().
+    """
+
+    index: int
+    data: np.ndarray
+    sequence: int
+    timestamp: float
+
+
+class MmapCapture:
+    """V4L2 streaming capture using VIDIOC_REQBUFS/QBUF/DQBUF and mmap.
+
+    dequeue() hands out kernel buffers as NumPy views; read() implements
+    the cv2.VideoCapture interface on top, converting straight from the
+    mapped buffer to BGR and re-queueing it. With CAP_PROP_CONVERT_RGB set
+    to 0, YUYV frames are copied out as-is instead.
+    """
+
+    def __init__(
+        self,
+        device: str,
+        width: int = 640,
+        height: int = 360,
+        pixelformat: str = "YUYV",
+        buffers: int = 4,
+        io=None,
+    ):
+        self.device = device
+        self.width = width
+        self.height = height
+        self.pixelformat = pixelformat
+        self.bytesperline = 0
+        self.num_buffers = buffers
+        self.convert = True  # read() converts to BGR
+        self.io = io or CAPTURE_IO
+        self.fd = None
+        self._maps: list = []
+        self._views: list[np.ndarray] = []
+        self._streaming = False
+        try:
+            self.open()
+        except OSError:
+            self.release()
+
+    def open(self):
+        """Negotiate format, map buffers and start streaming."""
+        self.fd = self.io.open(self.device, os.O_RDWR | os.O_NONBLOCK)
+
+        fmt = v4l2_format(type=V4L2_BUF_TYPE_VIDEO_CAPTURE)
+        fmt.fmt.pix.width = self.width
+        fmt.fmt.pix.height = self.height
+        fmt.fmt.pix.pixelformat = PIXEL_FORMATS[self.pixelformat]
+        fmt.fmt.pix.field = V4L2_FIELD_NONE
+        self.io.ioctl(self.fd, VIDIOC_S_FMT, fmt, True)
+        # The driver may pick the nearest supported size
+        self.width = fmt.fmt.pix.width
+        self.height = fmt.fmt.pix.height
+        self.bytesperline = fmt.fmt.pix.bytesperline
+
+        req = v4l2_requestbuffers(
+            count=self.num_buffers,
+            type=V4L2_BUF_TYPE_VIDEO_CAPTURE,
+            memory=V4L2_MEMORY_MMAP,
+        )
+        self.io.ioctl(self.fd, VIDIOC_REQBUFS, req, True)
+
+        for index in range(req.count):
+            buf = self._buffer(index)
+            self.io.ioctl(self.fd, VIDIOC_QUERYBUF, buf, True)
+            mapped = self.io.mmap(self.fd, buf.length, buf.m.offset)
+            self._maps.append(mapped)
+            self._views.append(self._view(mapped))
+            self.io.ioctl(self.fd, VIDIOC_QBUF, buf, True)
+
+        self.io.ioctl(
+            self.fd, VIDIOC_STREAMON, ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE), True
+        )
+        self._streaming = True
+
+    def _buffer(self, index: int) -> v4l2_buffer:
+        return v4l2_buffer(
+            index=index, type=V4L2_BUF_TYPE_VIDEO_CAPTURE, memory=V4L2_MEMORY_MMAP
+        )
+
+    def _view(self, mapped) -> np.ndarray:
+        """Strided view over a mapped buffer, honouring bytesperline."""
+        if self.pixelformat == "YUYV":
+            return np.ndarray(
+                (self.height, self.width, 2),
+                np.uint8,
+                buffer=mapped,
+                strides=(self.bytesperline, 2, 1),
+            )
+        if self.pixelformat == "GREY":
+            return np.ndarray(
+                (self.height, self.width),
+                np.uint8,
+                buffer=mapped,
+                strides=(self.bytesperline, 1),
+            )
+        return np.frombuffer(mapped, dtype=np.uint8)
+
+    def dequeue(self, timeout: float = 1.0) -> MappedFrame | None:
+        """Take the next filled buffer from the driver, or None on timeout."""
+        if not self._streaming or not self.io.wait(self.fd, timeout):
+            return None
+        buf = self._buffer(0)
+        try:
+            self.io.ioctl(self.fd, VIDIOC_DQBUF, buf, True)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return None
+            raise
+        data = self._views[buf.index]
+        if self.pixelformat == "MJPG":
+            data = data[: buf.bytesused]
+        timestamp = buf.timestamp.tv_sec + buf.timestamp.tv_usec / 1e6
+        return MappedFrame(buf.index, data, buf.sequence, timestamp)
+
+    def requeue(self, frame: MappedFrame):
+        """Hand a buffer back to the driver once the consumer is done."""
+        if self._streaming:
+            self.io.ioctl(self.fd, VIDIOC_QBUF, self._buffer(frame.index), True)
+
+    # cv2.VideoCapture interface
+
+    def isOpened(self) -> bool:  # noqa: N802
+        return self._streaming
+
+    def read(self, image: np.ndarray | None = None):
+        frame = self.dequeue()
+        if frame is None:
+            return False, None
+        try:
+            if self.pixelformat == "YUYV" and not self.convert:
+                if image is None or image.shape != frame.data.shape:
+                    image = np.empty(frame.data.shape, dtype=np.uint8)
+                np.copyto(image, frame.data)
+            elif self.pixelformat == "YUYV":
+                image = cv2.cvtColor(frame.data, cv2.COLOR_YUV2BGR_YUYV, dst=image)
+            elif self.pixelformat == "GREY":
+                image = cv2.cvtColor(frame.data, cv2.COLOR_GRAY2BGR, dst=image)
+            else:
+                image = cv2.imdecode(frame.data, cv2.IMREAD_COLOR)
+        finally:
+            self.requeue(frame)
+        return image is not None, image
+
+    def set(self, prop: int, value: float) -> bool:
+        if prop == cv2.CAP_PROP_CONVERT_RGB and self.pixelformat == "YUYV":
+            self.convert = bool(value)
+            return True
+        # Format is fixed once streaming; pass size to the constructor instead
+        return False
+
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        return 0.0
+
+    def release(self):
+        if self.fd is None:
+            return
+        if self._streaming:
+            self._streaming = False
+            with contextlib.suppress(OSError):
+                self.io.ioctl(
+                    self.fd,
+                    VIDIOC_STREAMOFF,
+                    ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE),
+                    True,
+                )
+        self._views.clear()
+        for mapped in self._maps:
+            # Fake buffers have no close(); a held view makes close() fail
+            with contextlib.suppress(AttributeError, BufferError):
+                mapped.close()
+        self._maps.clear()
+        self.io.close(self.fd)
+        self.fd = None
+
+
+class FakeStreamingDevice:
+    """Simulated V4L2 capture device with a kernel-style buffer queue.
+
+    Implements the open/close/ioctl/mmap/wait calls MmapCapture needs. Each
+    DQBUF fills the oldest queued buffer with the next synthetic frame.
+    """
+
+    PAGE = 4096
+
+    def __init__(self, width: int = 640, height: int = 360):
+        self.source = SyntheticSource(width, height, realtime=False)
+        self.width = width
+        self.height = height
+        self.pixelformat = PIXEL_FORMATS["YUYV"]
+        self.bytesperline = width * 2
+        self.sizeimage = self.bytesperline * height
+        self.buffers: list[bytearray] = []
+        self.queued: deque[int] = deque()
+        self.streaming = False
+        self.sequence = 0
+        self.calls: Counter[int] = Counter()
+        self.open_fds: set[int] = set()
+        self._next_fd = 200
+
+    def open(self, path: str, flags: int) -> int:
+        fd = self._next_fd
+        self._next_fd += 1
+        self.open_fds.add(fd)
+        return fd
+
+    def close(self, fd: int):
+        self.open_fds.discard(fd)
+
+    def mmap(self, fd: int, length: int, offset: int):
+        return self.buffers[offset // self.PAGE]
+
+    def wait(self, fd: int, timeout: float) -> bool:
+        return self.streaming and bool(self.queued)
+
+    def ioctl(self, fd: int, request: int, arg, mutate_flag: bool = True):
+        if fd not in self.open_fds:
+            raise OSError(errno.EBADF, os.strerror(errno.EBADF))
+        self.calls[request] += 1
+        if request == VIDIOC_S_FMT:
+            self._s_fmt(arg.fmt.pix)
+        elif request == VIDIOC_REQBUFS:
+            self.buffers = [bytearray(self.sizeimage) for _ in range(arg.count)]
+            self.queued.clear()
+        elif request == VIDIOC_QUERYBUF:
+            arg.length = self.sizeimage
+            arg.m.offset = arg.index * self.PAGE
+        elif request == VIDIOC_QBUF:
+            if arg.index in self.queued or arg.index >= len(self.buffers):
+                raise OSError(errno.EINVAL, os.strerror(errno.EINVAL))
+            self.queued.append(arg.index)
+        elif request == VIDIOC_DQBUF:
+            self._dqbuf(arg)
+        elif request == VIDIOC_STREAMON:
+            self.streaming = True
+        elif request == VIDIOC_STREAMOFF:
+            self.streaming = False
+            self.queued.clear()
+        else:
+            raise OSError(errno.ENOTTY, os.strerror(errno.ENOTTY))
+        return 0
+
+    def _s_fmt(self, pix):
+        self.width = pix.width
+        self.height = pix.height
+        self.pixelformat = pix.pixelformat
+        self.source.set(cv2.CAP_PROP_FRAME_WIDTH, pix.width)
+        self.source.set(cv2.CAP_PROP_FRAME_HEIGHT, pix.height)
+        if pix.pixelformat == PIXEL_FORMATS["YUYV"]:
+            self.bytesperline = pix.width * 2
+        elif pix.pixelformat == PIXEL_FORMATS["GREY"]:
+            self.bytesperline = pix.width
+        else:
+            self.bytesperline = 0
+        self.sizeimage = self.bytesperline * pix.height or pix.width * pix.height * 2
+        pix.bytesperline = self.bytesperline
+        pix.sizeimage = self.sizeimage
+
+    def _dqbuf(self, arg):
+        if not self.streaming or not self.queued:
+            raise OSError(errno.EAGAIN, os.strerror(errno.EAGAIN))
+        index = self.queued.popleft()
+        bgr = self.source.read()[1]
+        raw = np.frombuffer(self.buffers[index], dtype=np.uint8)
+        if self.pixelformat == PIXEL_FORMATS["YUYV"]:
+            bgr_to_yuyv(bgr, raw.reshape(self.height, self.width, 2))
+            used = self.sizeimage
+        elif self.pixelformat == PIXEL_FORMATS["GREY"]:
+            cv2.cvtColor(
+                bgr, cv2.COLOR_BGR2GRAY, dst=raw.reshape(self.height, self.width)
+            )
+            used = self.sizeimage
+        else:
+            encoded = cv2.imencode(".jpg", bgr)[1].ravel()
+            used = len(encoded)
+            raw[:used] = encoded
+        arg.index = index
+        arg.bytesused = used
+        arg.sequence = self.sequence
+        self.sequence += 1
@@ -0,0 +1,334 @@
+"""Native V4L2 control access via ioctl on a kept-open device fd."""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import fcntl
+import os
+import re
+from collections import Counter
+from types import SimpleNamespace
+
+from utils.constants import CONTROLS
+
+# ioctl request encoding (asm-generic/ioctl.h)
+_IOC_WRITE = 1
+_IOC_READ = 2
+
+
+def _ioc(direction: int, nr: int, size: int) -> int:
+    return (direction << 30) | (size << 16) | (ord("V") << 8) | nr
+
+
+def _iowr(nr: int, struct_type) -> int:
+    return _ioc(_IOC_READ | _IOC_WRITE, nr, ctypes.sizeof(struct_type))
+
+
+class v4l2_control(ctypes.Structure):
+    _fields_ = [
+        ("id", ctypes.c_uint32),
+        ("value", ctypes.c_int32),
+    ]
+
+
+class v4l2_queryctrl(ctypes.Structure):
+    _fields_ = [
+        ("id", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("name", ctypes.c_char * 32),
+        ("minimum", ctypes.c_int32),
+        ("maximum", ctypes.c_int32),
+        ("step", ctypes.c_int32),
+        ("default_value", ctypes.c_int32),
+        ("flags", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32 * 2),
+    ]
+
+
+class _v4l2_ext_control_value(ctypes.Union):
+    _fields_ = [
+        ("value", ctypes.c_int32),
+        ("value64", ctypes.c_int64),
+        ("ptr", ctypes.c_void_p),
+    ]
+
+
+class v4l2_ext_control(ctypes.Structure):
+    _pack_ = 1
+    _anonymous_ = ("u",)
+    _fields_ = [
+        ("id", ctypes.c_uint32),
+        ("size", ctypes.c_uint32),
+        ("reserved2", ctypes.c_uint32 * 1),
+        ("u", _v4l2_ext_control_value),
+    ]
+
+
+class v4l2_ext_controls(ctypes.Structure):
+    _fields_ = [
+        ("which", ctypes.c_uint32),
+        ("count", ctypes.c_uint32),
+        ("error_idx", ctypes.c_uint32),
+        ("request_fd", ctypes.c_int32),
+        ("reserved", ctypes.c_uint32 * 1),
+        ("controls", ctypes.POINTER(v4l2_ext_control)),
+    ]
+
+
+VIDIOC_G_CTRL = _iowr(27, v4l2_control)
+VIDIOC_S_CTRL = _iowr(28, v4l2_control)
+VIDIOC_QUERYCTRL = _iowr(36, v4l2_queryctrl)
+VIDIOC_G_EXT_CTRLS = _iowr(71, v4l2_ext_controls)
+VIDIOC_S_EXT_CTRLS = _iowr(72, v4l2_ext_controls)
+
+V4L2_CTRL_WHICH_CUR_VAL = 0
+V4L2_CTRL_FLAG_DISABLED = 0x0001
+V4L2_CTRL_FLAG_NEXT_CTRL = 0x80000000
+V4L2_CTRL_TYPE_CTRL_CLASS = 6
+
+# Real device access; tests and benchmarks swap in FakeV4L2Device
+SYSTEM_IO = SimpleNamespace(open=os.open, close=os.close, ioctl=fcntl.ioctl)
+
+
+def control_name(label: str) -> str:
+    """Convert a driver control label to the v4l2-ctl style name.
+
+    "Zoom, Absolute" -> "zoom_absolute", same rule v4l2-ctl uses.
+    """
+    return re.sub(r"[^0-9A-Za-z]+", "_", label).strip("_").lower()
+
+
+class IoctlBackend:
+    """Control backend using VIDIOC_G_CTRL/S_CTRL/QUERYCTRL directly."""
+
+    def __init__(self, device: str, io=None):
+        self.device = device
+        self.io = io or SYSTEM_IO
+        self.fd = self.io.open(device, os.O_RDWR | os.O_NONBLOCK)
+        # name -> (id, min, max, default)
+        self.controls: dict[str, tuple[int, int, int, int]] = {}
+        try:
+            self._query_controls()
+        except OSError:
+            self.close()
+            raise
+
+    def _query_controls(self):
+        """Enumerate controls once so get/set can go straight to the id."""
+        query = v4l2_queryctrl()
+        query.id = V4L2_CTRL_FLAG_NEXT_CTRL
+        while True:
+            try:
+                self.io.ioctl(self.fd, VIDIOC_QUERYCTRL, query, True)
+            except OSError as e:
+                if e.errno == errno.EINVAL:
+                    break
+                raise
+            if query.type != V4L2_CTRL_TYPE_CTRL_CLASS and not (
+                query.flags & V4L2_CTRL_FLAG_DISABLED
+            ):
+                name = control_name(query.name.decode(errors="replace"))
+                self.controls[name] = (
+                    query.id,
+                    query.minimum,
+                    query.maximum,
+                    query.default_value,
+                )
+            query.id |= V4L2_CTRL_FLAG_NEXT_CTRL
+
+    def get(self, control: str) -> int | None:
+        """Get current value of a control."""
+        if control not in self.controls:
+            return None
+        ctrl = v4l2_control(id=self.controls[control][0])
+        try:
+            self.io.ioctl(self.fd, VIDIOC_G_CTRL, ctrl, True)
+        except OSError:
+            return None
+        return ctrl.value
+
+    def get_many(self, controls: list[str]) -> dict[str, int]:
+        """Read several controls with one VIDIOC_G_EXT_CTRLS call.
+
+        Unknown or unreadable controls are left out of the result.
+        """
+        known = [c for c in controls if c in self.controls]
+        if not known:
+            return {}
+
+        array = (v4l2_ext_control * len(known))()
+        for slot, control in zip(array, known):
+            slot.id = self.controls[control][0]
+        ext = v4l2_ext_controls(
+            which=V4L2_CTRL_WHICH_CUR_VAL,
+            count=len(known),
+            controls=ctypes.cast(array, ctypes.POINTER(v4l2_ext_control)),
+        )
+        try:
+            self.io.ioctl(self.fd, VIDIOC_G_EXT_CTRLS, ext, True)
+        except OSError:
+            values = {control: self.get(control) for control in known}
+            return {c: v for c, v in values.items() if v is not None}
+        return {control: slot.value for control, slot in zip(known, array)}
+
+    def set(self, control: str, value: int) -> bool:
+        """Set a control value."""
+        if control not in self.controls:
+            return False
+        ctrl = v4l2_control(id=self.controls[control][0], value=int(value))
+        try:
+            self.io.ioctl(self.fd, VIDIOC_S_CTRL, ctrl, True)
+        except OSError:
+            return False
+        return True
+
+    def set_many(self, values: dict[str, int]) -> dict[str, bool]:
+        """Set several controls with one VIDIOC_S_EXT_CTRLS call.
+
+        If the driver rejects the batch, each control is retried on its own
+        so the returned per-control status is exact.
+        """
+        results = {control: False for control in values}
+        known = [(c, v) for c, v in values.items() if c in self.controls]
+        if not known:
+            return results
+
+        array = (v4l2_ext_control * len(known))()
+        for slot, (control, value) in zip(array, known):
+            slot.id = self.controls[control][0]
+            slot.value = int(value)
+        ext = v4l2_ext_controls(
+            which=V4L2_CTRL_WHICH_CUR_VAL,
+            count=len(known),
+            controls=ctypes.cast(array, ctypes.POINTER(v4l2_ext_control)),
+        )
+        try:
+            self.io.ioctl(self.fd, VIDIOC_S_EXT_CTRLS, ext, True)
+        except OSError:
+            for control, value in known:
+                results[control] = self.set(control, value)
+            return results
+
+        for control, _ in known:
+            results[control] = True
+        return results
+
+    def list_controls(self) -> dict[str, tuple[int, int, int]]:
+        """List available controls with (min, max, default)."""
+        return {name: info[1:] for name, info in self.controls.items()}
+
+    def close(self):
+        """Close the device fd."""
+        if self.fd is not None:
+            self.io.close(self.fd)
+            self.fd = None
+
+
+class FakeV4L2Device:
+    """In-memory stand-in for a V4L2 device node.
+
+    Implements the open/close/ioctl trio IoctlBackend needs, so the native
+    backend can be tested and benchmarked on a machine with no camera.
+    """
+
+    def __init__(self, controls: dict[str, tuple] | None = None):
+        if controls is None:
+            controls = CONTROLS
+        # id -> [name, min, max, default, value]
+        self.controls: dict[int, list] = {}
+        for i, (name, (min_val, max_val, default, *_)) in enumerate(controls.items()):
+            self.controls[0x00980900 + i] = [name, min_val, max_val, default, default]
+        self.calls: Counter[int] = Counter()
+        self.open_fds: set[int] = set()
+        self._next_fd = 100
+
+    def open(self, path: str, flags: int) -> int:
+        fd = self._next_fd
+        self._next_fd += 1
+        self.open_fds.add(fd)
+        return fd
+
+    def close(self, fd: int):
+        self.open_fds.discard(fd)
+
+    def value(self, name: str) -> int | None:
+        """Current value of a control by name (test helper)."""
+        for ctrl in self.controls.values():
+            if ctrl[0] == name:
+                return ctrl[4]
+        return None
+
+    def ioctl(self, fd: int, request: int, arg, mutate_flag: bool = True):
+        if fd not in self.open_fds:
+            raise OSError(errno.EBADF, os.strerror(errno.EBADF))
+        self.calls[request] += 1
+        if request == VIDIOC_QUERYCTRL:
+            return self._queryctrl(arg)
+        if request in (VIDIOC_G_CTRL, VIDIOC_S_CTRL):
+            ctrl = self._lookup(arg.id)
+            if request == VIDIOC_G_CTRL:
+                arg.value = ctrl[4]
+            else:
+                self._store(ctrl, arg.value)
+            return 0
+        if request == VIDIOC_G_EXT_CTRLS:
+            return self._g_ext_ctrls(arg)
+        if request == VIDIOC_S_EXT_CTRLS:
+            return self._s_ext_ctrls(arg)
+        raise OSError(errno.ENOTTY, os.strerror(errno.ENOTTY))
+
+    def _g_ext_ctrls(self, arg) -> int:
+        for i in range(arg.count):
+            item = arg.controls[i]
+            try:
+                item.value = self._lookup(item.id)[4]
+            except OSError:
+                arg.error_idx = i
+                raise
+        return 0
+
+    def _s_ext_ctrls(self, arg) -> int:
+        # Validate the whole batch before applying, like the kernel does
+        items = [arg.controls[i] for i in range(arg.count)]
+        try:
+            for item in items:
+                ctrl = self._lookup(item.id)
+                if not ctrl[1] <= item.value <= ctrl[2]:
+                    raise OSError(errno.ERANGE, os.strerror(errno.ERANGE))
+        except OSError:
+            arg.error_idx = arg.count
+            raise
+        for item in items:
+            self.controls[item.id][4] = item.value
+        return 0
+
+    def _lookup(self, ctrl_id: int) -> list:
+        if ctrl_id not in self.controls:
+            raise OSError(errno.EINVAL, os.strerror(errno.EINVAL))
+        return self.controls[ctrl_id]
+
+    def _store(self, ctrl: list, value: int):
+        if not ctrl[1] <= value <= ctrl[2]:
+            raise OSError(errno.ERANGE, os.strerror(errno.ERANGE))
+        ctrl[4] = value
+
+    def _queryctrl(self, arg) -> int:
+        if arg.id & V4L2_CTRL_FLAG_NEXT_CTRL:
+            after = arg.id & ~V4L2_CTRL_FLAG_NEXT_CTRL
+            candidates = [i for i in self.controls if i > after]
+            if not candidates:
+                raise OSError(errno.EINVAL, os.strerror(errno.EINVAL))
+            ctrl_id = min(candidates)
+        else:
+            ctrl_id = arg.id
+        name, min_val, max_val, default, _ = self._lookup(ctrl_id)
+        arg.id = ctrl_id
+        arg.type = 1  # V4L2_CTRL_TYPE_INTEGER
+        arg.name = name.encode()
+        arg.minimum = min_val
+        arg.maximum = max_val
+        arg.step = 1
+        arg.default_value = default
+        arg.flags = 0
+        return 0
@@ -0,0 +1,120 @@
+"""Background camera control writer with latest-value-wins coalescing."""
+
+from __future__ import annotations
+
+import threading
+
+from core.v4l2 import V4L2Control
+
+
+class ControlWriter:
+    """Writes camera controls on a background thread.
+
+    post() never blocks: it drops the value into a per-control mailbox,
+    replacing any value that hasn't been written yet. The worker drains the
+    mailbox in one batch, so only the newest value per control reaches the
+    device.
+    """
+
+    def __init__(self, v4l2: V4L2Control):
+        self.v4l2 = v4l2
+        self._pending: dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._busy = False
+        self._running = False
+        self._thread = None
+        # Metrics
+        self.posted = 0
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0  # Values superseded before they were written
+
+    def start(self):
+        """Start the writer thread."""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="control-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 2.0):
+        """Write everything still pending and stop the thread."""
+        if self._thread is None:
+            self.flush()
+            return
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def post(self, control: str, value: int):
+        """Queue a control value without blocking."""
+        self.post_many({control: value})
+
+    def post_many(self, values: dict[str, int]):
+        """Queue several control values without blocking."""
+        with self._cond:
+            for control, value in values.items():
+                if control in self._pending:
+                    self.dropped += 1
+                self._pending[control] = int(value)
+            self.posted += len(values)
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every posted value has been written.
+
+        Without a running thread the pending values are written inline.
+        Returns False if the timeout expired first.
+        """
+        if self._thread is None:
+            with self._cond:
+                batch, self._pending = self._pending, {}
+            if batch:
+                self._write(batch)
+            return True
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._busy, timeout
+            )
+
+    def stats(self) -> dict[str, int]:
+        """Writer counters."""
+        with self._cond:
+            return {
+                "posted": self.posted,
+                "written": self.written,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "pending": len(self._pending),
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._pending:
+                    break
+                batch, self._pending = self._pending, {}
+                self._busy = True
+            try:
+                self._write(batch)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, batch: dict[str, int]):
+        if len(batch) == 1:
+            ((control, value),) = batch.items()
+            results = {control: self.v4l2.set(control, value)}
+        else:
+            results = self.v4l2.set_many(batch)
+        ok = sum(results.values())
+        with self._cond:
+            self.written += ok
+            self.failed += len(results) - ok
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Headless face tracking: keep the camera framed without the preview window.
+
+Runs Camera + FaceTracker + V4L2Control at a low tracking rate, with no
+DearPyGui, preview conversion or texture upload, while another app (Meet,
+Zoom, etc.) shows the picture. Stops cleanly on SIGTERM or Ctrl+C and
+prints CPU and memory use every --report seconds and at exit. Exits with
+status 1 if the camera delivers no frames, even after dropping raw YUYV.
+
+Usage:
+    python headless.py                                  # /dev/video0
+    python headless.py --device /dev/video2 --fps 3
+    python headless.py --device synthetic --report 10   # measure, no camera
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.camera import Camera  # noqa: E402
+from core.controller import PanTiltController  # noqa: E402
+from core.tracker import FaceTracker  # noqa: E402
+from core.v4l2 import V4L2Control  # noqa: E402
+from core.writer import ControlWriter  # noqa: E402
+from utils.constants import (  # noqa: E402
+    CAPTURE_BACKEND,
+    CONTROLS,
+    HEADLESS_FIRST_FRAME,
+    HEADLESS_FPS,
+    HEADLESS_REPORT,
+    TRACK_CONTROLLER,
+)
+
+
+class UsageMeter:
+    """Process CPU% and resident memory between samples."""
+
+    def __init__(self):
+        self._cpu = time.process_time()
+        self._wall = time.monotonic()
+
+    def sample(self) -> tuple[float, float, float]:
+        """(CPU% since the last sample, RSS MB, peak RSS MB)."""
+        cpu, wall = time.process_time(), time.monotonic()
+        percent = (cpu - self._cpu) / max(wall - self._wall, 1e-9) * 100
+        self._cpu, self._wall = cpu, wall
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return percent, rss / 2**20, peak / 2**20
+
+
+class HeadlessTracker:
+    """Tracks the face and moves the camera, nothing else."""
+
+    def __init__(self, device: str = "/dev/video0", fps: float = HEADLESS_FPS):
+        self.v4l2 = V4L2Control(device)
+        self.writer = ControlWriter(self.v4l2)
+        # Tracking only reads luma, so skip the BGR conversion where possible
+        self.camera = Camera(device, threaded=True, backend=CAPTURE_BACKEND, raw=True)
+        try:
+            self.tracker = FaceTracker()
+        except FileNotFoundError:
+            # Configured detector's model isn't installed
+            self.tracker = FaceTracker(detector="haar")
+        self.tracker.enabled = True
+        self.controller = PanTiltController() if TRACK_CONTROLLER == "pid" else None
+        self.interval = 1.0 / fps
+        self.first_frame_timeout = HEADLESS_FIRST_FRAME
+        self.position: dict[str, int] = {}
+        self.frames = 0
+        self.moves = 0
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Ask run() to return; safe from a signal handler."""
+        self._stop.set()
+
+    def run(self, report: float = HEADLESS_REPORT, duration: float = 0.0) -> int:
+        """Track until stop() (or `duration` seconds). Returns an exit code."""
+        if not self._open_camera():
+            self.camera.close()
+            self.v4l2.close()
+            return 1
+        self.writer.start()
+        self.position = self.v4l2.get_many(["pan_absolute", "tilt_absolute"])
+        meter, overall = UsageMeter(), UsageMeter()
+        begin = time.monotonic()
+        next_report = begin + report if report > 0 else float("inf")
+        last_seq = 0
+        try:
+            while not self._stop.is_set():
+                start = time.monotonic()
+                captured = self.camera.wait_frame(last_seq, timeout=1.0)
+                if captured is not None and captured.seq != last_seq:
+                    last_seq = captured.seq
+                    self.step(captured)
+                if start >= next_report:
+                    self._report(meter, start - begin)
+                    next_report += report
+                if duration and start - begin >= duration:
+                    break
+                self._stop.wait(max(0.0, start + self.interval - time.monotonic()))
+        finally:
+            self.camera.close()
+            self.writer.stop()
+            self.v4l2.close()
+        # Whole-run average, including startup
+        self._report(overall, time.monotonic() - begin)
+        return 0
+
+    def _open_camera(self) -> bool:
+        """Open the camera and wait for a first frame, falling back from raw."""
+        for raw in (True, False):
+            self.camera.raw = raw
+            if not self.camera.open():
+                print(f"Could not open {self.camera.device}", file=sys.stderr)
+                return False
+            if self.camera.wait_frame(0, self.first_frame_timeout) is not None:
+                return True
+            if raw:
+                print("No raw frames, retrying with BGR capture", file=sys.stderr)
+        print(
+            f"No frames from {self.camera.device} within {self.first_frame_timeout:g}s",
+            file=sys.stderr,
+        )
+        return False
+
+    def step(self, captured):
+        """Track one frame and queue a pan/tilt move if one is due."""
+        self.frames += 1
+        frame = captured.image
+        face = self.tracker.track(frame)
+        if self.controller is not None:
+            if face is not None:
+                self.controller.observe_face(face, frame.shape, captured.timestamp)
+            move = self.controller.command(time.monotonic())
+        elif face is not None:
+            move = self.tracker.face_to_pan_tilt(frame, face)
+        else:
+            move = None
+        if move is not None and (abs(move[0]) > 100 or abs(move[1]) > 100):
+            self._move(*move)
+
+    def _move(self, pan_delta: int, tilt_delta: int):
+        values = {}
+        for control, delta in (
+            ("pan_absolute", pan_delta),
+            ("tilt_absolute", tilt_delta),
+        ):
+            low, high = CONTROLS[control][:2]
+            values[control] = max(low, min(high, self.position.get(control, 0) + delta))
+        self.position.update(values)
+        self.writer.post_many(values)
+        self.moves += 1
+
+    def _report(self, meter: UsageMeter, elapsed: float):
+        cpu, rss, peak = meter.sample()
+        print(
+            f"[{elapsed:7.0f}s] cpu {cpu:5.1f}%  rss {rss:6.1f} MB "
+            f"(peak {peak:.1f})  tracked {self.frames / max(elapsed, 1e-9):4.1f} fps  "
+            f"moves {self.moves}",
+            flush=True,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--device", default="/dev/video0")
+    parser.add_argument("--fps", type=float, default=HEADLESS_FPS, help="tracking rate")
+    parser.add_argument(
+        "--report", type=float, default=HEADLESS_REPORT, help="seconds, 0 = at exit"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=0.0, help="seconds, 0 = forever"
+    )
+    args = parser.parse_args()
+
+    daemon = HeadlessTracker(args.device, args.fps)
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda signum, frame: daemon.stop())
+    sys.exit(daemon.run(args.report, args.duration))
+
+
+if __name__ == "__main__":
+    main()
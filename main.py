@@ -8,9 +8,12 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from ui.app import App  # noqa: E402
+from utils.trace import TRACER  # noqa: E402
 
 
 def main():
+    if "--trace" in sys.argv[1:]:
+        TRACER.start()
     app = App()
     app.setup()
     app.run()
@@ -2,9 +2,11 @@
 
 from unittest.mock import MagicMock, patch
 
+import cv2
 import numpy as np
 
-from core.camera import Camera, list_devices
+from core.camera import Camera, CaptureThread, YuyvCapture, is_yuyv, list_devices
+from core.synthetic import SyntheticSource
 
 
 class TestListDevices:
@@ -172,3 +174,204 @@ class TestCamera:
         cam = Camera("/dev/video5")
         # The index extraction happens in open()
         assert cam.device == "/dev/video5"
+
+    @patch("cv2.VideoCapture")
+    def test_read_frame_sequence(self, mock_capture):
+        """Test read_frame tags frames with increasing sequence numbers."""
+        mock_cap = MagicMock()
+        mock_cap.isOpened.return_value = True
+        mock_cap.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
+        mock_capture.return_value = mock_cap
+
+        cam = Camera()
+        cam.open()
+        first = cam.read_frame()
+        second = cam.read_frame()
+
+        assert second.seq == first.seq + 1
+        assert second.timestamp >= first.timestamp
+
+    def test_synthetic_device(self):
+        """Test the synthetic device opens without hardware."""
+        cam = Camera("synthetic")
+        assert cam.open() is True
+        frame = cam.read()
+        cam.close()
+
+        assert frame.shape == (cam.height, cam.width, 3)
+
+    @patch("core.camera.MmapCapture")
+    def test_mmap_backend(self, mock_mmap):
+        """Test the mmap backend is used when it can stream."""
+        mock_mmap.return_value.isOpened.return_value = True
+
+        cam = Camera("/dev/video0", backend="mmap")
+        assert cam.open() is True
+
+        assert cam.cap is mock_mmap.return_value
+
+    @patch("cv2.VideoCapture")
+    @patch("core.camera.MmapCapture")
+    def test_mmap_backend_fallback(self, mock_mmap, mock_capture):
+        """Test OpenCV is used when the device can't stream."""
+        mock_mmap.return_value.isOpened.return_value = False
+
+        cam = Camera("/dev/video0", backend="mmap")
+        cam.open()
+
+        assert cam.cap is mock_capture.return_value
+
+
+class FakeRawCapture:
+    """cv2.VideoCapture stand-in that hands out raw YUYV as one row of bytes."""
+
+    def __init__(self, supports_raw=True, fourcc="YUYV"):
+        self.supports_raw = supports_raw
+        self.fourcc = cv2.VideoWriter_fourcc(*fourcc)  # Format the driver keeps
+        self.props = {}
+        self.frame = np.arange(360 * 640 * 2, dtype=np.uint32).astype(np.uint8)
+
+    def isOpened(self):  # noqa: N802
+        return True
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_CONVERT_RGB and not self.supports_raw:
+            return False
+        self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FOURCC:
+            return float(self.fourcc)
+        return {cv2.CAP_PROP_FRAME_WIDTH: 640, cv2.CAP_PROP_FRAME_HEIGHT: 360}.get(
+            prop, 0
+        )
+
+    def read(self, image=None):
+        if not self.props.get(cv2.CAP_PROP_CONVERT_RGB, 1):
+            return True, self.frame.reshape(1, -1).copy()
+        return True, np.zeros((360, 640, 3), dtype=np.uint8)
+
+    def release(self):
+        pass
+
+
+class TestRawCapture:
+    """Tests for raw YUYV capture."""
+
+    def test_synthetic_raw(self):
+        """Test raw mode delivers (h, w, 2) YUYV frames."""
+        cam = Camera("synthetic", raw=True)
+        cam.open()
+        frame = cam.read()
+        cam.close()
+
+        assert frame.shape == (360, 640, 2)
+        assert is_yuyv(frame)
+
+    @patch("cv2.VideoCapture")
+    def test_opencv_raw(self, mock_capture):
+        """Test OpenCV raw bytes are reshaped into the pooled buffer."""
+        fake = FakeRawCapture()
+        mock_capture.return_value = fake
+
+        cam = Camera("/dev/video0", raw=True)
+        cam.open()
+        captured = cam.read_frame()
+
+        assert isinstance(cam.cap, YuyvCapture)
+        assert fake.props[cv2.CAP_PROP_CONVERT_RGB] == 0
+        assert captured.image.shape == (360, 640, 2)
+        assert captured.buffer is not None
+        np.testing.assert_array_equal(captured.image.ravel(), fake.frame)
+
+    @patch("cv2.VideoCapture")
+    def test_raw_unsupported(self, mock_capture):
+        """Test a capture that can't go raw stays BGR."""
+        mock_capture.return_value = FakeRawCapture(supports_raw=False)
+
+        cam = Camera("/dev/video0", raw=True)
+        cam.open()
+
+        assert cam.read().shape == (360, 640, 3)
+
+    @patch("cv2.VideoCapture")
+    def test_raw_fourcc_not_applied(self, mock_capture):
+        """Test a camera that stays on MJPEG is left in BGR mode."""
+        fake = FakeRawCapture(fourcc="MJPG")
+        mock_capture.return_value = fake
+
+        cam = Camera("/dev/video0", raw=True)
+        cam.open()
+
+        assert not isinstance(cam.cap, YuyvCapture)
+        assert fake.props[cv2.CAP_PROP_CONVERT_RGB] == 1
+        assert cam.read().shape == (360, 640, 3)
+
+    def test_is_yuyv(self):
+        """Test only (h, w, 2) frames count as YUYV."""
+        assert is_yuyv(np.zeros((4, 4, 2), dtype=np.uint8))
+        assert not is_yuyv(np.zeros((4, 4, 3), dtype=np.uint8))
+        assert not is_yuyv(np.zeros((4, 4), dtype=np.uint8))
+
+
+class TestThreadedCamera:
+    """Tests for threaded capture mode."""
+
+    def test_read_returns_newest_frame(self):
+        """Test read_frame hands over the newest frame without blocking."""
+        cam = Camera("synthetic", threaded=True)
+        cam.open()
+        try:
+            first = cam._grabber.wait(0, timeout=2)
+            latest = cam._grabber.wait(first.seq, timeout=2)
+            frame = cam.read_frame()
+        finally:
+            cam.close()
+
+        assert frame.seq >= latest.seq > first.seq
+        assert frame.image.shape == (cam.height, cam.width, 3)
+
+    def test_close_stops_thread(self):
+        """Test close stops the capture thread."""
+        cam = Camera("synthetic", threaded=True)
+        cam.open()
+        grabber = cam._grabber
+        cam.close()
+
+        assert cam._grabber is None
+        assert grabber._thread is None
+        assert cam.read_frame() is None
+
+
+class TestCaptureThread:
+    """Tests for CaptureThread class."""
+
+    def test_latest_none_before_first_frame(self):
+        """Test latest is None until a frame has been captured."""
+        grabber = CaptureThread(SyntheticSource(realtime=False))
+        assert grabber.latest() is None
+
+    def test_counts_skipped_frames(self):
+        """Test frames nobody read are counted as skipped."""
+        grabber = CaptureThread(SyntheticSource(fps=200))
+        grabber.start()
+        try:
+            captured = grabber.wait(10, timeout=2)
+        finally:
+            grabber.stop()
+
+        assert captured.seq > 10
+        assert grabber.skipped > 0
+        assert grabber.captured >= captured.seq
+
+    def test_wait_timeout(self):
+        """Test wait returns the current frame when nothing newer arrives."""
+        source = MagicMock()
+        source.read.return_value = (False, None)
+        grabber = CaptureThread(source)
+        grabber.start()
+        try:
+            assert grabber.wait(0, timeout=0.05) is None
+        finally:
+            grabber.stop()
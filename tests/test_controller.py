@@ -0,0 +1,203 @@
+"""Tests for core/controller.py"""
+
+import numpy as np
+import pytest
+
+from core.controller import PID, KalmanFilter2D, PanTiltController
+
+
+def _controller(**kwargs):
+    options = {
+        "gains": (0.6, 0.0, 0.0),
+        "hysteresis": (0.1, 0.03),
+        "interval": 0.2,
+        "min_step": 100,
+        "settle": 0.0,
+    }
+    options.update(kwargs)
+    return PanTiltController(**options)
+
+
+class TestKalmanFilter2D:
+    """Tests for KalmanFilter2D class."""
+
+    def test_first_measurement_initializes(self):
+        """Test the first measurement sets the position directly."""
+        kf = KalmanFilter2D(0.5, 0.02)
+        assert not kf.initialized
+
+        kf.update((0.3, -0.2), 1.0)
+
+        assert kf.initialized
+        assert kf.position_at(1.0) == pytest.approx((0.3, -0.2))
+
+    def test_learns_constant_velocity(self):
+        """Test velocity converges on a steadily moving point."""
+        kf = KalmanFilter2D(0.5, 0.02)
+        for i in range(60):
+            t = i / 30
+            kf.update((0.2 * t, -0.1 * t), t)
+
+        assert kf.x[2:] == pytest.approx((0.2, -0.1), abs=0.02)
+        assert kf.position_at(2.5)[0] == pytest.approx(0.5, abs=0.03)
+
+    def test_smooths_noise(self):
+        """Test the estimate jitters less than the measurements."""
+        rng = np.random.default_rng(0)
+        kf = KalmanFilter2D(0.5, 0.02)
+        estimates = []
+        for i in range(90):
+            kf.update((rng.normal(0, 0.02), 0.0), i / 30)
+            estimates.append(kf.x[0])
+
+        assert np.std(estimates[30:]) < 0.01
+
+    def test_reset(self):
+        """Test reset forgets the state."""
+        kf = KalmanFilter2D(0.5, 0.02)
+        kf.update((0.5, 0.5), 0.0)
+
+        kf.reset()
+
+        assert not kf.initialized
+
+
+class TestPID:
+    """Tests for PID class."""
+
+    def test_proportional(self):
+        """Test output is kp * error with no history."""
+        assert PID(0.5, 0.0, 0.0).update(0.4, 0.1) == pytest.approx(0.2)
+
+    def test_output_clamped(self):
+        """Test output never exceeds the limit."""
+        assert PID(5.0, 0.0, 0.0, output_limit=1.0).update(0.5, 0.1) == 1.0
+
+    def test_integral_clamped(self):
+        """Test the integral stops at integral_limit."""
+        pid = PID(0.0, 1.0, 0.0, output_limit=10.0, integral_limit=0.3)
+        for _ in range(100):
+            pid.update(1.0, 0.1)
+
+        assert pid.integral == pytest.approx(0.3)
+
+    def test_no_windup_while_saturated(self):
+        """Test the integral doesn't grow while the output is saturated."""
+        pid = PID(2.0, 1.0, 0.0, output_limit=1.0, integral_limit=5.0)
+        for _ in range(50):
+            pid.update(1.0, 0.1)
+
+        assert pid.integral == 0.0
+
+    def test_derivative_opposes_change(self):
+        """Test a shrinking error reduces the output (derivative on measurement)."""
+        pid = PID(1.0, 0.0, 0.1)
+        pid.update(0.5, 0.1)
+
+        assert pid.update(0.3, 0.1) < 0.3
+
+
+class TestPanTiltController:
+    """Tests for PanTiltController class."""
+
+    def test_no_command_without_observation(self):
+        """Test nothing is sent before a face is seen."""
+        assert _controller().command(0.0) is None
+
+    def test_sign_matches_tracker(self):
+        """Test a face on the right gives a negative pan, below a negative tilt."""
+        controller = _controller()
+        controller.observe((0.5, 0.5), 0.0)
+
+        pan, tilt = controller.command(0.0)
+
+        assert pan == int(-0.6 * 0.5 * 36000)
+        assert tilt < 0
+
+    def test_hysteresis_deadband(self):
+        """Test small offsets never start a move."""
+        controller = _controller()
+        controller.observe((0.08, -0.08), 0.0)
+
+        assert controller.command(0.0) is None
+
+    def test_hysteresis_keeps_moving_until_exit(self):
+        """Test an active axis keeps correcting below the enter threshold."""
+        controller = _controller(min_step=1)
+        controller.observe((0.5, 0.0), 0.0)
+        controller.command(0.0)
+
+        controller.observe((0.07, 0.0), 1.0)  # Below enter, above exit
+        assert controller.command(1.0) is not None
+
+        controller.observe((0.02, 0.0), 2.0)  # Below exit
+        assert controller.command(2.0) is None
+
+    def test_rate_limited(self):
+        """Test commands are at least `interval` apart."""
+        controller = _controller()
+        sent = 0
+        for i in range(30):
+            t = i / 30
+            controller.observe((0.5, 0.0), t)
+            sent += controller.command(t) is not None
+
+        assert sent == 5  # t = 0, 0.2, 0.4, 0.6, 0.8
+        assert controller.commands == sent
+
+    def test_late_measurement_compensated(self):
+        """Test a frame captured before a move is corrected for that move."""
+        controller = _controller()
+        controller.observe((0.5, 0.0), 0.0)
+        controller.command(1.0)  # Moves by 0.3
+
+        # Detection of a frame captured before the move arrives late
+        controller.observe((0.5, 0.0), 0.9)
+
+        assert controller.filter.position_at(1.0)[0] == pytest.approx(0.2, abs=0.02)
+
+    def test_settle_ignores_frames_mid_move(self):
+        """Test frames captured while the camera moves are skipped."""
+        controller = _controller(settle=0.3)
+        controller.observe((0.5, 0.0), 0.0)
+        controller.command(0.0)
+
+        controller.observe((0.9, 0.0), 0.1)
+
+        assert controller.command(0.5) is None  # No settled frame yet
+        assert controller.filter.position_at(0.1)[0] == pytest.approx(0.2, abs=0.01)
+
+    def test_observe_face_normalizes(self):
+        """Test face boxes are converted to normalized centre offsets."""
+        controller = _controller()
+
+        controller.observe_face((560, 140, 80, 80), (360, 640, 3), 0.0)
+
+        assert controller.filter.position_at(0.0) == pytest.approx((0.875, 0.0))
+
+    def test_converges_without_oscillation(self):
+        """Test a closed loop on a face step settles with few commands."""
+        controller = PanTiltController()
+        camera = 0.0
+        offsets = []
+        for i in range(240):
+            t = i / 30
+            offset = 0.6 - camera
+            offsets.append(offset)
+            controller.observe((offset, 0.0), t)
+            move = controller.command(t)
+            if move is not None:
+                camera += -move[0] / 36000
+
+        assert abs(offsets[-1]) < 0.1
+        assert min(offsets) > -0.1  # No overshoot past centre
+        assert controller.commands <= 10
+
+    def test_reset(self):
+        """Test reset forgets the face."""
+        controller = _controller()
+        controller.observe((0.5, 0.0), 0.0)
+
+        controller.reset()
+
+        assert controller.command(0.0) is None
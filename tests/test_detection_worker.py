@@ -0,0 +1,193 @@
+"""Tests for core/detection_worker.py"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from core.detection_worker import DetectionResult, DetectionWorker
+from core.synthetic import SyntheticSource
+from core.tracker import FaceTracker
+from utils.constants import TRACK_MAX_EXTRAPOLATION
+
+
+class GatedTracker:
+    """FaceTracker stand-in whose track() blocks until released.
+
+    Reports a face whose x is the first pixel value of the frame.
+    """
+
+    def __init__(self):
+        self.seen: list[int] = []
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+        self.resets = 0
+
+    def track(self, frame):
+        self.entered.set()
+        self.gate.wait(2)
+        self.seen.append(int(frame[0, 0, 0]))
+        return (int(frame[0, 0, 0]), 0, 10, 10)
+
+    def reset(self):
+        self.resets += 1
+
+
+def _frame(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+@pytest.fixture
+def tracker():
+    return GatedTracker()
+
+
+@pytest.fixture
+def worker(tracker):
+    worker = DetectionWorker(tracker)
+    worker.start()
+    yield worker
+    tracker.gate.set()
+    worker.stop()
+
+
+class TestDetectionWorker:
+    """Tests for DetectionWorker class."""
+
+    def test_submit_does_not_block(self, worker, tracker):
+        """Test submit returns while detection is still running."""
+        worker.submit(_frame(1), 1, 0.0)
+        assert tracker.entered.wait(2)
+
+        worker.submit(_frame(2), 2, 0.1)  # Would hang if submit blocked
+
+        assert worker.latest() is None
+
+    def test_newest_frame_wins(self, worker, tracker):
+        """Test frames queued behind a busy worker are replaced, not queued."""
+        worker.submit(_frame(1), 1, 0.0)
+        assert tracker.entered.wait(2)
+        for value in range(2, 6):
+            worker.submit(_frame(value), value, value / 10)
+        tracker.gate.set()
+
+        result = worker.wait(4, timeout=2)
+
+        assert result.frame_id == 5
+        assert tracker.seen == [1, 5]
+        assert worker.stats() == {"submitted": 5, "processed": 2, "dropped": 3}
+
+    def test_result_tagged_with_frame(self, worker, tracker):
+        """Test results carry the submitted frame id and capture time."""
+        tracker.gate.set()
+        worker.submit(_frame(7), 42, 12.5)
+
+        result = worker.wait(0, timeout=2)
+
+        assert result.frame_id == 42
+        assert result.timestamp == 12.5
+        assert result.face == (7, 0, 10, 10)
+
+    def test_frame_copied_on_submit(self, worker, tracker):
+        """Test the caller may reuse its buffer right after submit."""
+        frame = _frame(3)
+        worker.submit(frame, 1, 0.0)
+        frame[:] = 99  # e.g. overlay drawn into the pooled buffer
+        tracker.gate.set()
+
+        assert worker.wait(0, timeout=2).face[0] == 3
+
+    def test_velocity_from_consecutive_results(self, worker, tracker):
+        """Test face velocity is estimated in pixels per second."""
+        tracker.gate.set()
+        worker.submit(_frame(10), 1, 1.0)
+        worker.wait(0, timeout=2)
+        worker.submit(_frame(30), 2, 1.1)
+
+        result = worker.wait(1, timeout=2)
+
+        assert result.velocity == pytest.approx((200.0, 0.0))
+
+    def test_reset_discards_results(self, worker, tracker):
+        """Test reset clears the latest result and resets the tracker."""
+        tracker.gate.set()
+        worker.submit(_frame(1), 1, 0.0)
+        worker.wait(0, timeout=2)
+
+        worker.reset()
+
+        assert worker.latest() is None
+        assert tracker.resets == 1
+
+    def test_reset_after_track_drops_result(self, worker, tracker):
+        """Test a reset right after track() can't be followed by its result."""
+
+        class ResetOnRelease:
+            """Track lock that runs reset() the moment the worker lets go."""
+
+            def __init__(self):
+                self.lock = threading.Lock()
+                self.armed = True
+
+            def __enter__(self):
+                self.lock.acquire()
+
+            def __exit__(self, *exc):
+                self.lock.release()
+                if self.armed:
+                    self.armed = False
+                    resetter = threading.Thread(target=worker.reset)
+                    resetter.start()
+                    resetter.join(2)
+
+        worker._track_lock = ResetOnRelease()
+        tracker.gate.set()
+        worker.submit(_frame(1), 1, 0.0)
+        deadline = time.monotonic() + 2
+        while worker.stats()["processed"] < 1 or tracker.resets < 1:
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+
+        assert worker.latest() is None
+
+    def test_stop_without_start(self, tracker):
+        """Test stop is a no-op when the thread never started."""
+        DetectionWorker(tracker).stop()
+
+    def test_tracks_synthetic_face(self):
+        """Test the real tracker finds the face off-thread."""
+        source = SyntheticSource(640, 360, realtime=False)
+        worker = DetectionWorker(FaceTracker())
+        worker.start()
+        try:
+            worker.submit(source.render(0), 1, 0.0)
+            result = worker.wait(0, timeout=5)
+        finally:
+            worker.stop()
+
+        truth = source.face_box(0)
+        assert result.face is not None
+        assert abs(result.face[0] - truth[0]) < truth[2] * 0.2
+
+
+class TestDetectionResult:
+    """Tests for latency compensation."""
+
+    def test_face_at_extrapolates(self):
+        """Test the box moves along its velocity by the result's age."""
+        result = DetectionResult(1, 10.0, (100, 50, 40, 40), (200.0, -100.0))
+
+        assert result.face_at(10.1) == (120, 40, 40, 40)
+
+    def test_face_at_capped(self):
+        """Test extrapolation stops at TRACK_MAX_EXTRAPOLATION."""
+        result = DetectionResult(1, 10.0, (100, 50, 40, 40), (100.0, 0.0))
+
+        face = result.face_at(10.0 + TRACK_MAX_EXTRAPOLATION * 10)
+
+        assert face[0] == round(100 + 100.0 * TRACK_MAX_EXTRAPOLATION)
+
+    def test_face_at_no_face(self):
+        """Test no face stays None."""
+        assert DetectionResult(1, 0.0, None).face_at(1.0) is None
@@ -0,0 +1,222 @@
+"""Tests for core/detectors.py"""
+
+import os
+import urllib.request
+
+import numpy as np
+import pytest
+
+from core import detectors
+from core.detectors import (
+    CASCADE_DIRS,
+    LBP_CASCADE,
+    YUNET_MODEL,
+    YUNET_URL,
+    HaarDetector,
+    YuNetDetector,
+    create_detector,
+    find_model,
+)
+from core.synthetic import SyntheticSource
+from core.tracker import FaceTracker
+
+
+def _gray(source, index=0):
+    return source.render(index)[:, :, 1].copy()
+
+
+@pytest.fixture
+def create_or_skip(request):
+    """Factory creating a backend, skipping the test if its model is missing.
+
+    With MEET2UI_FETCH_MODELS=1 (as in CI) the YuNet model is downloaded
+    into pytest's cache instead, so the DNN path is exercised.
+    """
+
+    def create(name):
+        try:
+            return create_detector(name)
+        except FileNotFoundError as e:
+            if name != "yunet" or os.environ.get("MEET2UI_FETCH_MODELS") != "1":
+                pytest.skip(str(e))
+        path = request.config.cache.mkdir("models") / YUNET_MODEL
+        if not path.exists():
+            # Download under a temporary name so an interrupted fetch
+            # never leaves a truncated model behind
+            partial = path.with_name(path.name + ".part")
+            urllib.request.urlretrieve(YUNET_URL, partial)
+            os.replace(partial, path)
+        return YuNetDetector(path)
+
+    return create
+
+
+class TestCommonFormat:
+    """Tests for the (boxes, scores) contract shared by all backends."""
+
+    @pytest.mark.parametrize("name", ["haar", "lbp", "yunet"])
+    def test_finds_synthetic_face(self, name, create_or_skip):
+        """Test each backend returns Nx4 int32 boxes and N float32 scores."""
+        detector = create_or_skip(name)
+        source = SyntheticSource(640, 360, realtime=False)
+
+        boxes, scores = detector.detect(_gray(source), 40)
+
+        assert boxes.dtype == np.int32
+        assert boxes.shape[1] == 4
+        assert scores.dtype == np.float32
+        assert len(boxes) == len(scores) >= 1
+
+    @pytest.mark.parametrize("name", ["haar", "lbp", "yunet"])
+    def test_empty_result(self, name, create_or_skip):
+        """Test no face gives empty arrays with the right shapes."""
+        detector = create_or_skip(name)
+
+        boxes, scores = detector.detect(np.zeros((240, 320), dtype=np.uint8), 40)
+
+        assert boxes.shape == (0, 4)
+        assert scores.shape == (0,)
+
+    def test_max_size_excludes_large_faces(self):
+        """Test faces above max_size are not reported."""
+        detector = HaarDetector()
+        source = SyntheticSource(640, 360, realtime=False)
+        size = source.face_box(0)[2]
+
+        boxes, _ = detector.detect(_gray(source), 24, size // 2)
+
+        assert len(boxes) == 0
+
+
+class TestCreateDetector:
+    """Tests for create_detector and model lookup."""
+
+    def test_haar(self):
+        """Test haar needs no external model."""
+        assert create_detector("haar").name == "haar"
+
+    def test_unknown(self):
+        """Test unknown backend name raises ValueError."""
+        with pytest.raises(ValueError):
+            create_detector("nope")
+
+    def test_missing_model(self, tmp_path, monkeypatch):
+        """Test a missing model raises FileNotFoundError."""
+        monkeypatch.setattr(detectors, "MODEL_DIRS", [tmp_path])
+        monkeypatch.setattr(detectors, "CASCADE_DIRS", [])
+
+        with pytest.raises(FileNotFoundError):
+            create_detector("lbp")
+
+    def test_cascade_dirs_only_for_cascades(self, tmp_path, monkeypatch):
+        """Test system cascade dirs are searched for LBP, not for ONNX models."""
+        (tmp_path / LBP_CASCADE).write_bytes(b"")
+        (tmp_path / YUNET_MODEL).write_bytes(b"")
+        monkeypatch.setattr(detectors, "MODEL_DIRS", [])
+
+        assert find_model(LBP_CASCADE, [tmp_path]) == tmp_path / LBP_CASCADE
+        with pytest.raises(FileNotFoundError):
+            find_model(YUNET_MODEL)
+        assert all("lbpcascades" in str(d) for d in CASCADE_DIRS)
+
+    def test_find_model_search_order(self, tmp_path, monkeypatch):
+        """Test the first directory containing the model wins."""
+        first, second = tmp_path / "a", tmp_path / "b"
+        first.mkdir()
+        second.mkdir()
+        (second / "model.onnx").write_bytes(b"")
+        monkeypatch.setattr(detectors, "MODEL_DIRS", [first, second])
+
+        assert find_model("model.onnx") == second / "model.onnx"
+
+
+class FakeYuNet:
+    """cv2.FaceDetectorYN stand-in recording input sizes and images."""
+
+    def __init__(self):
+        self.sizes = []
+        self.images = []
+
+    def setInputSize(self, size):  # noqa: N802
+        self.sizes.append(size)
+
+    def detect(self, image):
+        self.images.append(image.copy())
+        face = np.zeros((1, 15), dtype=np.float32)
+        face[0, :4] = (10, 20, 50, 50)
+        face[0, -1] = 0.9
+        return 1, face
+
+
+class TestYuNet:
+    """Tests for YuNetDetector input handling."""
+
+    @pytest.fixture
+    def fake_net(self, monkeypatch):
+        net = FakeYuNet()
+        monkeypatch.setattr(detectors.cv2.FaceDetectorYN, "create", lambda *a: net)
+        return net
+
+    def test_roi_crops_share_input_size(self, fake_net):
+        """Test similar ROI crops don't resize the network."""
+        detector = YuNetDetector("model.onnx")
+        detector.detect(np.zeros((360, 640), dtype=np.uint8), 40)
+        for height, width in [(150, 150), (140, 160), (155, 145), (170, 170)]:
+            detector.detect(np.zeros((height, width), dtype=np.uint8), 40, 80)
+        detector.detect(np.zeros((360, 640), dtype=np.uint8), 40)
+
+        assert fake_net.sizes == [(640, 384), (192, 192), (640, 384)]
+
+    def test_padding_keeps_coordinates(self, fake_net):
+        """Test crops sit top-left on a zeroed canvas; boxes are unchanged."""
+        detector = YuNetDetector("model.onnx")
+        detector.detect(np.full((150, 150), 255, dtype=np.uint8), 40)
+        boxes, scores = detector.detect(np.full((140, 130), 7, dtype=np.uint8), 40)
+
+        canvas = fake_net.images[-1]
+        assert canvas.shape == (192, 192, 3)
+        assert (canvas[:140, :130] == 7).all()
+        assert not canvas[140:].any() and not canvas[:, 130:].any()
+        assert boxes.tolist() == [[10, 20, 50, 50]]
+        assert scores.dtype == np.float32
+
+    def test_real_model_finds_face_in_roi(self, create_or_skip):
+        """Test the real network finds the face in the frame and in a crop."""
+        detector = create_or_skip("yunet")
+        source = SyntheticSource(640, 360, realtime=False)
+        gray = _gray(source)
+        x, y, w, h = source.face_box(0)
+
+        boxes, _ = detector.detect(gray, 24)
+        assert len(boxes) >= 1
+        left, top = max(0, x - w), max(0, y - h)
+        crop = gray[top : y + 2 * h, left : x + 2 * w]
+        boxes, _ = detector.detect(crop, 24)
+        assert len(boxes) >= 1
+        cx, cy = boxes[0][:2] + boxes[0][2:] // 2 + (left, top)
+        assert abs(cx - (x + w // 2)) < w // 2
+        assert abs(cy - (y + h // 2)) < h // 2
+
+
+class TestTrackerBackend:
+    """Tests for plugging detectors into FaceTracker."""
+
+    def test_accepts_instance(self):
+        """Test FaceTracker uses a detector instance and maps its boxes."""
+
+        class FixedDetector:
+            name = "fixed"
+
+            def detect(self, image, min_size, max_size=None):
+                boxes = np.array([[10, 10, 30, 30], [50, 40, 60, 60]], np.int32)
+                return boxes, np.ones(2, np.float32)
+
+        tracker = FaceTracker(detect_width=0, detector=FixedDetector())
+        face = tracker.detect(np.zeros((120, 160, 3), dtype=np.uint8))
+
+        assert face == (50, 40, 60, 60)
+
+    def test_unknown_name(self):
+        """Test unknown detector name is rejected."""
+        with pytest.raises(ValueError):
+            FaceTracker(detector="nope")
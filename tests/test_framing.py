@@ -0,0 +1,127 @@
+"""Tests for core/framing.py"""
+
+import tracemalloc
+from unittest.mock import patch
+
+import numpy as np
+
+from core.framing import AutoFramer
+from ui.preview import Preview
+
+FRAME = (720, 1280, 3)
+
+
+class TestAutoFramer:
+    """Tests for AutoFramer."""
+
+    def test_full_frame_before_face(self):
+        """Test the window covers the frame until a face is seen."""
+        framer = AutoFramer()
+
+        assert framer.rect(FRAME) == (0, 0, 1280, 720)
+        assert framer.update(None, FRAME) == (0, 0, 1280, 720)
+
+    def test_converges_on_face(self):
+        """Test the window centres on the face and zooms to fit it."""
+        framer = AutoFramer(face_fraction=0.3, speed=0.5)
+        face = (600, 300, 90, 90)
+
+        for _ in range(40):
+            x, y, w, h = framer.update(face, FRAME)
+
+        assert abs(x + w / 2 - 645) <= 1
+        assert abs(y + h / 2 - 345) <= 1
+        assert abs(h - 300) <= 1
+
+    def test_aspect_locked(self):
+        """Test the window keeps the output aspect ratio."""
+        framer = AutoFramer(aspect=16 / 9, speed=1.0)
+        _, _, w, h = framer.update((600, 300, 90, 90), FRAME)
+
+        assert abs(w / h - 16 / 9) < 0.01
+
+    def test_stays_inside_frame(self):
+        """Test a face at the edge doesn't push the window out of the frame."""
+        framer = AutoFramer(speed=1.0)
+        x, y, w, h = framer.update((1200, 650, 60, 60), FRAME)
+
+        assert x >= 0 and y >= 0
+        assert x + w <= 1280 and y + h <= 720
+
+    def test_max_zoom(self):
+        """Test a tiny face doesn't zoom in past max_zoom."""
+        framer = AutoFramer(max_zoom=2.0, speed=1.0)
+        _, _, _, h = framer.update((640, 360, 10, 10), FRAME)
+
+        assert h == 360
+
+    def test_smoothing(self):
+        """Test the window moves part of the way each frame."""
+        framer = AutoFramer(speed=0.2)
+        first = framer.update((100, 300, 90, 90), FRAME)
+        second = framer.update((100, 300, 90, 90), FRAME)
+
+        # Zooming in gradually: partway from 720 towards 300 rows
+        assert 300 < second[3] < first[3] < 720
+
+    def test_holds_without_face(self):
+        """Test the window stays put when no face is reported."""
+        framer = AutoFramer(speed=0.5)
+        window = framer.update((100, 300, 90, 90), FRAME)
+
+        assert framer.update(None, FRAME) == window
+
+    def test_reset(self):
+        """Test reset zooms back out to the full frame."""
+        framer = AutoFramer(speed=1.0)
+        framer.update((100, 300, 90, 90), FRAME)
+
+        framer.reset()
+
+        assert framer.rect(FRAME) == (0, 0, 1280, 720)
+
+    def test_crop_is_view(self):
+        """Test crop returns a view into the frame."""
+        framer = AutoFramer(speed=1.0)
+        frame = np.zeros(FRAME, dtype=np.uint8)
+        x, y, w, h = framer.update((600, 300, 90, 90), FRAME)
+
+        view = framer.crop(frame)
+
+        assert view.shape == (h, w, 3)
+        assert np.shares_memory(view, frame)
+
+    def test_crop_yuyv_keeps_pixel_pairs(self):
+        """Test YUYV crops start and end on even columns."""
+        framer = AutoFramer(speed=1.0)
+        frame = np.zeros((720, 1280, 2), dtype=np.uint8)
+        framer.update((601, 300, 91, 91), FRAME)
+
+        view = framer.crop(frame)
+
+        assert view.shape[1] % 2 == 0
+        assert (view.__array_interface__["data"][0] - frame.ctypes.data) % 4 == 0
+
+    def test_crop_to_preview_allocates_nothing(self):
+        """Test framing and preview conversion reuse their buffers."""
+        framer = AutoFramer()
+        preview = Preview()
+        frame = np.zeros(FRAME, dtype=np.uint8)
+
+        def step(i):
+            framer.update((500 + i, 300, 90, 90), FRAME)
+            preview.update(framer.crop(frame))
+
+        with patch("ui.preview.dpg.set_value", lambda *args: None):
+            step(0)
+            tracemalloc.start()
+            try:
+                baseline = tracemalloc.get_traced_memory()[0]
+                for i in range(20):
+                    step(i)
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        assert current - baseline < 4096
+        assert peak - baseline < 16384
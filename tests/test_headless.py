@@ -0,0 +1,88 @@
+"""Tests for headless.py"""
+
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from headless import HeadlessTracker, UsageMeter
+
+ROOT = Path(__file__).parent.parent
+
+
+class TestUsageMeter:
+    """Tests for UsageMeter."""
+
+    def test_sample(self):
+        """Test CPU% and memory readings are sane."""
+        meter = UsageMeter()
+        sum(range(100000))
+        cpu, rss, peak = meter.sample()
+        assert cpu >= 0.0
+        assert 0 < rss <= peak * 1.01
+
+
+class TestHeadlessTracker:
+    """Tests for HeadlessTracker."""
+
+    def test_tracks_synthetic_face(self, capsys):
+        """Test the daemon tracks at its rate and moves towards the face."""
+        daemon = HeadlessTracker("synthetic", fps=10)
+        assert daemon.run(report=0, duration=1.0) == 0
+        assert 7 <= daemon.frames <= 13
+        assert daemon.moves > 0
+        assert "cpu" in capsys.readouterr().out
+
+    def test_stop(self):
+        """Test stop() ends run() promptly."""
+        daemon = HeadlessTracker("synthetic", fps=5)
+        threading.Timer(0.5, daemon.stop).start()
+        assert daemon.run(report=0) == 0
+
+    def test_missing_device(self):
+        """Test an unopenable camera exits with an error."""
+        daemon = HeadlessTracker("/dev/video-missing")
+        assert daemon.run(report=0) == 1
+
+    def test_raw_falls_back_to_bgr(self, capsys):
+        """Test a camera with no raw frames is reopened in BGR mode."""
+        daemon = HeadlessTracker("synthetic", fps=10)
+        daemon.first_frame_timeout = 0.2
+        wait_frame = daemon.camera.wait_frame
+
+        def bgr_only(after_seq, timeout=None):
+            return None if daemon.camera.raw else wait_frame(after_seq, timeout)
+
+        daemon.camera.wait_frame = bgr_only
+        assert daemon.run(report=0, duration=0.5) == 0
+        assert daemon.frames > 0
+        assert "retrying with BGR" in capsys.readouterr().err
+
+    def test_no_frames(self, capsys):
+        """Test a camera that opens but never delivers exits with an error."""
+        daemon = HeadlessTracker("synthetic")
+        daemon.first_frame_timeout = 0.1
+        daemon.camera.wait_frame = lambda after_seq, timeout=None: None
+        assert daemon.run(report=0) == 1
+        assert "No frames from synthetic" in capsys.readouterr().err
+
+    def test_sigterm_and_no_gui_import(self):
+        """Test SIGTERM shuts down cleanly and DearPyGui is never imported."""
+        script = (
+            "import os, signal, sys, threading, headless\n"
+            "threading.Timer(1.0, os.kill, (os.getpid(), signal.SIGTERM)).start()\n"
+            "try:\n"
+            "    headless.main()\n"
+            "finally:\n"
+            "    print('gui' if 'dearpygui' in sys.modules else 'no gui')\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script, "--device", "synthetic", "--report", "0"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        assert result.returncode == 0, result.stderr
+        assert "no gui" in result.stdout
+        assert "rss" in result.stdout
@@ -0,0 +1,132 @@
+"""Tests for utils/metrics.py"""
+
+import tracemalloc
+
+import pytest
+
+from core.synthetic import SyntheticSource
+from core.tracker import FaceTracker
+from utils.metrics import METRICS, Histogram, Metrics
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_empty(self):
+        """Test an empty histogram reports no percentiles."""
+        assert Histogram(8).summary() == {"count": 0}
+
+    def test_percentiles(self):
+        """Test percentiles over the samples."""
+        histogram = Histogram(100)
+        for value in range(1, 101):
+            histogram.add(float(value))
+        summary = histogram.summary()
+        assert summary["count"] == 100
+        assert summary["p50"] == pytest.approx(50.5)
+        assert summary["p95"] == pytest.approx(95.05)
+        assert summary["p99"] == pytest.approx(99.01)
+        assert summary["max"] == 100.0
+
+    def test_rolling_window(self):
+        """Test only the newest `size` samples count."""
+        histogram = Histogram(4)
+        for value in (100.0, 100.0, 1.0, 1.0, 1.0, 1.0):
+            histogram.add(value)
+        summary = histogram.summary()
+        assert summary["count"] == 6
+        assert summary["max"] == 1.0
+
+    def test_add_allocates_nothing(self):
+        """Test recording keeps memory fixed."""
+        histogram = Histogram(64)
+        histogram.add(0.5)
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            for i in range(1000):
+                histogram.add(i * 0.001)
+            current = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        assert current - baseline < 256
+
+
+class TestMetrics:
+    """Tests for Metrics."""
+
+    def test_timed_records(self):
+        """Test the decorator records one sample per call."""
+        metrics = Metrics(16)
+
+        @metrics.timed("step")
+        def step(x):
+            return x * 2
+
+        assert step(2) == 4
+        assert step(3) == 6
+        summary = metrics.summary()["step"]
+        assert summary["count"] == 2
+        assert summary["p50"] >= 0.0
+
+    def test_timed_records_on_error(self):
+        """Test a raising call is still timed."""
+        metrics = Metrics(16)
+
+        @metrics.timed("fail")
+        def fail():
+            raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            fail()
+        assert metrics.summary()["fail"]["count"] == 1
+
+    def test_disabled(self):
+        """Test nothing is recorded while disabled."""
+        metrics = Metrics(16, enabled=False)
+        step = metrics.timed("step")(lambda: None)
+        step()
+        metrics.record("other", 1.0)
+        assert metrics.summary() == {}
+        metrics.enabled = True
+        step()
+        assert metrics.summary()["step"]["count"] == 1
+
+    def test_summary_skips_unused(self):
+        """Test steps that never ran are left out."""
+        metrics = Metrics(16)
+        metrics.timed("unused")(lambda: None)
+        metrics.record("used", 2.0)
+        assert list(metrics.summary()) == ["used"]
+
+    def test_reset(self):
+        """Test reset clears samples."""
+        metrics = Metrics(16)
+        metrics.record("step", 1.0)
+        metrics.reset()
+        assert metrics.summary() == {}
+
+    def test_report(self):
+        """Test the text table has a header and a line per step."""
+        metrics = Metrics(16)
+        metrics.record("camera.read", 1.5)
+        metrics.record("tracker.detect", 8.0)
+        lines = metrics.report().splitlines()
+        assert lines[0].split() == ["step", "p50", "p95", "p99"]
+        assert lines[1].startswith("camera.read")
+        assert lines[2].split()[1] == "8.00"
+
+
+class TestInstrumentation:
+    """Tests for the instrumented hot-path steps."""
+
+    def test_tracker_steps_recorded(self):
+        """Test tracking records track, detect and offset timings."""
+        METRICS.reset()
+        frame = SyntheticSource(640, 360, realtime=False).render(0)
+        tracker = FaceTracker()
+        face = tracker.track(frame)
+        tracker.calculate_offset(frame, face)
+        summary = METRICS.summary()
+        for name in ("tracker.track", "tracker.detect", "tracker.offset"):
+            assert summary[name]["count"] >= 1
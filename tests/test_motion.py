@@ -0,0 +1,91 @@
+"""Tests for core/motion.py"""
+
+import numpy as np
+
+from core.motion import MotionGate
+from core.synthetic import SyntheticSource, bgr_to_yuyv
+
+
+class TestMotionGate:
+    """Tests for MotionGate."""
+
+    def test_first_frame_passes(self, sample_frame):
+        """Test the first frame is never skipped."""
+        gate = MotionGate()
+
+        assert gate.static(sample_frame) is False
+
+    def test_identical_frames_static(self, sample_frame):
+        """Test an unchanged frame is reported static."""
+        gate = MotionGate()
+        gate.static(sample_frame)
+
+        assert gate.static(sample_frame.copy()) is True
+
+    def test_noise_is_static(self):
+        """Test per-pixel sensor noise averages out in the thumbnail."""
+        source = SyntheticSource(640, 360, realtime=False)
+        rng = np.random.default_rng(0)
+        frame = source.render(0)
+        gate = MotionGate(threshold=6)
+        gate.static(frame)
+
+        noisy = frame.astype(np.int16) + rng.normal(0, 3, frame.shape).astype(np.int16)
+        assert gate.static(np.clip(noisy, 0, 255).astype(np.uint8)) is True
+
+    def test_moving_face_passes(self):
+        """Test a moving face is detected as motion."""
+        source = SyntheticSource(640, 360, realtime=False)
+        gate = MotionGate()
+        gate.static(source.render(0))
+
+        assert gate.static(source.render(5)) is False
+
+    def test_slow_drift_accumulates(self, sample_frame):
+        """Test changes below threshold add up against the reference."""
+        gate = MotionGate(threshold=6)
+        gate.static(sample_frame)
+        frame = sample_frame.copy()
+
+        results = []
+        for _ in range(5):
+            frame[100:200, 300:400] += 3
+            results.append(gate.static(frame))
+
+        assert results[0] is True
+        assert False in results
+
+    def test_max_skip_forces_refresh(self, sample_frame):
+        """Test a frame is let through after max_skip static frames."""
+        gate = MotionGate(max_skip=3)
+        gate.static(sample_frame)
+
+        results = [gate.static(sample_frame) for _ in range(4)]
+
+        assert results == [True, True, True, False]
+
+    def test_grayscale_input(self, sample_frame):
+        """Test single-channel frames are accepted."""
+        gray = sample_frame[:, :, 0].copy()
+        gate = MotionGate()
+        gate.static(gray)
+
+        assert gate.static(gray) is True
+
+    def test_reset(self, sample_frame):
+        """Test reset lets the next frame through."""
+        gate = MotionGate()
+        gate.static(sample_frame)
+
+        gate.reset()
+
+        assert gate.static(sample_frame) is False
+
+    def test_yuyv_input(self):
+        """Test YUYV frames are gated on their Y plane."""
+        source = SyntheticSource(640, 360, realtime=False)
+        gate = MotionGate()
+        gate.static(bgr_to_yuyv(source.render(0)))
+
+        assert gate.static(bgr_to_yuyv(source.render(0))) is True
+        assert gate.static(bgr_to_yuyv(source.render(5))) is False
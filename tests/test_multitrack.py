@@ -0,0 +1,271 @@
+"""Tests for core/multitrack.py"""
+
+import cv2
+import numpy as np
+import pytest
+
+from core.detectors import _empty
+from core.multitrack import MultiFaceTracker, assign, iou_matrix, match_scores
+from core.tracker import FaceTracker
+
+
+class ScriptedDetector:
+    """Returns a fixed list of boxes on every call."""
+
+    name = "scripted"
+
+    def __init__(self, boxes):
+        self.boxes = boxes
+
+    def detect(self, image, min_size, max_size=None):
+        if not self.boxes:
+            return _empty()
+        boxes = np.array(self.boxes, dtype=np.int32)
+        return boxes, np.ones(len(boxes), dtype=np.float32)
+
+
+class BlobDetector:
+    """Reports every non-black rectangle, so ROI crops see only their part."""
+
+    name = "blob"
+
+    def detect(self, image, min_size, max_size=None):
+        contours, _ = cv2.findContours(
+            (image > 0).astype(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+        )
+        if not contours:
+            return _empty()
+        boxes = np.array([cv2.boundingRect(c) for c in contours], dtype=np.int32)
+        return boxes, np.ones(len(boxes), dtype=np.float32)
+
+
+def draw_faces(boxes):
+    """Black frame with a textured patch at every (x, y, w, h) box."""
+    frame = np.zeros((360, 640, 3), dtype=np.uint8)
+    rng = np.random.default_rng(0)
+    for x, y, w, h in boxes:
+        frame[y : y + h, x : x + w] = rng.integers(1, 256, (h, w, 3), dtype=np.uint8)
+    return frame
+
+
+class TestAssociation:
+    """Tests for the vectorized IoU and assignment helpers."""
+
+    def test_iou_matrix(self):
+        """IoU is 1 for identical boxes, 0 for disjoint ones."""
+        a = [(0, 0, 10, 10), (100, 100, 10, 10)]
+        b = [(0, 0, 10, 10), (5, 0, 10, 10), (300, 300, 5, 5)]
+        iou = iou_matrix(a, b)
+
+        assert iou.shape == (2, 3)
+        assert iou[0, 0] == pytest.approx(1.0)
+        assert iou[0, 1] == pytest.approx(50 / 150)
+        assert iou[1].max() == 0.0
+
+    def test_empty_inputs(self):
+        """Empty box lists give empty matrices and no matches."""
+        scores = match_scores(np.empty((0, 4)), [(0, 0, 10, 10)])
+
+        assert scores.shape == (0, 1)
+        assert assign(scores, 0.3) == []
+
+    def test_centroid_links_fast_faces(self):
+        """A face that moved past its old box still scores above zero."""
+        scores = match_scores([(0, 0, 40, 40)], [(45, 0, 40, 40)])
+
+        assert iou_matrix([(0, 0, 40, 40)], [(45, 0, 40, 40)])[0, 0] == 0.0
+        assert scores[0, 0] > 0.0
+
+    def test_assign_mutual_best(self):
+        """Each row gets its best column, without reusing columns."""
+        scores = np.array([[0.9, 0.8], [0.85, 0.1]])
+
+        assert sorted(assign(scores, 0.3)) == [(0, 0)]
+        scores = np.array([[0.9, 0.5], [0.2, 0.6]])
+        assert sorted(assign(scores, 0.3)) == [(0, 0), (1, 1)]
+
+    def test_assign_threshold(self):
+        """Pairs scoring below the threshold stay unmatched."""
+        assert assign(np.array([[0.2]]), 0.3) == []
+
+
+class TestMultiFaceTracker:
+    """Tests for MultiFaceTracker."""
+
+    def test_stable_ids(self):
+        """Two moving faces keep their IDs across frames."""
+        tracker = MultiFaceTracker()
+        tracker.update([(0, 0, 50, 50), (200, 0, 50, 50)])
+        ids = {t.box[0] // 100: t.id for t in tracker.visible()}
+
+        for step in range(1, 6):
+            # Listed in the opposite order, each moving right
+            tracker.update([(200 + 10 * step, 0, 50, 50), (10 * step, 0, 50, 50)])
+            seen = {t.box[0] // 100: t.id for t in tracker.visible()}
+            assert seen == ids
+
+        assert all(t.hits == 6 for t in tracker.tracks)
+
+    def test_track_expires(self):
+        """A face missing for more than max_misses scans is dropped."""
+        tracker = MultiFaceTracker(max_misses=2)
+        tracker.update([(0, 0, 50, 50)])
+
+        tracker.update([])
+        tracker.update([])
+        assert len(tracker.tracks) == 1
+        assert tracker.visible() == []
+
+        tracker.update([])
+        assert tracker.tracks == []
+
+    def test_stale_tracks_hidden(self):
+        """Faces not refreshed within stale_after frames are not visible."""
+        tracker = MultiFaceTracker(stale_after=3)
+        tracker.update([(0, 0, 50, 50), (200, 0, 40, 40)])
+        target = tracker.select((360, 640))
+
+        for _ in range(3):
+            tracker.follow(target)
+        assert len(tracker.visible()) == 2
+
+        tracker.follow(None)
+        assert [t.box for t in tracker.visible()] == [target]
+
+    def test_returning_face_keeps_id(self):
+        """A face back within max_misses resumes its old track."""
+        tracker = MultiFaceTracker(max_misses=3)
+        first = tracker.update([(0, 0, 50, 50)])[0].id
+        tracker.update([])
+
+        assert tracker.update([(5, 0, 50, 50)])[0].id == first
+
+    def test_policy_largest(self):
+        """The largest face is selected."""
+        tracker = MultiFaceTracker("largest")
+        tracker.update([(0, 0, 40, 40), (200, 0, 80, 80)])
+
+        assert tracker.select((360, 640)) == (200, 0, 80, 80)
+
+    def test_policy_center(self):
+        """The face nearest the frame centre is selected."""
+        tracker = MultiFaceTracker("center")
+        tracker.update([(0, 0, 80, 80), (300, 160, 40, 40)])
+
+        assert tracker.select((360, 640)) == (300, 160, 40, 40)
+
+    def test_policy_persistent(self):
+        """The longest-seen face wins over a newer, larger one."""
+        tracker = MultiFaceTracker("persistent")
+        for _ in range(3):
+            tracker.update([(0, 0, 40, 40)])
+        tracker.update([(0, 0, 40, 40), (200, 0, 100, 100)])
+
+        assert tracker.select((360, 640)) == (0, 0, 40, 40)
+
+    def test_policy_all(self):
+        """The union of every face is selected."""
+        tracker = MultiFaceTracker("all")
+        tracker.update([(10, 20, 40, 40), (200, 100, 60, 60)])
+
+        assert tracker.select((360, 640)) == (10, 20, 250, 140)
+
+    def test_switch_hysteresis(self):
+        """A slightly larger face doesn't steal the target."""
+        tracker = MultiFaceTracker("largest")
+        tracker.update([(0, 0, 50, 50), (200, 0, 48, 48)])
+        target = tracker.select((360, 640))
+
+        tracker.update([(0, 0, 50, 50), (200, 0, 52, 52)])
+        assert tracker.select((360, 640)) == target
+
+        # A clearly larger face takes over
+        tracker.update([(0, 0, 50, 50), (200, 0, 70, 70)])
+        assert tracker.select((360, 640)) == (200, 0, 70, 70)
+
+    def test_no_faces(self):
+        """Nothing to select without visible faces."""
+        tracker = MultiFaceTracker()
+
+        assert tracker.select((360, 640)) is None
+
+    def test_unknown_policy(self):
+        """An unknown policy raises ValueError."""
+        with pytest.raises(ValueError):
+            MultiFaceTracker("loudest")
+
+    def test_reset(self):
+        """Reset drops tracks and the target."""
+        tracker = MultiFaceTracker()
+        tracker.update([(0, 0, 50, 50)])
+        tracker.select((360, 640))
+
+        tracker.reset()
+
+        assert tracker.tracks == []
+        assert tracker.target_id is None
+
+
+class TestFaceTrackerPolicy:
+    """Tests for FaceTracker with several faces in view."""
+
+    def test_keeps_target(self):
+        """Full scans keep following the same face as sizes fluctuate."""
+        detector = ScriptedDetector([(40, 40, 60, 60), (400, 40, 58, 58)])
+        tracker = FaceTracker(detect_interval=1, roi_misses=0, detector=detector)
+        frame = np.zeros((360, 640, 3), dtype=np.uint8)
+
+        first = tracker.track(frame)
+        detector.boxes = [(40, 40, 60, 60), (400, 40, 64, 64)]
+
+        assert tracker.track(frame) == first
+        assert len(tracker.faces) == 2
+
+    def test_all_policy_frames_everyone(self):
+        """The "all" policy returns the union box on every frame."""
+        detector = ScriptedDetector([(40, 40, 60, 60), (400, 40, 60, 60)])
+        tracker = FaceTracker(detector=detector, policy="all")
+        frame = np.zeros((360, 640, 3), dtype=np.uint8)
+
+        for _ in range(3):
+            assert tracker.track(frame) == (40, 40, 420, 60)
+        assert tracker.stats["matches"] == 0
+        assert tracker.stats["roi_hits"] == 0
+
+    def test_reset_clears_tracks(self):
+        """Reset forgets every face."""
+        detector = ScriptedDetector([(40, 40, 60, 60)])
+        tracker = FaceTracker(detector=detector)
+        tracker.track(np.zeros((360, 640, 3), dtype=np.uint8))
+
+        tracker.reset()
+
+        assert tracker.faces == []
+
+    def test_face_leaving_is_dropped(self):
+        """A face that leaves disappears even while ROI and template hit."""
+        big, small = (100, 100, 80, 80), (400, 120, 60, 60)
+        tracker = FaceTracker(detector=BlobDetector(), motion_threshold=0)
+        both, one = draw_faces([big, small]), draw_faces([big])
+
+        for _ in range(5):
+            assert tracker.track(both) == big
+        assert len(tracker.faces) == 2
+        scans = tracker.stats["full_scans"]
+
+        for _ in range(tracker.rescan_interval + 1):
+            assert tracker.track(one) == big
+        assert [box for _, box in tracker.faces] == [big]
+        assert tracker.stats["full_scans"] > scans
+        assert tracker.stats["matches"] > 0
+
+    def test_face_joining_is_tracked(self):
+        """A face that enters gets a track at the next periodic scan."""
+        big, small = (100, 100, 80, 80), (400, 120, 60, 60)
+        tracker = FaceTracker(detector=BlobDetector(), motion_threshold=0)
+        one, both = draw_faces([big]), draw_faces([big, small])
+        tracker.track(one)
+
+        for _ in range(tracker.rescan_interval):
+            tracker.track(both)
+        assert sorted(box for _, box in tracker.faces) == [big, small]
@@ -0,0 +1,81 @@
+"""Tests for ui/pacer.py"""
+
+import threading
+import time
+
+import pytest
+
+from ui import pacer as pacer_module
+from ui.pacer import FramePacer
+
+
+@pytest.fixture(autouse=True)
+def short_linger(monkeypatch):
+    monkeypatch.setattr(pacer_module, "_LINGER", 0.05)
+
+
+def _timed_wait(pacer, **kwargs):
+    start = time.monotonic()
+    pacer.wait(**kwargs)
+    return time.monotonic() - start
+
+
+def _pacer(**kwargs):
+    pacer = FramePacer(
+        **{"target_fps": 50, "idle_fps": 10, "background_fps": 5, **kwargs}
+    )
+    pacer.wait()  # Start the clock at a render
+    time.sleep(0.06)  # Past the input linger
+    return pacer
+
+
+class TestFramePacer:
+    """Tests for FramePacer."""
+
+    def test_pending_frame_renders_at_target_rate(self):
+        """Test a pending frame renders right away once the gap has passed."""
+        pacer = _pacer()
+        pacer.notify()
+        assert _timed_wait(pacer) < 0.01
+        pacer.notify()
+        assert 0.015 <= _timed_wait(pacer) < 0.05
+
+    def test_idle_renders_at_idle_rate(self):
+        """Test nothing pending waits for the idle interval."""
+        pacer = _pacer()
+        pacer.wait()
+        elapsed = _timed_wait(pacer)
+        assert 0.08 <= elapsed < 0.15
+        assert pacer.stats["idle_renders"] >= 1
+
+    def test_notify_wakes_waiter(self):
+        """Test a frame from another thread ends an idle wait early."""
+        pacer = _pacer()
+        pacer.wait()
+        threading.Timer(0.03, pacer.notify).start()
+        assert _timed_wait(pacer) < 0.08
+
+    def test_input_lingers_at_full_rate(self):
+        """Test renders stay at the target rate just after input."""
+        pacer = _pacer()
+        pacer.input()
+        pacer.wait()
+        assert _timed_wait(pacer) < 0.04
+
+    def test_hidden_uses_background_rate(self):
+        """Test a minimized viewport renders at the background rate."""
+        pacer = _pacer()
+        pacer.wait()
+        pacer.notify()
+        elapsed = _timed_wait(pacer, hidden=True)
+        assert 0.18 <= elapsed < 0.3
+        assert pacer.stats["background"]
+
+    def test_inactive_polls_at_background_rate(self):
+        """Test no input for idle_after slows polling but not new frames."""
+        pacer = _pacer(idle_after=0.05)
+        pacer.wait()
+        assert _timed_wait(pacer) >= 0.18
+        pacer.notify()
+        assert _timed_wait(pacer) < 0.05
+        assert not pacer.stats["background"]
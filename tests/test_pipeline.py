@@ -0,0 +1,305 @@
+"""Tests for core/pipeline.py"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from core.camera import Camera, CapturedFrame
+from core.framepool import FramePool
+from core.pipeline import (
+    BLOCK,
+    DROP_NEWEST,
+    DROP_OLDEST,
+    AnalysedFrame,
+    BoundedQueue,
+    CameraSource,
+    Stage,
+    release_frame,
+    retain_frame,
+)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+class TestBoundedQueue:
+    """Tests for BoundedQueue."""
+
+    def test_fifo(self):
+        """Test items come out in order."""
+        q = BoundedQueue(3)
+        for i in range(3):
+            q.put(i)
+        assert [q.get_nowait() for _ in range(3)] == [0, 1, 2]
+        assert q.get_nowait() is None
+
+    def test_drop_oldest(self):
+        """Test a full drop_oldest queue evicts the head."""
+        dropped = []
+        q = BoundedQueue(2, DROP_OLDEST, on_drop=dropped.append)
+        for i in range(4):
+            assert q.put(i)
+        assert dropped == [0, 1]
+        assert [q.get_nowait(), q.get_nowait()] == [2, 3]
+
+    def test_drop_newest(self):
+        """Test a full drop_newest queue rejects the new item."""
+        dropped = []
+        q = BoundedQueue(2, DROP_NEWEST, on_drop=dropped.append)
+        assert q.put(0) and q.put(1)
+        assert not q.put(2)
+        assert dropped == [2]
+        assert [q.get_nowait(), q.get_nowait()] == [0, 1]
+
+    def test_block_waits_for_room(self):
+        """Test a full blocking queue waits until an item is taken."""
+        q = BoundedQueue(1, BLOCK)
+        q.put(0)
+        done = threading.Event()
+
+        def producer():
+            q.put(1)
+            done.set()
+
+        threading.Thread(target=producer, daemon=True).start()
+        assert not done.wait(0.05)
+        assert q.get_nowait() == 0
+        assert done.wait(1.0)
+        assert q.get_nowait() == 1
+
+    def test_block_timeout_drops(self):
+        """Test a blocking put gives up after its timeout."""
+        dropped = []
+        q = BoundedQueue(1, BLOCK, on_drop=dropped.append)
+        q.put(0)
+        assert not q.put(1, timeout=0.01)
+        assert dropped == [1]
+
+    def test_get_timeout(self):
+        """Test get returns None when nothing arrives."""
+        assert BoundedQueue().get(timeout=0.01) is None
+
+    def test_close_wakes_getter(self):
+        """Test close releases a blocked get and refuses new items."""
+        q = BoundedQueue()
+        result = []
+        thread = threading.Thread(target=lambda: result.append(q.get()))
+        thread.start()
+        q.close()
+        thread.join(1.0)
+        assert result == [None]
+        assert not q.put(1)
+
+    def test_stats(self):
+        """Test depth and counters."""
+        q = BoundedQueue(2)
+        for i in range(3):
+            q.put(i)
+        q.get_nowait()
+        stats = q.stats()
+        assert stats == {"depth": 1, "max_depth": 2, "put": 3, "got": 1, "dropped": 1}
+
+    def test_unknown_policy(self):
+        """Test an unknown policy is rejected."""
+        with pytest.raises(ValueError):
+            BoundedQueue(1, "drop_random")
+
+    def test_drop_releases_pooled_frames(self):
+        """Test dropped frames give their buffers back to the pool."""
+        pool = FramePool((4, 4, 3), size=3)
+        q = BoundedQueue(1, on_drop=release_frame)
+        for seq in range(3):
+            buffer = pool.acquire()
+            q.put(CapturedFrame(buffer.array, seq, 0.0, buffer))
+        assert pool.available == 2
+        q.clear()
+        assert pool.available == 3
+
+
+class TestStage:
+    """Tests for Stage."""
+
+    def test_processes_items(self):
+        """Test results reach the outbox and are counted."""
+        inbox, outbox = BoundedQueue(4, BLOCK), BoundedQueue(4, BLOCK)
+        stage = Stage("double", lambda x: x * 2, inbox, (outbox,))
+        stage.start()
+        try:
+            for i in range(3):
+                inbox.put(i)
+            results = [outbox.get(timeout=1.0) for _ in range(3)]
+        finally:
+            stage.stop()
+        assert results == [0, 2, 4]
+        stats = stage.stats()
+        assert stats["processed"] == 3
+        assert stats["errors"] == 0
+        assert stats["fps"] > 0
+
+    def test_source_stage(self):
+        """Test a stage without an inbox polls its function."""
+        counter = iter(range(1000))
+        outbox = BoundedQueue(2, BLOCK)
+        stage = Stage("source", lambda: next(counter), outboxes=(outbox,))
+        stage.start()
+        try:
+            assert outbox.get(timeout=1.0) == 0
+            assert outbox.get(timeout=1.0) == 1
+        finally:
+            outbox.close()
+            stage.stop()
+
+    def test_none_results_dropped(self):
+        """Test None results aren't passed on."""
+        inbox, outbox = BoundedQueue(4, BLOCK), BoundedQueue(4)
+        stage = Stage("filter", lambda x: x if x % 2 else None, inbox, (outbox,))
+        stage.start()
+        try:
+            for i in range(4):
+                inbox.put(i)
+            assert outbox.get(timeout=1.0) == 1
+            assert outbox.get(timeout=1.0) == 3
+        finally:
+            stage.stop()
+        assert stage.stats()["processed"] == 4
+
+    def test_errors_counted_and_item_dropped(self):
+        """Test an exception drops the item and the stage keeps going."""
+        dropped = []
+        inbox = BoundedQueue(4, BLOCK, on_drop=dropped.append)
+        outbox = BoundedQueue(4)
+        stage = Stage("div", lambda x: 1 // x, inbox, (outbox,))
+        stage.start()
+        try:
+            inbox.put(0)
+            inbox.put(1)
+            assert outbox.get(timeout=1.0) == 1
+        finally:
+            stage.stop()
+        stats = stage.stats()
+        assert stats["errors"] == 1
+        assert "ZeroDivisionError" in stats["last_error"]
+        assert dropped == [0]
+
+    def test_fanout_retains_per_extra_outbox(self):
+        """Test each extra outbox gets its own reference."""
+        pool = FramePool((4, 4, 3), size=1)
+        buffer = pool.acquire()
+        frame = CapturedFrame(buffer.array, 1, 0.0, buffer)
+        a, b = BoundedQueue(1), BoundedQueue(1)
+        items = iter([frame])
+        stage = Stage(
+            "fan", lambda: next(items, None), outboxes=(a, b), on_fanout=retain_frame
+        )
+        stage.start()
+        try:
+            assert a.get(timeout=1.0) is frame
+            assert b.get(timeout=1.0) is frame
+        finally:
+            stage.stop()
+        buffer.release()
+        assert pool.available == 0
+        buffer.release()
+        assert pool.available == 1
+
+    def test_slow_stage_does_not_stall_producer(self):
+        """Test a drop_oldest inbox keeps the producer running."""
+        gate = threading.Event()
+        inbox = BoundedQueue(1, DROP_OLDEST)
+        stage = Stage("slow", lambda x: gate.wait(), inbox)
+        stage.start()
+        try:
+            for i in range(100):
+                inbox.put(i)
+            assert inbox.stats()["dropped"] >= 98
+        finally:
+            gate.set()
+            stage.stop()
+
+
+class TestCameraSource:
+    """Tests for CameraSource and the end-to-end flow."""
+
+    @pytest.fixture
+    def camera(self):
+        camera = Camera("synthetic", threaded=True)
+        camera.open()
+        yield camera
+        camera.close()
+
+    def test_each_frame_once(self, camera):
+        """Test frames come out once, in order, each with its own reference."""
+        source = CameraSource(camera, timeout=1.0)
+        first = source()
+        second = source()
+        assert first is not None and second is not None
+        assert second.seq > first.seq
+        release_frame(first)
+        release_frame(second)
+
+    def test_reset_after_reopen(self, camera):
+        """Test sequence numbers starting over are picked up after reset()."""
+        source = CameraSource(camera, timeout=1.0)
+        for _ in range(3):
+            release_frame(source())
+        camera.open()
+        source.reset()
+        captured = source()
+        assert captured is not None and captured.seq <= 2
+        release_frame(captured)
+
+    def test_closed_camera(self):
+        """Test a closed camera yields nothing."""
+        assert CameraSource(Camera("synthetic"), timeout=0.01)() is None
+
+    def test_pipeline_returns_buffers(self, camera):
+        """Test frames flow through capture, analyse and present without leaks."""
+        analyse_q = BoundedQueue(1, on_drop=release_frame)
+        present_q = BoundedQueue(1, on_drop=release_frame)
+        control_q = BoundedQueue(2, on_drop=release_frame)
+        controlled = []
+
+        def analyse(captured):
+            return AnalysedFrame(captured, (0, 0, 10, 10))
+
+        def control(analysed):
+            controlled.append(analysed.captured.seq)
+            release_frame(analysed)
+
+        stages = [
+            Stage(
+                "capture",
+                CameraSource(camera),
+                outboxes=(analyse_q, present_q),
+                on_fanout=retain_frame,
+            ),
+            Stage("analyse", analyse, analyse_q, (control_q,)),
+            Stage("control", control, control_q),
+        ]
+        for stage in stages:
+            stage.start()
+        presented = 0
+        deadline = time.monotonic() + 2.0
+        while presented < 5 and time.monotonic() < deadline:
+            captured = present_q.get(timeout=0.1)
+            if captured is not None:
+                assert isinstance(captured.image, np.ndarray)
+                release_frame(captured)
+                presented += 1
+        for q in (analyse_q, present_q, control_q):
+            q.close()
+        for stage in stages:
+            stage.stop()
+
+        assert presented == 5
+        assert controlled == sorted(controlled) and controlled
+        assert all(stage.stats()["errors"] == 0 for stage in stages)
+        # Only the capture thread's slot, reader and in-flight read remain
+        pool = camera.pool
+        assert _wait_for(lambda: pool.available >= pool.allocated - 3)
@@ -0,0 +1,77 @@
+"""Tests for ui/preview.py"""
+
+import cv2
+import numpy as np
+import pytest
+
+from core.synthetic import SyntheticSource, bgr_to_yuyv
+from ui.preview import Preview
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (180, 320, 3), dtype=np.uint8)
+
+
+class TestConvert:
+    """Tests for Preview.convert texture conversion."""
+
+    def test_rgba_matches_reference(self, frame):
+        """Test RGBA output equals the astype/divide reference."""
+        preview = Preview(160, 90, texture_format="rgba")
+        resized = cv2.resize(frame, (160, 90))
+        expected = cv2.cvtColor(resized, cv2.COLOR_BGR2RGBA).astype(np.float32) / 255.0
+
+        np.testing.assert_allclose(preview.convert(frame), expected.ravel(), atol=1e-7)
+
+    def test_rgb_matches_reference(self, frame):
+        """Test RGB output equals the reference and is 3/4 the size."""
+        preview = Preview(160, 90, texture_format="rgb")
+        resized = cv2.resize(frame, (160, 90))
+        expected = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
+
+        texture = preview.convert(frame)
+        np.testing.assert_allclose(texture, expected.ravel(), atol=1e-7)
+        assert texture.size == 160 * 90 * 3
+
+    def test_reuses_texture_buffer(self, frame):
+        """Test every call writes into the same float32 buffer."""
+        preview = Preview(160, 90)
+        first = preview.convert(frame)
+        second = preview.convert(frame[::-1].copy())
+
+        assert first is second
+        assert first.dtype == np.float32
+
+    @pytest.mark.parametrize("texture_format", ["rgba", "rgb"])
+    def test_yuyv_matches_bgr(self, texture_format):
+        """Test a YUYV frame previews like its BGR conversion."""
+        bgr = SyntheticSource(640, 360, realtime=False).render(0)
+        yuyv = bgr_to_yuyv(bgr)
+        preview = Preview(320, 180, texture_format=texture_format)
+        expected = preview.convert(cv2.cvtColor(yuyv, cv2.COLOR_YUV2BGR_YUYV)).copy()
+
+        texture = preview.convert(yuyv)
+
+        assert texture.size == expected.size
+        assert np.abs(texture - expected).mean() < 4 / 255
+
+    def test_yuyv_cropped_view(self):
+        """Test a cropped YUYV view is converted without error."""
+        yuyv = bgr_to_yuyv(SyntheticSource(640, 360, realtime=False).render(0))
+        preview = Preview(160, 90)
+
+        texture = preview.convert(yuyv[40:220, 100:420])
+
+        assert texture.size == 160 * 90 * 4
+
+    def test_blank_matches_format(self):
+        """Test blank frame has the channel count of the texture format."""
+        rgba = Preview(16, 9, texture_format="rgba")._blank
+        rgb = Preview(16, 9, texture_format="rgb")._blank
+
+        assert rgba.size == 16 * 9 * 4
+        assert rgba[3] == 1.0
+        assert rgb.size == 16 * 9 * 3
+        assert not rgb.any()
@@ -0,0 +1,154 @@
+"""Tests for core/scheduler.py"""
+
+import time
+
+import numpy as np
+
+from core.detectors import _empty
+from core.scheduler import DetectionScheduler
+from core.synthetic import SyntheticSource
+from core.tracker import FaceTracker
+
+
+def run(scheduler, frames, elapsed_ms, frame_ms=0.0):
+    """Feed `frames` detection frames; return the last settings change."""
+    change = None
+    for _ in range(frames):
+        scheduler.frame_done(frame_ms)
+        change = scheduler.track_done(elapsed_ms, detected=True) or change
+    return change
+
+
+class SlowDetector:
+    """Finds nothing, slowly."""
+
+    name = "slow"
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.scale_factor = 1.1
+
+    def detect(self, image, min_size, max_size=None):
+        time.sleep(self.seconds)
+        return _empty()
+
+
+class TestDetectionScheduler:
+    """Tests for DetectionScheduler."""
+
+    def test_ladder_from_settings(self):
+        """Test level 0 is the configured quality and later levels are cheaper."""
+        scheduler = DetectionScheduler(33)
+        first = scheduler.configure(5, 640, 60)
+
+        assert first == (0, 5, 640, 1.1, 60)
+        for better, worse in zip(scheduler.levels, scheduler.levels[1:]):
+            assert worse.detect_interval >= better.detect_interval
+            assert worse.detect_width <= better.detect_width
+            assert worse.scale_factor >= better.scale_factor
+            assert worse.min_face >= better.min_face
+
+    def test_narrow_configured_width_kept(self):
+        """Test a configured width below a rung's cap is not raised."""
+        scheduler = DetectionScheduler(33)
+        scheduler.configure(5, 320, 60)
+
+        assert all(q.detect_width == 320 for q in scheduler.levels)
+
+    def test_steps_down_over_budget(self):
+        """Test sustained load over budget lowers quality."""
+        scheduler = DetectionScheduler(10)
+        scheduler.configure(5, 640, 60)
+
+        change = run(scheduler, 40, elapsed_ms=50)
+
+        assert change is not None
+        assert scheduler.level == 1
+        assert "over" in scheduler.stats["reason"]
+        assert scheduler.stats["detect_width"] == 480
+
+    def test_holds_after_change(self):
+        """Test no second step while averages settle."""
+        scheduler = DetectionScheduler(10)
+        scheduler.configure(5, 640, 60)
+        while scheduler.level == 0:
+            run(scheduler, 1, elapsed_ms=50)
+
+        run(scheduler, 30, elapsed_ms=50)
+
+        assert scheduler.level == 1
+
+    def test_bottoms_out(self):
+        """Test quality never drops past the last rung."""
+        scheduler = DetectionScheduler(10)
+        scheduler.configure(5, 640, 60)
+
+        run(scheduler, 1000, elapsed_ms=50)
+
+        assert scheduler.level == len(scheduler.levels) - 1
+
+    def test_restores_with_headroom(self):
+        """Test quality comes back once load drops."""
+        scheduler = DetectionScheduler(10)
+        scheduler.configure(5, 640, 60)
+        run(scheduler, 200, elapsed_ms=50)
+        low = scheduler.level
+
+        run(scheduler, 1000, elapsed_ms=1)
+
+        assert low > 0
+        assert scheduler.level == 0
+        assert scheduler.stats["changes"] >= 2 * low
+
+    def test_steady_within_budget(self):
+        """Test load between headroom and budget changes nothing."""
+        scheduler = DetectionScheduler(10)
+        scheduler.configure(5, 640, 60)
+
+        assert run(scheduler, 200, elapsed_ms=8) is None
+        assert scheduler.stats["reason"] == "within budget"
+
+    def test_frame_time_counts(self):
+        """Test slow frames lower quality even when detection is cheap."""
+        scheduler = DetectionScheduler(10)
+        scheduler.configure(5, 640, 60)
+
+        run(scheduler, 40, elapsed_ms=1, frame_ms=40)
+
+        assert scheduler.level == 1
+
+
+class TestTrackerIntegration:
+    """Tests for FaceTracker driven by a scheduler."""
+
+    def test_slow_detector_lowers_quality(self):
+        """Test the tracker applies the scheduler's settings."""
+        detector = SlowDetector(0.003)
+        tracker = FaceTracker(
+            detect_width=640,
+            detector=detector,
+            motion_threshold=0,
+            scheduler=DetectionScheduler(1),
+        )
+        frame = np.zeros((360, 640, 3), dtype=np.uint8)
+
+        for _ in range(45):
+            tracker.track(frame)
+
+        assert tracker.scheduler.level == 1
+        assert tracker.detect_width == 480
+        assert detector.scale_factor == 1.1
+
+    def test_width_change_drops_template(self):
+        """Test a new detection width forces a fresh full scan."""
+        source = SyntheticSource(1280, 720, realtime=False)
+        tracker = FaceTracker(scheduler=DetectionScheduler(33))
+        tracker.track(source.render(0))
+        assert tracker._template is not None
+
+        tracker.set_quality(tracker.scheduler.levels[3])
+
+        assert tracker._template is None
+        assert tracker.detect_width == 320
+        assert tracker.detector.scale_factor == 1.2
+        assert tracker.track(source.render(1)) is not None
@@ -0,0 +1,72 @@
+"""Tests for core/synthetic.py"""
+
+import time
+
+import cv2
+import numpy as np
+
+from core.synthetic import SyntheticSource
+
+
+class TestSyntheticSource:
+    """Tests for SyntheticSource class."""
+
+    def test_read_shape(self):
+        """Test frames match the configured size."""
+        source = SyntheticSource(320, 240, realtime=False)
+        ret, frame = source.read()
+
+        assert ret is True
+        assert frame.shape == (240, 320, 3)
+        assert frame.dtype == np.uint8
+
+    def test_set_resolution(self):
+        """Test CAP_PROP_FRAME_WIDTH/HEIGHT change the frame size."""
+        source = SyntheticSource(realtime=False)
+        source.set(cv2.CAP_PROP_FRAME_WIDTH, 160)
+        source.set(cv2.CAP_PROP_FRAME_HEIGHT, 120)
+
+        assert source.read()[1].shape == (120, 160, 3)
+        assert source.get(cv2.CAP_PROP_FRAME_WIDTH) == 160
+
+    def test_read_into_buffer(self):
+        """Test read(image=...) renders into the caller's buffer."""
+        source = SyntheticSource(realtime=False)
+        buffer = np.zeros((source.height, source.width, 3), dtype=np.uint8)
+        _, frame = source.read(image=buffer)
+
+        assert frame is buffer
+        assert buffer.any()
+
+    def test_yuyv_output(self):
+        """Test CAP_PROP_CONVERT_RGB 0 switches to YUYV frames."""
+        source = SyntheticSource(320, 240, realtime=False)
+        assert source.set(cv2.CAP_PROP_CONVERT_RGB, 0) is True
+        buffer = np.empty((240, 320, 2), dtype=np.uint8)
+        _, frame = source.read(image=buffer)
+
+        assert frame is buffer
+        gray = cv2.cvtColor(source.render(0), cv2.COLOR_BGR2GRAY)
+        assert np.abs(frame[:, :, 0].astype(int) - gray).max() <= 2
+
+    def test_face_moves(self):
+        """Test the face position changes between frames."""
+        source = SyntheticSource(realtime=False)
+        assert source.face_box(0) != source.face_box(30)
+
+    def test_realtime_pacing(self):
+        """Test realtime mode limits reads to the frame rate."""
+        source = SyntheticSource(fps=100)
+        start = time.monotonic()
+        for _ in range(6):
+            source.read()
+
+        assert time.monotonic() - start >= 0.045
+
+    def test_release(self):
+        """Test reads fail after release."""
+        source = SyntheticSource(realtime=False)
+        source.release()
+
+        assert source.isOpened() is False
+        assert source.read() == (False, None)
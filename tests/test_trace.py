@@ -0,0 +1,140 @@
+"""Tests for utils/trace.py"""
+
+import json
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from core.pipeline import BoundedQueue, Stage
+from utils.metrics import Metrics
+from utils.trace import TRACER, Tracer
+
+
+@pytest.fixture
+def tracer():
+    """The global tracer, recording for one test."""
+    TRACER.clear()
+    TRACER.start()
+    yield TRACER
+    TRACER.stop()
+    TRACER.clear()
+
+
+class TestTracer:
+    """Tests for Tracer."""
+
+    def test_disabled_by_default(self):
+        """Test a disabled tracer allocates no buffer."""
+        tracer = Tracer(16)
+        assert not tracer.enabled
+        assert tracer.events() == []
+
+    def test_records_spans(self):
+        """Test spans become complete events in microseconds."""
+        tracer = Tracer(16, enabled=True)
+        start = time.perf_counter()
+        tracer.add("step", start, start + 0.002, {"control": "pan_absolute"})
+        (event,) = [e for e in tracer.events() if e["ph"] == "X"]
+        assert event["name"] == "step"
+        assert event["dur"] == pytest.approx(2000)
+        assert event["tid"] == threading.get_native_id()
+        assert event["args"] == {"control": "pan_absolute"}
+
+    def test_ring_keeps_newest(self):
+        """Test a full buffer overwrites the oldest spans."""
+        tracer = Tracer(4, enabled=True)
+        for i in range(10):
+            tracer.add(f"s{i}", float(i), float(i) + 0.5)
+        names = [e["name"] for e in tracer.events() if e["ph"] == "X"]
+        assert names == ["s6", "s7", "s8", "s9"]
+
+    def test_thread_names(self):
+        """Test threads that recorded spans are named in metadata events."""
+        tracer = Tracer(16, enabled=True)
+        thread = threading.Thread(
+            target=lambda: tracer.add("worker", 0.0, 0.001), name="analyse-0"
+        )
+        thread.start()
+        thread.join()
+        # Named even though the thread has exited
+        meta = [e for e in tracer.events() if e["ph"] == "M"]
+        assert meta[0]["args"] == {"name": "analyse-0"}
+
+    def test_dump_writes_chrome_json(self, tmp_path):
+        """Test the dump is loadable Chrome Trace Event JSON."""
+        tracer = Tracer(16, enabled=True)
+        tracer.add("step", 1.0, 1.5)
+        path = tracer.dump(tmp_path / "trace.json")
+        data = json.loads(path.read_text())
+        assert data["traceEvents"][0]["name"] == "step"
+
+    def test_clear(self):
+        """Test clear drops recorded spans."""
+        tracer = Tracer(16, enabled=True)
+        tracer.add("step", 1.0, 1.5)
+        tracer.clear()
+        assert tracer.events() == []
+
+    def test_signal_dumps(self, tmp_path, monkeypatch, tracer):
+        """Test SIGUSR1 writes a trace under the cache directory."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        previous = signal.getsignal(signal.SIGUSR1)
+        tracer.install_signal()
+        try:
+            tracer.add("step", 1.0, 1.5)
+            os.kill(os.getpid(), signal.SIGUSR1)
+            trace_dir = tmp_path / ".cache" / "meet2ui" / "traces"
+            deadline = time.monotonic() + 2.0
+            while time.monotonic() < deadline and not list(trace_dir.glob("*.json")):
+                time.sleep(0.01)
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+        assert list(trace_dir.glob("trace-*.json"))
+
+
+class TestTraceHooks:
+    """Tests for spans from metrics timers and pipeline stages."""
+
+    def test_timed_records_span_with_args(self, tracer):
+        """Test metric timers add spans with their trace args."""
+        metrics = Metrics(16)
+        step = metrics.timed("v4l2.set", lambda control, value: {control: value})(
+            lambda control, value: True
+        )
+        step("zoom_absolute", 200)
+        (event,) = [e for e in tracer.events() if e["ph"] == "X"]
+        assert event["name"] == "v4l2.set"
+        assert event["args"] == {"zoom_absolute": 200}
+
+    def test_timed_traces_with_metrics_disabled(self, tracer):
+        """Test metric timers still add spans while metrics are off."""
+        metrics = Metrics(16, enabled=False)
+        metrics.timed("step")(lambda: None)()
+        assert [e["name"] for e in tracer.events() if e["ph"] == "X"] == ["step"]
+        assert metrics.summary() == {}
+
+    def test_timed_without_tracer(self):
+        """Test metric timers add nothing while tracing is off."""
+        TRACER.clear()
+        Metrics(16).timed("step")(lambda: None)()
+        assert TRACER.recorded == 0
+
+    def test_stage_records_spans(self, tracer):
+        """Test each stage call is a span on the stage's thread."""
+        inbox = BoundedQueue(4, "block")
+        stage = Stage("analyse", lambda x: x, inbox)
+        stage.start()
+        try:
+            inbox.put(1)
+            deadline = time.monotonic() + 1.0
+            while not tracer.recorded and time.monotonic() < deadline:
+                time.sleep(0.001)
+        finally:
+            stage.stop()
+        events = tracer.events()
+        span = next(e for e in events if e["ph"] == "X")
+        assert span["name"] == "analyse"
+        assert span["tid"] != threading.get_native_id()
@@ -2,8 +2,11 @@
 
 from unittest.mock import patch
 
+import cv2
 import numpy as np
+import pytest
 
+from core.synthetic import SyntheticSource, bgr_to_yuyv
 from core.tracker import FaceTracker
 
 
@@ -17,7 +20,7 @@ class TestFaceTracker:
         assert tracker.enabled is False
         assert tracker.last_face is None
         assert tracker.smoothed_offset == (0.0, 0.0)
-        assert tracker.cascade is not None
+        assert tracker.detector.name == "haar"
 
     def test_reset(self):
         """Test reset clears state."""
@@ -107,7 +110,7 @@ class TestFaceTracker:
 
         assert result is None
 
-    @patch.object(FaceTracker, "detect")
+    @patch.object(FaceTracker, "track")
     def test_get_pan_tilt_delta_with_face(self, mock_detect):
         """Test pan/tilt calculation with detected face."""
         tracker = FaceTracker()
@@ -175,3 +178,287 @@ class TestFaceTracker:
         # Each successive call should get closer to the true offset
         # (smoothing should cause gradual approach)
         assert abs(offset3[0]) >= abs(offset2[0]) or abs(offset2[0] - offset3[0]) < 0.01
+
+
+class TestDownscaledDetection:
+    """Tests for detection on a downscaled frame."""
+
+    @staticmethod
+    def _iou(a, b):
+        ax, ay, aw, ah = a
+        bx, by, bw, bh = b
+        w = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+        h = max(0, min(ay + ah, by + bh) - max(ay, by))
+        return w * h / (aw * ah + bw * bh - w * h)
+
+    def test_boxes_in_full_frame_coordinates(self):
+        """Test boxes found at low resolution map back onto the face."""
+        source = SyntheticSource(1280, 720, realtime=False)
+        tracker = FaceTracker(detect_width=320)
+
+        for index in (0, 10, 20):
+            face = tracker.detect(source.render(index))
+            assert face is not None
+            assert self._iou(face, source.face_box(index)) > 0.5
+
+    def test_matches_full_resolution(self):
+        """Test downscaled and full-resolution detection agree."""
+        frame = SyntheticSource(1280, 720, realtime=False).render(5)
+
+        full = FaceTracker(detect_width=0).detect(frame)
+        small = FaceTracker(detect_width=480).detect(frame)
+
+        assert self._iou(full, small) > 0.7
+
+    def test_narrow_frame_not_resized(self, sample_frame):
+        """Test frames already under detect_width are used as-is."""
+        tracker = FaceTracker(detect_width=640)
+        tracker.detect(sample_frame)
+
+        assert tracker._small is None
+
+    def test_reuses_small_buffer(self):
+        """Test the downscale buffer is allocated once per frame size."""
+        source = SyntheticSource(1280, 720, realtime=False)
+        tracker = FaceTracker(detect_width=320)
+        tracker.detect(source.render(0))
+        buffer = tracker._small
+        tracker.detect(source.render(1))
+
+        assert tracker._small is buffer
+        assert buffer.shape == (180, 320)
+
+
+class TestHybridTracking:
+    """Tests for track(): periodic detection with template matching between."""
+
+    @staticmethod
+    def _center_error(face, truth):
+        return max(
+            abs((face[0] + face[2] / 2) - (truth[0] + truth[2] / 2)),
+            abs((face[1] + face[3] / 2) - (truth[1] + truth[3] / 2)),
+        )
+
+    @pytest.mark.parametrize("interval", [5, 30])
+    def test_drift_bounded_on_moving_face(self, interval):
+        """Test the tracked box stays on the moving face between detections."""
+        source = SyntheticSource(1280, 720, realtime=False)
+        tracker = FaceTracker(detect_interval=interval)
+        size = source.face_box(0)[2]
+
+        for index in range(120):
+            face = tracker.track(source.render(index))
+            assert face is not None
+            assert self._center_error(face, source.face_box(index)) < size * 0.15
+
+    def test_detects_every_interval(self):
+        """Test the cascade runs once per interval while the match holds."""
+        source = SyntheticSource(1280, 720, realtime=False)
+        tracker = FaceTracker(detect_interval=5)
+
+        for index in range(50):
+            tracker.track(source.render(index))
+
+        assert tracker.stats["detections"] == 10
+        assert tracker.stats["matches"] == 40
+        assert tracker.stats["lost"] == 0
+
+    def test_interval_one_always_detects(self):
+        """Test detect_interval=1 never uses template matching."""
+        source = SyntheticSource(640, 360, realtime=False)
+        tracker = FaceTracker(detect_interval=1)
+
+        for index in range(5):
+            tracker.track(source.render(index))
+
+        assert tracker.stats["detections"] == 5
+        assert tracker.stats["matches"] == 0
+
+    def test_redetects_when_match_lost(self):
+        """Test a jump out of the search window triggers detection."""
+        source = SyntheticSource(1280, 720, realtime=False)
+        tracker = FaceTracker(detect_interval=30)
+        tracker.track(source.render(0))
+
+        face = tracker.track(source.render(40))
+
+        assert tracker.stats["lost"] == 1
+        assert tracker.stats["detections"] == 2
+        assert self._center_error(face, source.face_box(40)) < 30
+
+    def test_no_face_clears_template(self, sample_frame):
+        """Test a frame without a face drops the template."""
+        source = SyntheticSource(640, 480, realtime=False)
+        tracker = FaceTracker()
+        tracker.track(source.render(0))
+
+        assert tracker.track(sample_frame) is None
+        assert tracker._template is None
+
+    def test_reset_clears_template(self):
+        """Test reset forces detection on the next frame."""
+        source = SyntheticSource(640, 360, realtime=False)
+        tracker = FaceTracker()
+        tracker.track(source.render(0))
+
+        tracker.reset()
+        tracker.track(source.render(1))
+
+        assert tracker.stats["detections"] == 2
+
+
+class TestRoiDetection:
+    """Tests for re-detection around the last known face."""
+
+    def test_roi_hits_after_first_scan(self):
+        """Test only the first frame needs a full-frame scan."""
+        source = SyntheticSource(1280, 720, realtime=False)
+        tracker = FaceTracker(roi_misses=3)
+
+        for index in range(10):
+            face = tracker.detect(source.render(index))
+            truth = source.face_box(index)
+            assert abs(face[0] - truth[0]) < truth[2] * 0.2
+
+        assert tracker.stats["full_scans"] == 1
+        assert tracker.stats["roi_hits"] == 9
+
+    def test_full_scan_after_misses(self, sample_frame):
+        """Test a full-frame scan happens on the K-th consecutive miss."""
+        source = SyntheticSource(640, 480, realtime=False)
+        tracker = FaceTracker(roi_misses=3)
+        tracker.detect(source.render(0))
+
+        tracker.detect(sample_frame)
+        tracker.detect(sample_frame)
+        assert tracker.stats["full_scans"] == 1
+
+        tracker.detect(sample_frame)
+        assert tracker.stats["full_scans"] == 2
+
+    def test_finds_face_that_jumped(self):
+        """Test a face outside the ROI is found by the fallback scan."""
+        source = SyntheticSource(1280, 720, realtime=False)
+        tracker = FaceTracker(roi_misses=2)
+        tracker.detect(source.render(0))
+        far = source.render(60)
+
+        assert tracker.detect(far) is None
+        face = tracker.detect(far)
+        assert face is not None
+        assert abs(face[0] - source.face_box(60)[0]) < 50
+
+    def test_disabled(self):
+        """Test roi_misses=0 scans the full frame every time."""
+        source = SyntheticSource(640, 360, realtime=False)
+        tracker = FaceTracker(roi_misses=0)
+
+        for index in range(3):
+            tracker.detect(source.render(index))
+
+        assert tracker.stats["full_scans"] == 3
+        assert tracker.stats["roi_hits"] == 0
+
+    def test_reset_forces_full_scan(self):
+        """Test reset forgets the ROI."""
+        source = SyntheticSource(640, 360, realtime=False)
+        tracker = FaceTracker(roi_misses=3)
+        tracker.detect(source.render(0))
+
+        tracker.reset()
+        tracker.detect(source.render(1))
+
+        assert tracker.stats["full_scans"] == 2
+
+
+class TestMotionGating:
+    """Tests for skipping track() work on static frames."""
+
+    def test_static_frames_skip_detection(self):
+        """Test an unchanged frame reuses the last result."""
+        frame = SyntheticSource(640, 360, realtime=False).render(0)
+        tracker = FaceTracker(detect_interval=1)
+        face = tracker.track(frame)
+
+        for _ in range(5):
+            assert tracker.track(frame) == face
+
+        assert tracker.stats["detections"] == 1
+        assert tracker.stats["motion_skips"] == 5
+        assert tracker.stats["skip_rate"] == 5 / 6
+
+    def test_motion_runs_tracking(self):
+        """Test a moving face is tracked on every frame."""
+        source = SyntheticSource(640, 360, realtime=False)
+        tracker = FaceTracker()
+
+        for index in range(0, 30, 3):
+            tracker.track(source.render(index))
+
+        assert tracker.stats["motion_skips"] == 0
+
+    def test_static_no_face(self, sample_frame):
+        """Test a static frame without a face keeps returning None."""
+        tracker = FaceTracker()
+        tracker.track(sample_frame)
+
+        assert tracker.track(sample_frame) is None
+        assert tracker.stats["motion_skips"] == 1
+
+    def test_saved_time_reported(self):
+        """Test skipped frames add to the saved-time estimate."""
+        frame = SyntheticSource(640, 360, realtime=False).render(0)
+        tracker = FaceTracker()
+        tracker.track(frame)
+        tracker.track(frame)
+
+        assert tracker.stats["saved_ms"] > 0
+
+    def test_disabled(self):
+        """Test motion_threshold 0 never skips."""
+        frame = SyntheticSource(640, 360, realtime=False).render(0)
+        tracker = FaceTracker(detect_interval=1, motion_threshold=0)
+
+        for _ in range(3):
+            tracker.track(frame)
+
+        assert tracker.motion is None
+        assert tracker.stats["detections"] == 3
+
+    def test_reset_clears_result(self):
+        """Test a static frame after reset is tracked again."""
+        frame = SyntheticSource(640, 360, realtime=False).render(0)
+        tracker = FaceTracker()
+        tracker.track(frame)
+
+        tracker.reset()
+        tracker.track(frame)
+
+        assert tracker.stats["detections"] == 2
+
+
+class TestYuyvInput:
+    """Tests for tracking on raw YUYV frames."""
+
+    def test_detects_on_luma(self):
+        """Test YUYV and BGR frames give the same face."""
+        frame = SyntheticSource(1280, 720, realtime=False).render(5)
+        yuyv = bgr_to_yuyv(frame)
+
+        bgr_face = FaceTracker().detect(frame)
+        yuyv_face = FaceTracker().detect(yuyv)
+
+        assert yuyv_face is not None
+        assert TestDownscaledDetection._iou(bgr_face, yuyv_face) > 0.8
+
+    def test_overlay_is_green(self):
+        """Test the overlay colour survives YUYV to BGR conversion."""
+        tracker = FaceTracker()
+        tracker.enabled = True
+        tracker.last_face = (100, 100, 80, 80)
+        yuyv = np.full((360, 640, 2), 128, dtype=np.uint8)
+
+        tracker.draw_overlay(yuyv)
+        b, g, r = cv2.cvtColor(yuyv, cv2.COLOR_YUV2BGR_YUYV)[140, 100]
+
+        assert g > 200 and b < 60 and r < 60
@@ -3,7 +3,24 @@
 import subprocess
 from unittest.mock import MagicMock, patch
 
-from core.v4l2 import V4L2Control
+import pytest
+
+from core.v4l2 import SubprocessBackend, V4L2Control, create_backend
+from core.v4l2_ioctl import (
+    VIDIOC_G_EXT_CTRLS,
+    VIDIOC_QUERYCTRL,
+    VIDIOC_S_CTRL,
+    VIDIOC_S_EXT_CTRLS,
+    FakeV4L2Device,
+    IoctlBackend,
+)
+from utils.constants import CONTROLS
+
+
+@pytest.fixture(autouse=True)
+def subprocess_backend(monkeypatch):
+    """Pin the default backend so these tests don't touch a real camera."""
+    monkeypatch.setattr("core.v4l2.V4L2_BACKEND", "subprocess")
 
 
 class TestV4L2Control:
@@ -75,6 +92,48 @@ class TestV4L2Control:
 
         assert result is None
 
+    @patch("subprocess.run")
+    def test_get_many_single_invocation(self, mock_run):
+        """Test get_many reads all controls with one v4l2-ctl call."""
+        mock_run.return_value = MagicMock(
+            returncode=0, stdout="brightness: 75\npan_absolute: -36000\n"
+        )
+        ctrl = V4L2Control()
+        result = ctrl.get_many(["brightness", "pan_absolute"])
+
+        assert result == {"brightness": 75, "pan_absolute": -36000}
+        mock_run.assert_called_once()
+        args = mock_run.call_args[0][0]
+        assert "brightness,pan_absolute" in args
+
+    @patch("subprocess.run")
+    def test_get_many_partial_output(self, mock_run):
+        """Test controls v4l2-ctl couldn't read are left out."""
+        mock_run.return_value = MagicMock(returncode=1, stdout="brightness: 75\n")
+        ctrl = V4L2Control()
+        result = ctrl.get_many(["brightness", "bogus"])
+
+        assert result == {"brightness": 75}
+
+    @patch("subprocess.run")
+    def test_get_many_command_not_found(self, mock_run):
+        """Test get_many without v4l2-ctl returns nothing."""
+        mock_run.side_effect = FileNotFoundError()
+        ctrl = V4L2Control()
+
+        assert ctrl.get_many(["brightness"]) == {}
+
+    @patch("subprocess.run")
+    def test_snapshot_reads_all_controls(self, mock_run):
+        """Test snapshot requests every known control in one call."""
+        mock_run.return_value = MagicMock(returncode=0, stdout="")
+        ctrl = V4L2Control()
+        ctrl.snapshot()
+
+        mock_run.assert_called_once()
+        requested = mock_run.call_args[0][0][-1].split(",")
+        assert set(requested) == set(CONTROLS)
+
     @patch("subprocess.run")
     def test_set_success(self, mock_run):
         """Test successful set control."""
@@ -106,6 +165,49 @@ class TestV4L2Control:
 
         assert result is False
 
+    @patch("subprocess.run")
+    def test_set_many_single_invocation(self, mock_run):
+        """Test set_many applies all controls with one v4l2-ctl call."""
+        mock_run.return_value = MagicMock(returncode=0)
+        ctrl = V4L2Control()
+        result = ctrl.set_many({"brightness": 80, "contrast": 40})
+
+        assert result == {"brightness": True, "contrast": True}
+        mock_run.assert_called_once()
+        args = mock_run.call_args[0][0]
+        assert "brightness=80,contrast=40" in args
+
+    @patch("subprocess.run")
+    def test_set_many_failure_reports_per_control(self, mock_run):
+        """Test a rejected batch is retried per control for exact status."""
+
+        def run(args, **kwargs):
+            return MagicMock(returncode=1 if "contrast" in args[-1] else 0)
+
+        mock_run.side_effect = run
+        ctrl = V4L2Control()
+        result = ctrl.set_many({"brightness": 80, "contrast": 40})
+
+        assert result == {"brightness": True, "contrast": False}
+        assert mock_run.call_count == 3
+
+    @patch("subprocess.run")
+    def test_set_many_timeout(self, mock_run):
+        """Test set_many timeout fails every control without retrying."""
+        mock_run.side_effect = subprocess.TimeoutExpired("v4l2-ctl", 2)
+        ctrl = V4L2Control()
+        result = ctrl.set_many({"brightness": 80, "contrast": 40})
+
+        assert result == {"brightness": False, "contrast": False}
+        mock_run.assert_called_once()
+
+    @patch("subprocess.run")
+    def test_set_many_empty(self, mock_run):
+        """Test empty set_many doesn't spawn v4l2-ctl."""
+        ctrl = V4L2Control()
+        assert ctrl.set_many({}) == {}
+        mock_run.assert_not_called()
+
     @patch("subprocess.run")
     def test_list_controls(self, mock_run):
         """Test listing available controls."""
@@ -132,3 +234,137 @@ class TestV4L2Control:
         controls = ctrl.list_controls()
 
         assert controls == {}
+
+
+class TestCreateBackend:
+    """Tests for backend selection."""
+
+    def test_subprocess(self):
+        """Test explicit subprocess backend."""
+        backend = create_backend("subprocess", "/dev/video0")
+        assert isinstance(backend, SubprocessBackend)
+
+    def test_ioctl_with_fake_device(self):
+        """Test ioctl backend over an injected device."""
+        backend = create_backend("ioctl", "/dev/video0", FakeV4L2Device())
+        assert isinstance(backend, IoctlBackend)
+
+    def test_auto_falls_back_to_subprocess(self, tmp_path):
+        """Test auto picks v4l2-ctl when the node can't be opened."""
+        backend = create_backend("auto", str(tmp_path / "video99"))
+        assert isinstance(backend, SubprocessBackend)
+
+    def test_unknown_backend(self):
+        """Test unknown backend name is rejected."""
+        with pytest.raises(ValueError):
+            create_backend("bogus", "/dev/video0")
+
+    def test_set_device_reopens_backend(self):
+        """Test set_device closes the old fd and opens the new device."""
+        fake = FakeV4L2Device()
+        ctrl = V4L2Control("/dev/video0", backend="ioctl", io=fake)
+        old_fd = ctrl.backend.fd
+
+        ctrl.set_device("/dev/video2")
+
+        assert old_fd not in fake.open_fds
+        assert ctrl.backend.device == "/dev/video2"
+        assert ctrl.set("brightness", 70) is True
+
+    def test_snapshot_one_round_trip(self):
+        """Test snapshot on the ioctl backend costs exactly one ioctl."""
+        fake = FakeV4L2Device()
+        ctrl = V4L2Control("/dev/video0", backend="ioctl", io=fake)
+        fake.calls.clear()
+
+        values = ctrl.snapshot()
+
+        assert values == {name: c[2] for name, c in CONTROLS.items()}
+        assert fake.calls[VIDIOC_G_EXT_CTRLS] == 1
+        assert sum(fake.calls.values()) == 1
+        assert VIDIOC_QUERYCTRL not in fake.calls
+
+
+class TestControlCache:
+    """Tests for the V4L2Control write-through cache."""
+
+    @pytest.fixture
+    def fake(self):
+        return FakeV4L2Device()
+
+    @pytest.fixture
+    def ctrl(self, fake):
+        return V4L2Control("/dev/video0", backend="ioctl", io=fake)
+
+    def test_repeated_set_skipped(self, ctrl, fake):
+        """Test writing the same value twice only reaches the device once."""
+        assert ctrl.set("pan_absolute", 3600) is True
+        assert ctrl.set("pan_absolute", 3600) is True
+
+        assert fake.calls[VIDIOC_S_CTRL] == 1
+        assert ctrl.cache_stats() == {"hits": 1, "misses": 1}
+
+    def test_changed_value_written(self, ctrl, fake):
+        """Test a different value is always written."""
+        ctrl.set("pan_absolute", 3600)
+        ctrl.set("pan_absolute", 7200)
+
+        assert fake.calls[VIDIOC_S_CTRL] == 2
+        assert fake.value("pan_absolute") == 7200
+
+    def test_read_populates_cache(self, ctrl, fake):
+        """Test values read from the device suppress redundant writes."""
+        ctrl.snapshot()
+        ctrl.set("brightness", CONTROLS["brightness"][2])
+
+        assert fake.calls[VIDIOC_S_CTRL] == 0
+        assert ctrl.cache_hits == 1
+
+    def test_failed_write_invalidates(self, ctrl, fake):
+        """Test a failed write forgets the cached value."""
+        ctrl.set("brightness", 70)
+        assert ctrl.set("brightness", 500) is False
+
+        ctrl.set("brightness", 70)
+
+        assert fake.calls[VIDIOC_S_CTRL] == 3
+
+    def test_set_device_invalidates(self, ctrl, fake):
+        """Test switching device never trusts the old device's values."""
+        ctrl.set("brightness", 70)
+        ctrl.set_device("/dev/video2")
+        ctrl.set("brightness", 70)
+
+        assert fake.calls[VIDIOC_S_CTRL] == 2
+
+    def test_invalidate_single_control(self, ctrl, fake):
+        """Test invalidating one control keeps the others cached."""
+        ctrl.set("brightness", 70)
+        ctrl.set("contrast", 30)
+        ctrl.invalidate("brightness")
+
+        ctrl.set("brightness", 70)
+        ctrl.set("contrast", 30)
+
+        assert fake.calls[VIDIOC_S_CTRL] == 3
+
+    def test_set_many_skips_cached(self, ctrl, fake):
+        """Test set_many only sends controls that would change."""
+        ctrl.set_many({"brightness": 70, "contrast": 30})
+        fake.calls.clear()
+
+        result = ctrl.set_many({"brightness": 70, "contrast": 31})
+
+        assert result == {"brightness": True, "contrast": True}
+        assert fake.value("contrast") == 31
+        assert fake.calls[VIDIOC_S_EXT_CTRLS] == 1
+        assert ctrl.cache_hits == 1
+
+    def test_set_many_all_cached_no_round_trip(self, ctrl, fake):
+        """Test reloading an applied preset costs no device access."""
+        preset = {"brightness": 70, "contrast": 30}
+        ctrl.set_many(preset)
+        fake.calls.clear()
+
+        assert ctrl.set_many(preset) == {"brightness": True, "contrast": True}
+        assert sum(fake.calls.values()) == 0
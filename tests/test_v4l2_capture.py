@@ -0,0 +1,159 @@
+"""Tests for core/v4l2_capture.py"""
+
+import ctypes
+
+import cv2
+import numpy as np
+import pytest
+
+from core.synthetic import SyntheticSource, bgr_to_yuyv
+from core.v4l2_capture import (
+    VIDIOC_DQBUF,
+    VIDIOC_QBUF,
+    VIDIOC_REQBUFS,
+    VIDIOC_S_FMT,
+    VIDIOC_STREAMON,
+    FakeStreamingDevice,
+    MmapCapture,
+    fourcc,
+    v4l2_buffer,
+    v4l2_format,
+    v4l2_requestbuffers,
+)
+
+
+@pytest.fixture
+def device():
+    """Simulated streaming device."""
+    return FakeStreamingDevice()
+
+
+@pytest.fixture
+def capture(device):
+    """Streaming capture opened on the simulated device."""
+    cap = MmapCapture("/dev/video0", 640, 360, io=device)
+    yield cap
+    cap.release()
+
+
+class TestStructs:
+    """Tests for ioctl struct layout and request codes."""
+
+    def test_struct_sizes(self):
+        """Test structs match the kernel ABI sizes."""
+        assert ctypes.sizeof(v4l2_format) == 208
+        assert ctypes.sizeof(v4l2_requestbuffers) == 20
+        assert ctypes.sizeof(v4l2_buffer) == 88
+
+    def test_request_codes(self):
+        """Test request codes match videodev2.h."""
+        assert VIDIOC_S_FMT == 0xC0D05605
+        assert VIDIOC_REQBUFS == 0xC0145608
+        assert VIDIOC_QBUF == 0xC058560F
+        assert VIDIOC_DQBUF == 0xC0585611
+        assert VIDIOC_STREAMON == 0x40045612
+
+    def test_fourcc(self):
+        """Test fourcc packs characters little-endian."""
+        assert fourcc("YUYV") == 0x56595559
+
+
+class TestMmapCapture:
+    """Tests for MmapCapture against the simulated buffer queue."""
+
+    def test_open_starts_streaming(self, capture, device):
+        """Test open negotiates format, queues all buffers and streams."""
+        assert capture.isOpened() is True
+        assert device.streaming is True
+        assert len(device.queued) == 4
+        assert device.calls[VIDIOC_S_FMT] == 1
+
+    def test_dequeue_is_zero_copy(self, capture, device):
+        """Test dequeued data is a view on the mapped buffer."""
+        frame = capture.dequeue()
+
+        assert frame.data.shape == (360, 640, 2)
+        assert np.shares_memory(frame.data, np.frombuffer(device.buffers[frame.index]))
+        assert frame.index not in device.queued
+
+    def test_requeue_returns_buffer(self, capture, device):
+        """Test a released buffer goes back to the driver queue."""
+        frame = capture.dequeue()
+        capture.requeue(frame)
+
+        assert device.queued[-1] == frame.index
+
+    def test_dequeue_empty_queue(self, capture):
+        """Test dequeue returns None once every buffer is held."""
+        held = [capture.dequeue() for _ in range(4)]
+
+        assert all(frame is not None for frame in held)
+        assert capture.dequeue(timeout=0) is None
+
+    def test_sequence_numbers(self, capture):
+        """Test frames carry the driver sequence number."""
+        first = capture.dequeue()
+        capture.requeue(first)
+        second = capture.dequeue()
+
+        assert second.sequence == first.sequence + 1
+
+    def test_read_converts_to_bgr(self, capture, device):
+        """Test read returns BGR and re-queues the buffer."""
+        ret, frame = capture.read()
+
+        assert ret is True
+        assert frame.shape == (360, 640, 3)
+        assert len(device.queued) == 4
+
+    def test_read_into_buffer(self, capture):
+        """Test read converts straight into a caller buffer."""
+        image = np.empty((360, 640, 3), dtype=np.uint8)
+        _, frame = capture.read(image=image)
+
+        assert frame is image
+
+    def test_read_raw_yuyv(self, capture):
+        """Test read copies YUYV out unconverted with CONVERT_RGB off."""
+        assert capture.set(cv2.CAP_PROP_CONVERT_RGB, 0) is True
+        image = np.empty((360, 640, 2), dtype=np.uint8)
+        _, frame = capture.read(image=image)
+
+        assert frame is image
+        expected = bgr_to_yuyv(SyntheticSource(640, 360, realtime=False).render(0))
+        np.testing.assert_array_equal(frame, expected)
+
+    def test_grey_format(self, device):
+        """Test GREY buffers are exposed as (h, w) views."""
+        cap = MmapCapture("/dev/video0", 320, 240, "GREY", io=device)
+        frame = cap.dequeue()
+
+        assert frame.data.shape == (240, 320)
+        cap.requeue(frame)
+        assert cap.read()[1].shape == (240, 320, 3)
+        cap.release()
+
+    def test_mjpg_format(self, device):
+        """Test MJPG buffers are trimmed to bytesused and decoded."""
+        cap = MmapCapture("/dev/video0", 320, 240, "MJPG", io=device)
+        frame = cap.dequeue()
+
+        assert frame.data.ndim == 1
+        assert frame.data.size < device.sizeimage
+        cap.requeue(frame)
+        assert cap.read()[1].shape == (240, 320, 3)
+        cap.release()
+
+    def test_release(self, capture, device):
+        """Test release stops streaming and closes the fd."""
+        capture.release()
+
+        assert device.streaming is False
+        assert device.open_fds == set()
+        assert capture.isOpened() is False
+        assert capture.read() == (False, None)
+
+    def test_open_failure(self, tmp_path):
+        """Test a missing node leaves the capture closed."""
+        cap = MmapCapture(str(tmp_path / "video99"))
+        assert cap.isOpened() is False
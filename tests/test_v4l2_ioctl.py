@@ -0,0 +1,142 @@
+"""Tests for core/v4l2_ioctl.py"""
+
+import ctypes
+
+import pytest
+
+from core.v4l2_ioctl import (
+    VIDIOC_G_CTRL,
+    VIDIOC_G_EXT_CTRLS,
+    VIDIOC_QUERYCTRL,
+    VIDIOC_S_CTRL,
+    VIDIOC_S_EXT_CTRLS,
+    FakeV4L2Device,
+    IoctlBackend,
+    control_name,
+    v4l2_control,
+    v4l2_ext_control,
+    v4l2_ext_controls,
+    v4l2_queryctrl,
+)
+from utils.constants import CONTROLS
+
+
+@pytest.fixture
+def fake_device():
+    """In-memory V4L2 device with the app's controls."""
+    return FakeV4L2Device()
+
+
+@pytest.fixture
+def backend(fake_device):
+    """Ioctl backend opened on the fake device."""
+    return IoctlBackend("/dev/video0", io=fake_device)
+
+
+class TestStructs:
+    """Tests for ioctl struct layout and request codes."""
+
+    def test_struct_sizes(self):
+        """Test structs match the kernel ABI sizes."""
+        assert ctypes.sizeof(v4l2_control) == 8
+        assert ctypes.sizeof(v4l2_queryctrl) == 68
+        assert ctypes.sizeof(v4l2_ext_control) == 20
+        assert ctypes.sizeof(v4l2_ext_controls) == 32
+
+    def test_request_codes(self):
+        """Test request codes match videodev2.h."""
+        assert VIDIOC_G_CTRL == 0xC008561B
+        assert VIDIOC_S_CTRL == 0xC008561C
+        assert VIDIOC_QUERYCTRL == 0xC0445624
+        assert VIDIOC_S_EXT_CTRLS == 0xC0205648
+
+
+class TestControlName:
+    """Tests for control_name function."""
+
+    def test_driver_labels(self):
+        """Test driver labels map to v4l2-ctl names."""
+        assert control_name("Zoom, Absolute") == "zoom_absolute"
+        assert control_name("Focus, Automatic Continuous") == (
+            "focus_automatic_continuous"
+        )
+        assert control_name("Brightness") == "brightness"
+
+
+class TestIoctlBackend:
+    """Tests for IoctlBackend against the fake device."""
+
+    def test_enumerates_controls(self, backend):
+        """Test QUERYCTRL enumeration finds every control."""
+        assert set(backend.controls) == set(CONTROLS)
+
+    def test_list_controls(self, backend):
+        """Test list_controls returns (min, max, default)."""
+        controls = backend.list_controls()
+        assert controls["brightness"] == CONTROLS["brightness"][:3]
+
+    def test_get(self, backend, fake_device):
+        """Test get reads the device value."""
+        assert backend.get("contrast") == CONTROLS["contrast"][2]
+        assert fake_device.calls[VIDIOC_G_CTRL] == 1
+
+    def test_get_many(self, backend, fake_device):
+        """Test get_many reads several controls with one ioctl."""
+        fake_device.controls[min(fake_device.controls)][4] = 42
+        result = backend.get_many(["zoom_absolute", "contrast", "bogus"])
+
+        assert result == {"zoom_absolute": 42, "contrast": CONTROLS["contrast"][2]}
+        assert fake_device.calls[VIDIOC_G_EXT_CTRLS] == 1
+        assert fake_device.calls[VIDIOC_G_CTRL] == 0
+
+    def test_get_many_empty(self, backend, fake_device):
+        """Test get_many with nothing to read skips the driver."""
+        assert backend.get_many(["bogus"]) == {}
+        assert fake_device.calls[VIDIOC_G_EXT_CTRLS] == 0
+
+    def test_set(self, backend, fake_device):
+        """Test set writes the device value with one ioctl."""
+        assert backend.set("pan_absolute", -36000) is True
+        assert fake_device.value("pan_absolute") == -36000
+        assert fake_device.calls[VIDIOC_S_CTRL] == 1
+
+    def test_set_out_of_range(self, backend, fake_device):
+        """Test driver rejection is reported as failure."""
+        assert backend.set("brightness", 500) is False
+        assert fake_device.value("brightness") == CONTROLS["brightness"][2]
+
+    def test_set_many_one_ioctl(self, backend, fake_device):
+        """Test set_many applies a whole preset with one S_EXT_CTRLS."""
+        values = {"brightness": 70, "pan_absolute": 3600, "zoom_absolute": 10}
+        result = backend.set_many(values)
+
+        assert result == {name: True for name in values}
+        assert fake_device.calls[VIDIOC_S_EXT_CTRLS] == 1
+        assert fake_device.calls[VIDIOC_S_CTRL] == 0
+        for name, value in values.items():
+            assert fake_device.value(name) == value
+
+    def test_set_many_rejected_batch(self, backend, fake_device):
+        """Test a rejected batch falls back to exact per-control status."""
+        result = backend.set_many({"brightness": 70, "contrast": 500, "bogus": 1})
+
+        assert result == {"brightness": True, "contrast": False, "bogus": False}
+        assert fake_device.value("brightness") == 70
+        assert fake_device.calls[VIDIOC_S_CTRL] == 2
+
+    def test_unknown_control(self, backend, fake_device):
+        """Test unknown controls don't reach the driver."""
+        assert backend.get("bogus") is None
+        assert backend.set("bogus", 1) is False
+        assert fake_device.calls[VIDIOC_G_CTRL] == 0
+
+    def test_close(self, backend, fake_device):
+        """Test close releases the fd."""
+        backend.close()
+        assert fake_device.open_fds == set()
+        backend.close()  # Second close is a no-op
+
+    def test_open_failure_raises(self, tmp_path):
+        """Test a missing device node raises OSError."""
+        with pytest.raises(OSError):
+            IoctlBackend(str(tmp_path / "video99"))
@@ -0,0 +1,117 @@
+"""Tests for core/writer.py"""
+
+import threading
+
+import pytest
+
+from core.v4l2 import V4L2Control
+from core.v4l2_ioctl import FakeV4L2Device
+from core.writer import ControlWriter
+
+
+class GatedV4L2:
+    """V4L2Control stand-in whose writes block until released."""
+
+    def __init__(self):
+        self.writes: list[dict[str, int]] = []
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+
+    def set(self, control, value):
+        return self.set_many({control: value})[control]
+
+    def set_many(self, values):
+        self.entered.set()
+        self.gate.wait(2)
+        self.writes.append(dict(values))
+        return {control: True for control in values}
+
+
+@pytest.fixture
+def gated():
+    return GatedV4L2()
+
+
+@pytest.fixture
+def writer(gated):
+    writer = ControlWriter(gated)
+    writer.start()
+    yield writer
+    gated.gate.set()
+    writer.stop()
+
+
+class TestControlWriter:
+    """Tests for ControlWriter class."""
+
+    def test_post_does_not_block(self, writer, gated):
+        """Test post returns while the device write is still in progress."""
+        writer.post("pan_absolute", 3600)
+        assert gated.entered.wait(2)
+
+        writer.post("pan_absolute", 7200)  # Would hang if post blocked
+
+        assert writer.stats()["pending"] == 1
+
+    def test_latest_value_wins(self, writer, gated):
+        """Test intermediate values are dropped and only the newest written."""
+        writer.post("pan_absolute", 0)
+        assert gated.entered.wait(2)
+        for value in range(1, 11):
+            writer.post("pan_absolute", value * 3600)
+
+        gated.gate.set()
+        assert writer.flush(2)
+
+        assert gated.writes == [{"pan_absolute": 0}, {"pan_absolute": 36000}]
+        assert writer.dropped == 9
+        assert writer.written == 2
+
+    def test_batches_different_controls(self, writer, gated):
+        """Test pending values for several controls go out in one batch."""
+        writer.post("brightness", 10)
+        assert gated.entered.wait(2)
+        writer.post_many({"pan_absolute": 3600, "tilt_absolute": -3600})
+
+        gated.gate.set()
+        writer.flush(2)
+
+        assert gated.writes[-1] == {"pan_absolute": 3600, "tilt_absolute": -3600}
+
+    def test_flush_timeout(self, writer, gated):
+        """Test flush reports a write that didn't finish in time."""
+        writer.post("brightness", 10)
+        assert gated.entered.wait(2)
+
+        assert writer.flush(0.01) is False
+
+    def test_stop_writes_pending(self, gated):
+        """Test stop drains the mailbox before exiting."""
+        writer = ControlWriter(gated)
+        writer.start()
+        gated.gate.set()
+        writer.post_many({"brightness": 10, "contrast": 20})
+
+        writer.stop()
+
+        assert writer.stats()["pending"] == 0
+        assert writer.written == 2
+
+    def test_flush_without_thread_writes_inline(self):
+        """Test a writer that was never started still applies values."""
+        fake = FakeV4L2Device()
+        writer = ControlWriter(V4L2Control(backend="ioctl", io=fake))
+        writer.post("brightness", 70)
+
+        assert writer.flush() is True
+        assert fake.value("brightness") == 70
+
+    def test_failed_writes_counted(self):
+        """Test rejected values are counted as failures."""
+        fake = FakeV4L2Device()
+        writer = ControlWriter(V4L2Control(backend="ioctl", io=fake))
+        writer.post_many({"brightness": 70, "contrast": 500})
+        writer.flush()
+
+        assert writer.written == 1
+        assert writer.failed == 1
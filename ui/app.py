@@ -5,24 +5,52 @@ from __future__ import annotations
 import time
 
 import dearpygui.dearpygui as dpg
+import numpy as np
 
 from config.presets import get_preset, list_preset_names, save_preset
 from core.camera import Camera, list_devices
+from core.controller import PanTiltController
+from core.detection_worker import DetectionWorker
+from core.framing import AutoFramer
+from core.pipeline import (
+    AnalysedFrame,
+    BoundedQueue,
+    CameraSource,
+    Stage,
+    release_frame,
+    retain_frame,
+)
+from core.scheduler import DetectionScheduler
 from core.tracker import FaceTracker
 from core.v4l2 import V4L2Control
+from core.writer import ControlWriter
 from ui.controls import create_button, create_slider, create_toggle, update_slider
+from ui.pacer import FramePacer
 from ui.preview import Preview
 from ui.theme import setup_font, setup_theme
 from utils.constants import (
+    CAPTURE_BACKEND,
+    CAPTURE_RAW,
+    CAPTURE_THREADED,
     CONTROL_GROUPS,
     CONTROLS,
     CONTROLS_HEIGHT,
     CONTROLS_WIDTH,
+    METRICS_HUD,
+    PACE_TARGET_FPS,
+    PIPELINE,
+    PIPELINE_QUEUES,
     PREVIEW_PADDING,
     PREVIEW_WIDTH,
+    TRACK_ASYNC,
+    TRACK_BUDGET_MS,
+    TRACK_CONTROLLER,
+    TRACK_MODE,
     WINDOW_HEIGHT,
     WINDOW_WIDTH,
 )
+from utils.metrics import METRICS, timed
+from utils.trace import TRACER
 
 
 class App:
@@ -30,11 +58,81 @@ class App:
 
     def __init__(self):
         self.v4l2 = V4L2Control()
-        self.camera = Camera()
-        self.tracker = FaceTracker()
+        self.writer = ControlWriter(self.v4l2)
+        self.camera = Camera(
+            threaded=CAPTURE_THREADED, backend=CAPTURE_BACKEND, raw=CAPTURE_RAW
+        )
+        scheduler = DetectionScheduler() if TRACK_BUDGET_MS > 0 else None
+        try:
+            self.tracker = FaceTracker(scheduler=scheduler)
+        except FileNotFoundError:
+            # Configured detector's model isn't installed
+            self.tracker = FaceTracker(detector="haar", scheduler=scheduler)
+        # The pipeline runs detection on its own analyse stage
+        self.detection = (
+            DetectionWorker(self.tracker) if TRACK_ASYNC and not PIPELINE else None
+        )
+        self.controller = (
+            PanTiltController()
+            if TRACK_MODE == "ptz" and TRACK_CONTROLLER == "pid"
+            else None
+        )
+        # Crop mode frames the face digitally instead of moving the camera
+        self.framer = AutoFramer() if TRACK_MODE == "crop" else None
         self.preview = Preview()
+        self.pacer = FramePacer() if PACE_TARGET_FPS > 0 else None
         self.running = False
         self.current_values: dict[str, int] = {}
+        self._last_seq = 0
+        self._last_result_id = 0
+        # Slider moves made off the UI thread, applied by _flush_sliders()
+        self._slider_updates: dict[str, int] = {}
+        self.stages: dict[str, Stage] = {}
+        self.queues: dict[str, BoundedQueue] = {}
+        self._source = CameraSource(self.camera)
+        # Bumped by _reset_tracking(); stages reset their own state on change
+        self._reset_gen = 0
+        self._analysed_gen = 0
+        self._controlled_gen = 0
+        self._overlay: np.ndarray | None = None
+        if PIPELINE:
+            self._build_pipeline()
+
+    def _build_pipeline(self):
+        """Connect the capture, analyse, control and present stages.
+
+        Capture fans each frame out to analyse and present, so the preview
+        never waits for detection. Present runs on the UI thread (DearPyGui
+        calls aren't thread-safe) by polling its queue from the render loop.
+        Analyse has one worker: the tracker keeps state between frames.
+        """
+        self.queues = {
+            name: BoundedQueue(size, policy, on_drop=release_frame)
+            for name, (size, policy) in PIPELINE_QUEUES.items()
+        }
+        if self.pacer is not None:
+            # A new preview frame is what the render loop waits for
+            self.queues["present"].on_put = self.pacer.notify
+        q = self.queues
+        self.stages = {
+            "capture": Stage(
+                "capture",
+                self._source,
+                outboxes=(q["analyse"], q["present"]),
+                on_fanout=retain_frame,
+            ),
+            "analyse": Stage(
+                "analyse", self._analyse, q["analyse"], outboxes=(q["control"],)
+            ),
+            "control": Stage("control", self._control, q["control"]),
+        }
+
+    def pipeline_stats(self) -> dict[str, dict]:
+        """Per-stage throughput and inbox queue counters."""
+        stats = {name: stage.stats() for name, stage in self.stages.items()}
+        for name, queue in self.queues.items():
+            stats.setdefault(name, {})["queue"] = queue.stats()
+        return stats
 
     def setup(self):
         """Initialize DearPyGui and create window."""
@@ -124,6 +222,21 @@ class App:
                     # FPS display at bottom of controls
                     dpg.add_text("FPS: --", tag="fps_text")
 
+        # Latency panel over the preview, toggled with F3
+        with dpg.window(
+            tag="metrics_hud",
+            label="Latency (ms)",
+            show=METRICS_HUD,
+            pos=(16, 16),
+            autosize=True,
+            no_collapse=True,
+            no_focus_on_appearing=True,
+        ):
+            dpg.add_text("", tag="metrics_text")
+        with dpg.handler_registry():
+            dpg.add_key_press_handler(dpg.mvKey_F3, callback=self._toggle_hud)
+            dpg.add_key_press_handler(dpg.mvKey_F4, callback=self._dump_trace)
+
         # Configure viewport
         dpg.create_viewport(
             title="Meet2UI",
@@ -136,29 +249,100 @@ class App:
         dpg.setup_dearpygui()
         dpg.set_primary_window("main", True)
 
+        if self.pacer is not None:
+            with dpg.handler_registry():
+                for add_handler in (
+                    dpg.add_mouse_move_handler,
+                    dpg.add_mouse_click_handler,
+                    dpg.add_mouse_wheel_handler,
+                    dpg.add_key_press_handler,
+                ):
+                    add_handler(callback=self._on_input)
+
+    def _toggle_hud(self, sender=None, app_data=None):
+        """Show or hide the latency panel."""
+        dpg.configure_item("metrics_hud", show=not dpg.is_item_shown("metrics_hud"))
+
+    def _dump_trace(self, sender=None, app_data=None):
+        """Write the trace buffer to a file, off the UI thread."""
+        if TRACER.recorded:
+            TRACER.dump_in_background()
+
+    def _hud_text(self) -> str:
+        """Latency percentiles per step, plus pipeline throughput and drops."""
+        lines = [METRICS.report()]
+        for name, stats in self.pipeline_stats().items():
+            line = f"{name:16}"
+            if "fps" in stats:
+                line += f" {stats['fps']:5.1f}/s"
+            if "queue" in stats:
+                queue = stats["queue"]
+                line += f" q{queue['depth']} drop {queue['dropped']}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def _on_input(self, sender=None, app_data=None):
+        """Any mouse or keyboard event: keep rendering at full rate."""
+        self.pacer.input()
+
+    @staticmethod
+    def _viewport_hidden() -> bool:
+        """True while the viewport is minimized (no client area)."""
+        return (
+            dpg.get_viewport_client_width() <= 0
+            or dpg.get_viewport_client_height() <= 0
+        )
+
     def _on_slider_change(self, control: str, value: int):
         """Handle slider value change."""
-        self.v4l2.set(control, value)
+        self.writer.post(control, value)
         self.current_values[control] = value
 
     def _on_toggle_change(self, control: str, enabled: bool):
         """Handle toggle change."""
-        self.v4l2.set(control, 1 if enabled else 0)
+        self.writer.post(control, 1 if enabled else 0)
         self.current_values[control] = 1 if enabled else 0
 
     def _on_track_toggle(self, sender, value):
         """Handle tracking toggle."""
         self.tracker.enabled = value
         if not value:
+            self._reset_tracking()
+
+    def _reset_tracking(self):
+        """Forget the tracked face and any in-flight detection."""
+        if self.stages:
+            # Their state belongs to the analyse and control threads
+            self._reset_gen += 1
+            return
+        if self.detection is not None:
+            self.detection.reset()
+        else:
             self.tracker.reset()
+        if self.controller is not None:
+            self.controller.reset()
+        if self.framer is not None:
+            self.framer.reset()
+        self._last_result_id = 0
 
     def _on_camera_select(self, sender, camera_name):
         """Handle camera selection change."""
         devices = list_devices()
         for path, name in devices:
             if name == camera_name:
+                # Pending writes belong to the old camera
+                self.writer.flush()
+                capture = self.stages.get("capture")
+                if capture is not None:
+                    capture.stop()
                 self.camera.set_device(path)
+                self._last_seq = 0
+                self._source.reset()
+                if capture is not None:
+                    capture.start()
+                self._reset_tracking()
                 self.v4l2.set_device(path)
+                self._load_device_values()
                 break
 
     def _on_preset_select(self, sender, preset_name):
@@ -170,6 +354,7 @@ class App:
     def _on_save_preset(self):
         """Save current values as preset."""
         name = dpg.get_value("preset_combo")
+        self.writer.flush()
         save_preset(name, self.current_values.copy())
 
     def _on_reset(self):
@@ -179,41 +364,161 @@ class App:
 
     def _apply_values(self, values: dict[str, int]):
         """Apply a set of control values."""
+        self.writer.post_many(values)
         for control, value in values.items():
-            self.v4l2.set(control, value)
             self.current_values[control] = value
             update_slider(control, value)
 
+    def _load_device_values(self):
+        """Read all controls from the camera and sync the sliders."""
+        for control, value in self.v4l2.snapshot().items():
+            self.current_values[control] = value
+            update_slider(control, value)
+
+    @timed("ui.update_loop")
     def _update_loop(self):
         """Called each frame to update preview."""
-        frame = self.camera.read()
-
-        if frame is not None and self.tracker.enabled:
-            delta = self.tracker.get_pan_tilt_delta(frame)
-            if delta:
-                pan_delta, tilt_delta = delta
-                cur_pan = self.current_values.get("pan_absolute", 0)
-                cur_tilt = self.current_values.get("tilt_absolute", 0)
-                new_pan = max(-648000, min(648000, cur_pan + pan_delta))
-                new_tilt = max(-648000, min(648000, cur_tilt + tilt_delta))
-
-                if abs(pan_delta) > 100 or abs(tilt_delta) > 100:
-                    self.v4l2.set("pan_absolute", new_pan)
-                    self.v4l2.set("tilt_absolute", new_tilt)
-                    self.current_values["pan_absolute"] = new_pan
-                    self.current_values["tilt_absolute"] = new_tilt
-                    update_slider("pan_absolute", new_pan)
-                    update_slider("tilt_absolute", new_tilt)
+        captured = self.camera.read_frame()
+        if captured is None:
+            self.preview.update(None)
+            return
+        if captured.seq == self._last_seq:
+            # No new frame from the capture thread; keep the current texture
+            return
+        self._last_seq = captured.seq
+        frame = captured.image
+
+        if self.tracker.enabled:
+            if self.framer is not None:
+                face, _ = self._observe_face(captured)
+                self.framer.update(face, frame.shape)
+            else:
+                delta = self._pan_tilt_delta(captured)
+                if delta:
+                    self._apply_pan_tilt(*delta)
 
             frame = self.tracker.draw_overlay(frame)
+            if self.framer is not None:
+                # A view into the frame; the preview resize is the only copy
+                frame = self.framer.crop(frame)
 
         self.preview.update(frame)
 
+    def _analyse(self, captured) -> AnalysedFrame | None:
+        """Analyse stage: find the face in a captured frame."""
+        if self._analysed_gen != self._reset_gen:
+            self._analysed_gen = self._reset_gen
+            self.tracker.reset()
+        if not self.tracker.enabled:
+            release_frame(captured)
+            return None
+        start = time.perf_counter()
+        face = self.tracker.track(captured.image)
+        if self.tracker.scheduler is not None:
+            self.tracker.scheduler.frame_done((time.perf_counter() - start) * 1000)
+        return AnalysedFrame(captured, face)
+
+    def _control(self, analysed: AnalysedFrame):
+        """Control stage: turn a face into a camera move or a crop."""
+        if self._controlled_gen != self._reset_gen:
+            self._controlled_gen = self._reset_gen
+            if self.controller is not None:
+                self.controller.reset()
+            if self.framer is not None:
+                self.framer.reset()
+        captured = analysed.captured
+        if self.framer is not None:
+            self.framer.update(analysed.face, captured.image.shape)
+        else:
+            delta = self._move_for(analysed.face, captured.image, captured.timestamp)
+            if delta:
+                self._apply_pan_tilt(*delta)
+        release_frame(analysed)
+
+    @timed("ui.present")
+    def _present(self):
+        """Present stage, on the UI thread: show the newest captured frame."""
+        captured = self.queues["present"].get_nowait()
+        if captured is None:
+            if not self.camera.is_open:
+                self.preview.update(None)
+            return
+        try:
+            frame = captured.image
+            if self.tracker.enabled:
+                # The analyse stage may still be reading this frame
+                if self._overlay is None or self._overlay.shape != frame.shape:
+                    self._overlay = np.empty_like(frame)
+                np.copyto(self._overlay, frame)
+                frame = self.tracker.draw_overlay(self._overlay)
+                if self.framer is not None:
+                    frame = self.framer.crop(frame)
+            self.preview.update(frame)
+        finally:
+            release_frame(captured)
+
+    def _pan_tilt_delta(self, captured) -> tuple[int, int] | None:
+        """Pan/tilt move to make for this frame, or None."""
+        face, timestamp = self._observe_face(captured)
+        return self._move_for(face, captured.image, timestamp)
+
+    def _move_for(self, face, frame, timestamp) -> tuple[int, int] | None:
+        """Pan/tilt move for a face seen in `frame` at `timestamp`, or None."""
+        if self.controller is not None:
+            if face is not None:
+                self.controller.observe_face(face, frame.shape, timestamp)
+            return self.controller.command(time.monotonic())
+        if face is None:
+            return None
+        return self.tracker.face_to_pan_tilt(frame, face)
+
+    def _observe_face(self, captured):
+        """Newest face not acted on yet, as (face, capture time)."""
+        if self.detection is None:
+            return self.tracker.track(captured.image), captured.timestamp
+        self.detection.submit(captured.image, captured.seq, captured.timestamp)
+        result = self.detection.latest()
+        if result is None or result.frame_id == self._last_result_id:
+            return None, None
+        self._last_result_id = result.frame_id
+        if self.controller is not None:
+            # The Kalman filter handles the result's age itself
+            return result.face, result.timestamp
+        # Move towards where the face is now, not where it was at capture
+        return result.face_at(captured.timestamp), captured.timestamp
+
+    def _apply_pan_tilt(self, pan_delta: int, tilt_delta: int):
+        """Queue a relative pan/tilt move and sync the sliders."""
+        cur_pan = self.current_values.get("pan_absolute", 0)
+        cur_tilt = self.current_values.get("tilt_absolute", 0)
+        new_pan = max(-648000, min(648000, cur_pan + pan_delta))
+        new_tilt = max(-648000, min(648000, cur_tilt + tilt_delta))
+
+        if abs(pan_delta) > 100 or abs(tilt_delta) > 100:
+            # Cache drops whichever axis didn't change
+            self.writer.post_many({"pan_absolute": new_pan, "tilt_absolute": new_tilt})
+            self.current_values["pan_absolute"] = new_pan
+            self.current_values["tilt_absolute"] = new_tilt
+            # May run on the control stage; sliders are updated on the UI thread
+            self._slider_updates["pan_absolute"] = new_pan
+            self._slider_updates["tilt_absolute"] = new_tilt
+
+    def _flush_sliders(self):
+        """Show slider values changed by tracking."""
+        while self._slider_updates:
+            control, value = self._slider_updates.popitem()
+            update_slider(control, value)
+
     def run(self):
         """Start the application."""
+        if TRACER.enabled:
+            TRACER.install_signal()
         # Show UI immediately
         dpg.show_viewport()
         self.running = True
+        self.writer.start()
+        if self.detection is not None:
+            self.detection.start()
 
         # Render UI with loading message before camera opens
         self.preview.show_loading()
@@ -229,24 +534,41 @@ class App:
             self._apply_values(saved_defaults)
         else:
             # Fall back to reading current values from camera
-            for control in CONTROLS:
-                val = self.v4l2.get(control)
-                if val is not None:
-                    self.current_values[control] = val
-                    update_slider(control, val)
+            self._load_device_values()
+
+        for stage in self.stages.values():
+            stage.start()
 
         frame_count = 0
         last_fps_time = time.time()
+        render = METRICS.timed("ui.render")(dpg.render_dearpygui_frame)
 
         while dpg.is_dearpygui_running():
-            self._update_loop()
-            dpg.render_dearpygui_frame()
+            if self.pacer is not None:
+                self.pacer.wait(hidden=self._viewport_hidden())
+            if self.stages:
+                self._present()
+            else:
+                if self.pacer is not None:
+                    # The serial loop polls the camera, so only cap the rate
+                    self.pacer.notify()
+                start = time.perf_counter()
+                self._update_loop()
+                if self.tracker.scheduler is not None:
+                    # Our own work only; rendering waits on vsync
+                    self.tracker.scheduler.frame_done(
+                        (time.perf_counter() - start) * 1000
+                    )
+            self._flush_sliders()
+            render()
 
             frame_count += 1
             now = time.time()
             if now - last_fps_time >= 1.0:
                 fps = frame_count / (now - last_fps_time)
                 dpg.set_value("fps_text", f"FPS: {fps:.0f}")
+                if dpg.is_item_shown("metrics_hud"):
+                    dpg.set_value("metrics_text", self._hud_text())
                 frame_count = 0
                 last_fps_time = now
 
@@ -255,5 +577,16 @@ class App:
     def shutdown(self):
         """Clean up resources."""
         self.running = False
+        # Closing first wakes any stage blocked on a full queue
+        for queue in self.queues.values():
+            queue.close()
+        for stage in self.stages.values():
+            stage.stop()
+        if self.detection is not None:
+            self.detection.stop()
         self.camera.close()
+        self.writer.stop()
+        self.v4l2.close()
+        if TRACER.recorded:
+            print(f"Trace written to {TRACER.dump()}")
         dpg.destroy_context()
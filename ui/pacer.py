@@ -0,0 +1,89 @@
+"""Frame pacing for the UI loop."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from utils.constants import (
+    PACE_BACKGROUND_FPS,
+    PACE_IDLE_AFTER,
+    PACE_IDLE_FPS,
+    PACE_TARGET_FPS,
+)
+
+# Keep rendering at the target rate this long after an input event, so
+# hover and drag feedback stays smooth
+_LINGER = 0.5
+
+
+class FramePacer:
+    """Decides when the UI loop renders its next frame.
+
+    Call notify() (from any thread) when a new camera frame is ready and
+    input() on UI events. wait() then sleeps until a render is due:
+
+        frame or input pending  no sooner than 1/target_fps after the last
+        nothing pending         after 1/idle_fps, so DearPyGui still sees
+                                new input events; 1/background_fps once
+                                there has been no input for `idle_after`
+        hidden viewport         every 1/background_fps, pending or not
+
+    A visible preview keeps showing new frames at the target rate however
+    long the user has been away.
+    """
+
+    def __init__(
+        self,
+        target_fps: float = PACE_TARGET_FPS,
+        idle_fps: float = PACE_IDLE_FPS,
+        background_fps: float = PACE_BACKGROUND_FPS,
+        idle_after: float = PACE_IDLE_AFTER,
+    ):
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.background_fps = background_fps
+        self.idle_after = idle_after
+        self._cond = threading.Condition()
+        self._pending = False
+        now = time.monotonic()
+        self._last_render = now
+        self._last_input = now
+        self.stats = {"renders": 0, "idle_renders": 0, "background": False}
+
+    def notify(self):
+        """A new frame is ready to show."""
+        with self._cond:
+            self._pending = True
+            self._cond.notify()
+
+    def input(self):
+        """A UI event arrived; render at full rate for a moment."""
+        with self._cond:
+            self._last_input = time.monotonic()
+            self._pending = True
+            self._cond.notify()
+
+    def wait(self, hidden: bool = False):
+        """Block until the next frame should be rendered."""
+        now = time.monotonic()
+        if hidden:
+            earliest = latest = self._last_render + 1.0 / self.background_fps
+        else:
+            inactive = now - self._last_input > self.idle_after
+            poll_fps = self.background_fps if inactive else self.idle_fps
+            earliest = self._last_render + 1.0 / self.target_fps
+            latest = self._last_render + 1.0 / poll_fps
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                active = self._pending or now - self._last_input < _LINGER
+                due = earliest if active else latest
+                if now >= due:
+                    break
+                self._cond.wait(due - now)
+            self._pending = False
+        self._last_render = now
+        self.stats["renders"] += 1
+        self.stats["idle_renders"] += not active
+        self.stats["background"] = hidden
@@ -6,23 +6,45 @@ import cv2
 import dearpygui.dearpygui as dpg
 import numpy as np
 
-from utils.constants import PREVIEW_HEIGHT, PREVIEW_WIDTH
+from core.camera import is_yuyv
+from utils.constants import PREVIEW_HEIGHT, PREVIEW_TEXTURE_FORMAT, PREVIEW_WIDTH
+from utils.metrics import timed
 
+# uint8 -> float32 in [0, 1], applied by cv2.LUT in a single pass
+_UNIT_LUT = (np.arange(256, dtype=np.float32) / 255.0).reshape(1, 256)
 
-class Preview:
-    """Manages live video preview in DearPyGui."""
 
-    def __init__(self, width: int = PREVIEW_WIDTH, height: int = PREVIEW_HEIGHT):
+class Preview:
+    """Manages live video preview in DearPyGui.
+
+    `texture_format` is "rgba" or "rgb"; RGB uploads 25% less data.
+    Raw YUYV frames are shrunk first and colour-converted at preview size.
+    """
+
+    def __init__(
+        self,
+        width: int = PREVIEW_WIDTH,
+        height: int = PREVIEW_HEIGHT,
+        texture_format: str = PREVIEW_TEXTURE_FORMAT,
+    ):
         self.width = width
         self.height = height
+        self.texture_format = texture_format
+        self.channels = 4 if texture_format == "rgba" else 3
         self.texture_id = None
         self.image_id = None
         self._blank = self._create_blank()
+        # Persistent per-frame buffers; update() allocates nothing
+        self._resized = np.empty((height, width, 3), dtype=np.uint8)
+        self._rgb = np.empty((height, width, self.channels), dtype=np.uint8)
+        self._texture = np.empty(height * width * self.channels, dtype=np.float32)
+        self._packed = None  # Resized YUYV, allocated on the first raw frame
 
     def _create_blank(self) -> np.ndarray:
         """Create blank frame for when camera is off."""
-        blank = np.zeros((self.height, self.width, 4), dtype=np.float32)
-        blank[:, :, 3] = 1.0  # Alpha channel
+        blank = np.zeros((self.height, self.width, self.channels), dtype=np.float32)
+        if self.channels == 4:
+            blank[:, :, 3] = 1.0  # Alpha channel
         return blank.flatten()
 
     def _create_loading_frame(self) -> np.ndarray:
@@ -41,10 +63,7 @@ class Preview:
             frame, text, (text_x, text_y), font, font_scale, (150, 150, 150), thickness
         )
 
-        # Convert to RGBA float32
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)
-        frame = frame.astype(np.float32) / 255.0
-        return frame.flatten()
+        return self.convert(frame).copy()
 
     def show_loading(self):
         """Display loading message in preview."""
@@ -59,7 +78,9 @@ class Preview:
                 width=self.width,
                 height=self.height,
                 default_value=self._blank,
-                format=dpg.mvFormat_Float_rgba,
+                format=dpg.mvFormat_Float_rgba
+                if self.channels == 4
+                else dpg.mvFormat_Float_rgb,
                 tag="preview_texture",
             )
 
@@ -71,21 +92,45 @@ class Preview:
         )
         return self.image_id
 
+    @timed("preview.update")
     def update(self, frame: np.ndarray | None):
         """Update preview with new frame (BGR numpy array)."""
         if frame is None:
             dpg.set_value("preview_texture", self._blank)
             return
 
-        # Resize to preview dimensions
-        frame = cv2.resize(frame, (self.width, self.height))
-
-        # Convert BGR to RGBA float32
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)
-        frame = frame.astype(np.float32) / 255.0
-        frame = frame.flatten()
-
-        dpg.set_value("preview_texture", frame)
+        dpg.set_value("preview_texture", self.convert(frame))
+
+    def convert(self, frame: np.ndarray) -> np.ndarray:
+        """Convert a BGR frame into the flat float32 texture buffer.
+
+        The returned array is reused by the next call.
+        """
+        if is_yuyv(frame):
+            self._convert_yuyv(frame)
+        else:
+            # Resize to preview dimensions
+            cv2.resize(frame, (self.width, self.height), dst=self._resized)
+
+            # Swap to RGB(A)
+            code = cv2.COLOR_BGR2RGBA if self.channels == 4 else cv2.COLOR_BGR2RGB
+            cv2.cvtColor(self._resized, code, dst=self._rgb)
+
+        # Scale to float32 with one LUT pass
+        cv2.LUT(self._rgb, _UNIT_LUT, dst=self._texture.reshape(self._rgb.shape))
+        return self._texture
+
+    def _convert_yuyv(self, frame: np.ndarray):
+        """Resize a YUYV frame as pixel pairs, then convert it to RGB(A)."""
+        height, width = frame.shape[:2]
+        # (Y0, U, Y1, V) per pair: a 4-channel image half as wide
+        pairs = frame.reshape(height, width // 2, 4)
+        if self._packed is None:
+            self._packed = np.empty((self.height, self.width // 2, 4), dtype=np.uint8)
+        cv2.resize(pairs, (self.width // 2, self.height), dst=self._packed)
+        code = cv2.COLOR_YUV2RGBA_YUYV if self.channels == 4 else cv2.COLOR_YUV2RGB_YUYV
+        yuyv = self._packed.reshape(self.height, self.width, 2)
+        cv2.cvtColor(yuyv, code, dst=self._rgb)
 
     def clear(self):
         """Clear the preview to blank."""
@@ -40,6 +40,7 @@ PREVIEW_HEIGHT = 315  # 16:9 aspect ratio
 CONTROLS_WIDTH = 220
 CONTROLS_HEIGHT = 449  # Height needed for all controls + FPS (determines panel height)
 PREVIEW_PADDING = (CONTROLS_HEIGHT - PREVIEW_HEIGHT) // 2  # Center preview vertically
+PREVIEW_TEXTURE_FORMAT = "rgba"  # "rgba" or "rgb" (25% less upload bandwidth)
 WINDOW_WIDTH = (
     PREVIEW_WIDTH + CONTROLS_WIDTH + 56
 )  # preview + controls + padding + borders
@@ -47,6 +48,68 @@ WINDOW_HEIGHT = (
     CONTROLS_HEIGHT + 16
 )  # controls panel + window padding (8px top + 8px bottom)
 
+# Frame pacing: render only when a frame or UI event is pending
+PACE_TARGET_FPS = 60  # render cap; 0 renders as fast as DearPyGui allows
+PACE_IDLE_FPS = 10  # renders/s with nothing pending, so UI events still get polled
+PACE_BACKGROUND_FPS = 4  # renders/s while minimized
+PACE_IDLE_AFTER = 60.0  # seconds without input before idle polling slows to that rate
+
+# Instrumentation
+METRICS_ENABLED = True  # per-step latency histograms (cheap enough to leave on)
+METRICS_WINDOW = 512  # samples kept per step for percentiles
+METRICS_HUD = False  # show the latency panel at startup (F3 toggles it)
+TRACE_ENABLED = False  # record Chrome trace spans (or run main.py --trace)
+TRACE_BUFFER = 65536  # spans kept; dumped on SIGUSR1, F4 or exit
+
+# Capture
+CAPTURE_THREADED = True  # Grab frames on a background thread, read the newest
+CAPTURE_BACKEND = "opencv"  # "opencv" (cv2.VideoCapture) or "mmap" (V4L2 streaming)
+CAPTURE_RAW = False  # keep YUYV frames: tracking reads luma, preview converts small
+CAPTURE_WIDTH = 640  # raise (e.g. 1280x720) to crop in "crop" tracking mode
+CAPTURE_HEIGHT = 360
+
+# Frame pipeline: capture -> analyse -> control -> present, each on its own thread
+PIPELINE = True  # False runs everything serially in the UI loop
+PIPELINE_QUEUES = {  # stage inbox: (size, "drop_oldest" | "drop_newest" | "block")
+    "analyse": (1, "drop_oldest"),
+    "control": (2, "drop_oldest"),
+    "present": (1, "drop_oldest"),
+}
+
 # Face tracking
+TRACK_DETECTOR = "haar"  # "haar", "lbp" (faster) or "yunet" (CPU DNN, needs model file)
+TRACK_DNN_SCORE = 0.6  # YuNet confidence threshold
 TRACK_DEADZONE = 30  # pixels from center before tracking kicks in
 TRACK_SPEED = 0.3  # smoothing factor (0-1)
+TRACK_MIN_FACE = 60  # smallest face to detect, in full-frame pixels
+TRACK_DETECT_WIDTH = 640  # downscale frames to this width for detection (0 = full res)
+TRACK_DETECT_INTERVAL = 5  # full detection every N frames, template matching between
+TRACK_MATCH_THRESHOLD = 0.6  # template match score below which we re-detect
+TRACK_ROI_MISSES = 3  # misses around the last face before a full-frame scan (0 = off)
+TRACK_POLICY = "largest"  # target: "largest", "persistent", "center" or "all"
+TRACK_MAX_MISSES = 10  # full scans a face may be missing before its track is dropped
+TRACK_RESCAN_INTERVAL = 30  # forced full scan every N frames; unseen faces hide after N
+TRACK_MOTION_THRESHOLD = 6  # grey-level change that re-runs tracking (0 = off)
+TRACK_MOTION_MAX_SKIP = 30  # static frames skipped at most before tracking runs anyway
+TRACK_BUDGET_MS = 33.0  # per-frame time budget for adaptive detection quality (0 = off)
+TRACK_ASYNC = True  # run detection on a worker thread, off the UI loop
+TRACK_MAX_EXTRAPOLATION = 0.25  # seconds a result may be projected forward
+TRACK_CONTROLLER = "pid"  # "pid" (Kalman + PID) or "ema" (legacy smoothing)
+TRACK_PID = (0.6, 0.1, 0.02)  # kp, ki, kd on normalized offset per command
+TRACK_HYSTERESIS = (0.10, 0.03)  # start moving above, stop below (normalized offset)
+TRACK_COMMAND_INTERVAL = 0.2  # min seconds between pan/tilt commands
+TRACK_MIN_STEP = 100  # smallest pan/tilt move worth sending (device units)
+TRACK_SETTLE_TIME = 0.25  # seconds the camera needs to finish a move
+TRACK_KALMAN_NOISE = (0.5, 0.02)  # acceleration std (1/s^2), measurement std
+TRACK_MODE = "ptz"  # "ptz" (move the camera) or "crop" (digital pan/tilt/zoom)
+TRACK_CROP_FACE = 0.3  # face height as a fraction of the crop window height
+TRACK_CROP_MAX_ZOOM = 3.0  # zoom factor limit: the crop is at least 1/3 of the frame
+TRACK_CROP_SPEED = 0.15  # crop window smoothing factor per frame (0-1)
+
+# Headless mode (headless.py)
+HEADLESS_FPS = 5.0  # frames tracked per second; the camera still runs at full rate
+HEADLESS_REPORT = 60.0  # seconds between CPU/memory reports (0 = only at exit)
+HEADLESS_FIRST_FRAME = 5.0  # seconds to wait for the first frame before giving up
+
+# Camera control backend: "auto" (ioctl, falling back to v4l2-ctl), "ioctl", "subprocess"
+V4L2_BACKEND = "auto"
@@ -0,0 +1,137 @@
+"""Rolling latency histograms for hot-path steps.
+
+Instrumented functions record their duration in milliseconds into a
+fixed-size ring per name; percentiles are only computed when someone
+asks for a summary, so recording costs one array store and a counter
+bump and allocates nothing.
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from array import array
+from collections.abc import Callable
+
+import numpy as np
+
+from utils.constants import METRICS_ENABLED, METRICS_WINDOW
+from utils.trace import TRACER
+
+
+class Histogram:
+    """The last `size` samples in a preallocated ring.
+
+    Writers don't lock: two threads recording at once may overwrite one
+    sample, which doesn't matter for percentiles.
+    """
+
+    __slots__ = ("_samples", "_size", "count")
+
+    def __init__(self, size: int = METRICS_WINDOW):
+        self._samples = array("d", bytes(8 * size))
+        self._size = size
+        self.count = 0
+
+    def add(self, value: float):
+        """Record one sample."""
+        self._samples[self.count % self._size] = value
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+    def summary(self) -> dict[str, float]:
+        """Sample count with p50/p95/p99 and max over the window."""
+        n = min(self.count, self._size)
+        if n == 0:
+            return {"count": 0}
+        values = np.frombuffer(self._samples, dtype=np.float64, count=n)
+        p50, p95, p99 = np.percentile(values, (50, 95, 99))
+        return {
+            "count": self.count,
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "max": float(values.max()),
+        }
+
+
+class Metrics:
+    """Named duration histograms, in milliseconds."""
+
+    def __init__(self, size: int = METRICS_WINDOW, enabled: bool = METRICS_ENABLED):
+        self.size = size
+        self.enabled = enabled
+        self._histograms: dict[str, Histogram] = {}
+
+    def histogram(self, name: str) -> Histogram:
+        """Histogram for `name`, created on first use."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms.setdefault(name, Histogram(self.size))
+        return histogram
+
+    def record(self, name: str, ms: float):
+        """Record a duration."""
+        if self.enabled:
+            self.histogram(name).add(ms)
+
+    def timed(self, name: str, trace_args: Callable | None = None) -> Callable:
+        """Decorator recording each call's duration under `name`.
+
+        While TRACER is on, each call is also recorded as a trace span, even
+        with metrics disabled; `trace_args` builds the span's args from the
+        call's arguments.
+        """
+
+        def decorator(fn):
+            histogram = self.histogram(name)
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not (self.enabled or TRACER.enabled):
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    end = time.perf_counter()
+                    if self.enabled:
+                        histogram.add((end - start) * 1000)
+                    if TRACER.enabled:
+                        TRACER.add(
+                            name,
+                            start,
+                            end,
+                            trace_args(*args, **kwargs) if trace_args else None,
+                        )
+
+            return wrapper
+
+        return decorator
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Summaries of every histogram that has samples, by name."""
+        return {
+            name: histogram.summary()
+            for name, histogram in sorted(self._histograms.items())
+            if histogram.count
+        }
+
+    def reset(self):
+        """Clear all samples."""
+        for histogram in self._histograms.values():
+            histogram.reset()
+
+    def report(self) -> str:
+        """Summary as a text table, one step per line."""
+        lines = [f"{'step':16} {'p50':>6} {'p95':>6} {'p99':>6}"]
+        for name, s in self.summary().items():
+            lines.append(f"{name:16} {s['p50']:6.2f} {s['p95']:6.2f} {s['p99']:6.2f}")
+        return "\n".join(lines)
+
+
+# Process-wide registry used by the instrumented modules
+METRICS = Metrics()
+timed = METRICS.timed
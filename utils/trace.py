@@ -0,0 +1,137 @@
+"""Chrome trace (Perfetto) span recorder for the frame loop.
+
+Spans go into a preallocated ring of TRACE_BUFFER slots, oldest first out,
+and are written as Chrome Trace Event JSON on demand: open the file in
+ui.perfetto.dev or chrome://tracing. Every utils.metrics timer and
+pipeline stage records a span here; while disabled that costs one
+attribute check.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import signal
+import threading
+import time
+from array import array
+from pathlib import Path
+
+from utils.constants import TRACE_BUFFER, TRACE_ENABLED
+
+
+def default_trace_path() -> Path:
+    """Timestamped file under ~/.cache/meet2ui/traces."""
+    trace_dir = Path.home() / ".cache" / "meet2ui" / "traces"
+    trace_dir.mkdir(parents=True, exist_ok=True)
+    return trace_dir / time.strftime("trace-%Y%m%d-%H%M%S.json")
+
+
+class Tracer:
+    """Ring buffer of complete spans (name, start, duration, thread, args).
+
+    add() may be called from any thread; slots are claimed with an atomic
+    counter, so recording takes no lock. The buffer is allocated when
+    recording first starts.
+    """
+
+    def __init__(self, size: int = TRACE_BUFFER, enabled: bool = TRACE_ENABLED):
+        self.size = size
+        self.enabled = False
+        self._names: list[str | None] = []
+        self._counter = itertools.count()
+        self.recorded = 0
+        self._thread_names: dict[int, str] = {}
+        self._epoch = time.perf_counter()
+        self._dump_lock = threading.Lock()
+        if enabled:
+            self.start()
+
+    def start(self):
+        """Start recording."""
+        if not self._names:
+            size = self.size
+            self._names = [None] * size
+            self._args: list[dict | None] = [None] * size
+            self._start = array("d", bytes(8 * size))
+            self._duration = array("d", bytes(8 * size))
+            self._tids = array("q", bytes(8 * size))
+        self.enabled = True
+
+    def stop(self):
+        """Stop recording; the buffer is kept for dump()."""
+        self.enabled = False
+
+    def clear(self):
+        """Drop all recorded spans."""
+        self._counter = itertools.count()
+        self.recorded = 0
+
+    def add(self, name: str, start: float, end: float, args: dict | None = None):
+        """Record a span between two time.perf_counter() readings."""
+        i = next(self._counter)
+        slot = i % self.size
+        self._names[slot] = name
+        self._args[slot] = args
+        self._start[slot] = start
+        self._duration[slot] = end - start
+        tid = threading.get_native_id()
+        self._tids[slot] = tid
+        if tid not in self._thread_names:
+            # Remembered here: a thread may be gone by the time we dump
+            self._thread_names[tid] = threading.current_thread().name
+        self.recorded = max(self.recorded, i + 1)
+
+    def events(self) -> list[dict]:
+        """Recorded spans as Chrome Trace Event dicts, oldest first."""
+        count = min(self.recorded, self.size)
+        first = self.recorded - count
+        events = []
+        for i in range(first, first + count):
+            slot = i % self.size
+            event = {
+                "name": self._names[slot],
+                "ph": "X",
+                "ts": (self._start[slot] - self._epoch) * 1e6,
+                "dur": self._duration[slot] * 1e6,
+                "pid": 1,
+                "tid": self._tids[slot],
+            }
+            if self._args[slot] is not None:
+                event["args"] = self._args[slot]
+            events.append(event)
+        for tid in sorted({event["tid"] for event in events}):
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"name": self._thread_names.get(tid, str(tid))},
+                }
+            )
+        return events
+
+    def dump(self, path: str | Path | None = None) -> Path:
+        """Write the buffer as Chrome Trace JSON. Returns the file path."""
+        path = Path(path) if path is not None else default_trace_path()
+        with self._dump_lock:
+            data = {"traceEvents": self.events(), "displayTimeUnit": "ms"}
+            path.write_text(json.dumps(data))
+        return path
+
+    def dump_in_background(self):
+        """dump() on a new thread and print where the file went."""
+
+        def run():
+            print(f"Trace written to {self.dump()}")
+
+        threading.Thread(target=run, name="trace-dump").start()
+
+    def install_signal(self, signum: int = signal.SIGUSR1):
+        """Dump on `signum`. Call from the main thread."""
+        signal.signal(signum, lambda signum, frame: self.dump_in_background())
+
+
+# Process-wide tracer used by the instrumented modules
+TRACER = Tracer()